@@ -0,0 +1,346 @@
+"""
+A single command-line entry point for the scraping and data processing workflows.
+
+    python cli.py scrape --pages 5
+    python cli.py process-books --no-plots
+    python cli.py process-books --no-plots --incremental --changes changes.csv
+    python cli.py scrape-process --pages 5 --no-plots
+    python cli.py process-salaries 'exports/salaries_*.csv' --no-plots
+    python cli.py process-salaries feed.csv --watch --interval 10
+    python cli.py process-salaries --stream --output processed.csv.gz --background-write
+    python cli.py stats software_engineer_salaries.csv --sketches
+    python cli.py stats 'exports/salaries_*.csv' --sample 100000
+    python cli.py plot software_engineer_salaries.csv --output-dir plots
+
+Each subcommand imports only the modules it needs, and the workflow modules
+load matplotlib and seaborn on first use, so commands that do not plot never
+pay for them. `--import-times` reports what was imported and how long it took,
+which makes start-up regressions visible, and `--profile report.json`
+writes a per-function run report (see `profiling.py`).
+"""
+import argparse
+import importlib
+import os
+import sys
+import time
+import types
+
+START = time.perf_counter()
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+for _directory in ('data_process', 'web_scraping'):
+    _path = os.path.join(REPO_DIR, _directory)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+# Libraries whose import cost dominates start-up
+HEAVY_MODULES = ['numpy', 'pandas', 'matplotlib', 'matplotlib.pyplot', 'seaborn', 'requests', 'bs4']
+
+# Workflow modules instrumented by --profile when the subcommand loaded them
+PROFILED_MODULES = ['data_processing', 'streaming', 'salary_cube', 'process_books', 'scrape_books', 'books_pipeline',
+                    'sampling', 'watch', 'books_changeset']
+
+# Salary plots, by the name used on the command line:
+# (function, whether it takes top_n, whether it takes engine)
+PLOTS = {
+    'salary_distribution': ('plot_salary_distribution', False, False),
+    'salary_by_company': ('plot_salary_by_company', True, True),
+    'salary_boxplot': ('plot_salary_boxplot', True, True),
+    'rating_distribution': ('plot_rating_distribution', False, False),
+    'salary_vs_rating': ('plot_salary_vs_rating', True, False),
+    'heatmap_correlation': ('plot_heatmap_correlation', False, False),
+}
+
+# Values of --engine; mirrors data_processing.ENGINES without importing it
+ENGINES = ['pandas', 'polars']
+
+# Default of --write-queue; mirrors output_writer.DEFAULT_QUEUE_SIZE without importing it
+WRITE_QUEUE_SIZE = 8
+
+# (module, seconds) for every module imported by a subcommand
+IMPORT_TIMES = []
+
+def load_module(name):
+    """
+    Imports a module and records how long it took.
+
+    Args:
+        name (str): The module name.
+
+    Returns:
+        module: The imported module.
+    """
+    start = time.perf_counter()
+    module = importlib.import_module(name)
+    IMPORT_TIMES.append((name, time.perf_counter() - start))
+    return module
+
+def loaded_heavy_modules():
+    """
+    Returns the heavy libraries that have been executed so far.
+
+    Modules registered by `lazy_import` but not used yet are not counted.
+
+    Returns:
+        list: Names from HEAVY_MODULES.
+    """
+    # A lazily imported module only becomes a plain module once it is executed
+    return [name for name in HEAVY_MODULES if type(sys.modules.get(name)) is types.ModuleType]
+
+def print_import_report(startup_seconds, loaded_at_startup):
+    """
+    Prints the import-time report to stderr, leaving stdout to the command.
+
+    Args:
+        startup_seconds (float): Seconds from start until the command began running.
+        loaded_at_startup (list): Heavy libraries executed before the command ran.
+    """
+    lines = ["\nImport times:"]
+    lines += [f"  {name:<20} {seconds:8.3f}s" for name, seconds in IMPORT_TIMES]
+    loaded = loaded_heavy_modules()
+    lines.append(f"Loaded at start-up: {', '.join(loaded_at_startup) or 'none'}")
+    lines.append(f"Loaded while running: {', '.join(name for name in loaded if name not in loaded_at_startup) or 'none'}")
+    lines.append(f"Never loaded: {', '.join(name for name in HEAVY_MODULES if name not in loaded) or 'none'}")
+    lines.append(f"Start-up {startup_seconds:.3f}s, total {time.perf_counter() - START:.3f}s")
+    print('\n'.join(lines), file=sys.stderr)
+
+def with_writer(args, run):
+    """
+    Returns a command calling `run(writer)`: with --background-write the writer
+    is an `output_writer.OutputWriter` closed (and reported) after the run,
+    otherwise None and the outputs are written in the foreground.
+
+    Args:
+        args (argparse.Namespace): The parsed command line.
+        run (callable): Runs the workflow with the given writer.
+
+    Returns:
+        callable: The command.
+    """
+    if not args.background_write:
+        return lambda: run(None)
+    output_writer = load_module('output_writer')
+
+    def command():
+        with output_writer.OutputWriter(queue_size=args.write_queue) as writer:
+            run(writer)
+        writer.report()
+    return command
+
+# Each handler imports what its subcommand needs and returns the command to
+# run, so start-up is measured separately from the work itself
+def run_scrape(args):
+    scrape_books = load_module('scrape_books')
+    return with_writer(args, lambda writer: scrape_books.main(args.url, args.pages, args.output, writer=writer))
+
+def run_process_books(args):
+    process_books = load_module('process_books')
+    return with_writer(args, lambda writer: process_books.main(args.input, args.output, plots=not args.no_plots,
+                                                               incremental=args.incremental,
+                                                               changes_file_path=args.changes, writer=writer))
+
+def run_scrape_process(args):
+    books_pipeline = load_module('books_pipeline')
+    return with_writer(args, lambda writer: books_pipeline.scrape_and_clean(args.url, args.pages, args.output,
+                                                                            plots=not args.no_plots, writer=writer))
+
+def run_process_salaries(args):
+    data_processing = load_module('data_processing')
+    if args.watch:
+        watch = load_module('watch')
+        return lambda: watch.run_watch(args.input, args.output, cube_file=args.cube_file, chunksize=args.chunksize,
+                                       engine=args.engine, interval=args.interval)
+    if args.stream:
+        load_module('streaming')
+    return with_writer(args, lambda writer: data_processing.main(args.input, args.output, stream=args.stream,
+                                                                 chunksize=args.chunksize, top_n=args.top_n,
+                                                                 cube_file=args.cube_file, plots=not args.no_plots,
+                                                                 engine=args.engine, max_workers=args.workers,
+                                                                 db_path=args.db, cache=args.cache, writer=writer))
+
+def read_sample(args):
+    """
+    Draws the sample requested by --sample or --per-company, or returns None without them.
+
+    Args:
+        args (argparse.Namespace): The parsed arguments.
+
+    Returns:
+        pd.DataFrame: The cleaned sample (see `sampling.sample_data`), or None.
+    """
+    if args.sample is None and args.per_company is None:
+        return None
+    sampling = sys.modules['sampling']
+    size = args.sample or sampling.DEFAULT_SAMPLE_SIZE
+    return sampling.sample_data(args.input, size=size, per_company=args.per_company, seed=args.seed)
+
+def run_stats(args):
+    data_processing = load_module('data_processing')
+    if args.sample is not None or args.per_company is not None:
+        load_module('sampling')
+
+    def command():
+        sample = read_sample(args)
+        if sample is not None:
+            sys.modules['sampling'].print_sample_summary(sample, seed=args.seed)
+            return
+        df = data_processing.read_data(args.input, clean=True, engine=args.engine, max_workers=args.workers,
+                                       cache=args.cache)
+        data_processing.calculate_summary_statistics(df, use_sketches=args.sketches)
+    return command
+
+def run_plot(args):
+    if args.output_dir:
+        # Select a non-interactive backend before pyplot is loaded
+        load_module('matplotlib').use('Agg')
+    data_processing = load_module('data_processing')
+    if args.sample is not None or args.per_company is not None:
+        load_module('sampling')
+
+    def command():
+        sample = read_sample(args)
+        if sample is not None:
+            df = sys.modules['sampling'].unweighted_view(sample, seed=args.seed)
+            print(f"Plotting a sample of {len(df):,} of {sample.attrs['rows_seen']:,} rows")
+        else:
+            df = data_processing.read_data(args.input, clean=True, engine=args.engine, cache=args.cache)
+        plt = data_processing.plt
+        for name in args.plots or list(PLOTS):
+            function_name, takes_top_n, takes_engine = PLOTS[name]
+            before = set(plt.get_fignums())
+            options = {'top_n': args.top_n} if takes_top_n else {}
+            if takes_engine:
+                options['engine'] = args.engine
+            getattr(data_processing, function_name)(df, **options)
+            if args.output_dir:
+                os.makedirs(args.output_dir, exist_ok=True)
+                for number in sorted(set(plt.get_fignums()) - before):
+                    path = os.path.join(args.output_dir, f'{name}.png')
+                    plt.figure(number).savefig(path)
+                    plt.close(number)
+                    print(f"Plot saved to {path}")
+    return command
+
+def run_profiled(command, args):
+    """
+    Runs a command with the workflow modules instrumented and writes the run report.
+
+    Args:
+        command (callable): The command returned by a subcommand handler.
+        args (argparse.Namespace): The parsed arguments.
+    """
+    from profiling import StageProfiler
+    profiler = StageProfiler(memory=not args.no_profile_memory, sample_stage=args.flamegraph)
+    with profiler:
+        profiler.instrument(*[sys.modules[name] for name in PROFILED_MODULES if name in sys.modules])
+        command()
+    profiler.write_report(args.profile)
+    if args.flamegraph:
+        profiler.write_flamegraph(f'{os.path.splitext(args.profile)[0]}.{args.flamegraph}.folded')
+
+def positive_int(value):
+    """
+    Parses an option that must be a whole number of at least 1.
+    """
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def add_writer_arguments(subparser):
+    """
+    Adds the options of the background output writer to a subcommand that saves a CSV.
+    """
+    subparser.add_argument('--background-write', action='store_true',
+                           help='write the outputs in a background thread, atomically; .gz and .zst outputs are compressed')
+    subparser.add_argument('--write-queue', type=int, default=WRITE_QUEUE_SIZE, metavar='N',
+                           help='with --background-write, batches queued before the workflow waits for the disk')
+
+def build_parser():
+    parser = argparse.ArgumentParser(description='Scrape books and process the books and salary datasets.')
+    parser.add_argument('--import-times', action='store_true', help='print an import-time report to stderr')
+    parser.add_argument('--profile', metavar='REPORT', help='write a JSON report of time, rows and memory per function')
+    parser.add_argument('--flamegraph', metavar='STAGE', help="with --profile, sample a function (e.g. 'clean_data') "
+                        "and write its folded stacks next to the report")
+    parser.add_argument('--no-profile-memory', action='store_true', help='with --profile, skip the slower memory tracing')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    scrape = subparsers.add_parser('scrape', help='scrape books.toscrape.com')
+    scrape.add_argument('--url', default='http://books.toscrape.com/catalogue/page-{}.html')
+    scrape.add_argument('--pages', type=int, default=5)
+    scrape.add_argument('--output', default='books_with_scraped_info.csv')
+    add_writer_arguments(scrape)
+    scrape.set_defaults(handler=run_scrape)
+
+    books = subparsers.add_parser('process-books', help='clean and analyze the scraped books')
+    books.add_argument('--input', default='books_with_scraped_info.csv')
+    books.add_argument('--output', default='cleaned_books_data.csv')
+    books.add_argument('--no-plots', action='store_true', help='clean and save without plotting')
+    books.add_argument('--incremental', action='store_true', help='update only the rows of the output whose UPC was inserted, changed or deleted')
+    books.add_argument('--changes', help='with --incremental, also write the changeset to this CSV')
+    add_writer_arguments(books)
+    books.set_defaults(handler=run_process_books)
+
+    combined = subparsers.add_parser('scrape-process', help='scrape the books and clean them without the intermediate CSV')
+    combined.add_argument('--url', default='http://books.toscrape.com/catalogue/page-{}.html')
+    combined.add_argument('--pages', type=int, default=5)
+    combined.add_argument('--output', default='cleaned_books_data.csv')
+    combined.add_argument('--no-plots', action='store_true', help='clean and save without plotting')
+    add_writer_arguments(combined)
+    combined.set_defaults(handler=run_scrape_process)
+
+    salaries = subparsers.add_parser('process-salaries', help='run the salary workflow')
+    salaries.add_argument('input', nargs='?', default='software_engineer_salaries.csv', help='CSV path or glob pattern')
+    salaries.add_argument('--output', default='processed_software_engineer_salaries.csv')
+    salaries.add_argument('--stream', action='store_true', help='bounded-memory chunked mode')
+    salaries.add_argument('--watch', action='store_true', help='process only the rows appended since the last run, then keep watching')
+    salaries.add_argument('--interval', type=float, default=5.0, help='with --watch, seconds between two refreshes')
+    salaries.add_argument('--chunksize', type=int, default=100_000)
+    salaries.add_argument('--top-n', type=int, default=30)
+    salaries.add_argument('--cube-file', default='salary_cube.json')
+    salaries.add_argument('--db', help='also write the cleaned data to this indexed SQLite database')
+    salaries.add_argument('--no-plots', action='store_true', help='clean and save without plotting')
+    salaries.add_argument('--engine', choices=ENGINES, default='pandas', help='DataFrame engine; polars is multithreaded')
+    salaries.add_argument('--workers', type=int, help='worker processes for files and row shards (default: CPU count)')
+    salaries.add_argument('--cache', action='store_true', help='load the cleaned data from a memory-mapped cache next to the input')
+    add_writer_arguments(salaries)
+    salaries.set_defaults(handler=run_process_salaries)
+
+    stats = subparsers.add_parser('stats', help='print summary statistics of cleaned salary data')
+    stats.add_argument('input', nargs='?', default='software_engineer_salaries.csv', help='CSV path or glob pattern')
+    stats.add_argument('--sketches', action='store_true', help='use the mergeable sketch-based statistics')
+    stats.add_argument('--engine', choices=ENGINES, default='pandas', help='DataFrame engine; polars is multithreaded')
+    stats.add_argument('--workers', type=int, help='worker processes for files and row shards (default: CPU count)')
+    stats.add_argument('--cache', action='store_true', help='load the cleaned data from a memory-mapped cache next to the input')
+    stats.add_argument('--sample', type=positive_int, metavar='N', help='use a uniform random sample of N rows, read in one pass')
+    stats.add_argument('--per-company', type=positive_int, metavar='K', help='use a sample of up to K rows per company instead')
+    stats.add_argument('--seed', type=int, default=0, help='seed of the sample')
+    stats.set_defaults(handler=run_stats)
+
+    plot = subparsers.add_parser('plot', help='draw the salary plots')
+    plot.add_argument('input', nargs='?', default='software_engineer_salaries.csv', help='CSV path or glob pattern')
+    plot.add_argument('--plots', nargs='+', choices=list(PLOTS), help='plots to draw (default: all)')
+    plot.add_argument('--top-n', type=int, default=30)
+    plot.add_argument('--output-dir', help='save the plots as PNG files instead of showing them')
+    plot.add_argument('--engine', choices=ENGINES, default='pandas', help='DataFrame engine; polars is multithreaded')
+    plot.add_argument('--cache', action='store_true', help='load the cleaned data from a memory-mapped cache next to the input')
+    plot.add_argument('--sample', type=positive_int, metavar='N', help='use a uniform random sample of N rows, read in one pass')
+    plot.add_argument('--per-company', type=positive_int, metavar='K', help='use a sample of up to K rows per company instead')
+    plot.add_argument('--seed', type=int, default=0, help='seed of the sample')
+    plot.set_defaults(handler=run_plot)
+    return parser
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    command = args.handler(args)
+    startup_seconds = time.perf_counter() - START
+    loaded_at_startup = loaded_heavy_modules()
+    if args.profile:
+        run_profiled(command, args)
+    else:
+        command()
+    if args.import_times:
+        print_import_report(startup_seconds, loaded_at_startup)
+
+if __name__ == '__main__':
+    main()
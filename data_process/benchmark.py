@@ -0,0 +1,195 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+import contextlib
+import pandas as pd
+from data_processing import aggregate_salary_by_company, clean_data, filter_data_by_location
+from generate_salaries import write_salaries
+from location_index import build_location_index
+from salary_cube import SalaryCube
+from sketches import SummaryStatistics
+
+# Default baseline file and generated-data directory, next to this script
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASELINE = os.path.join(BENCHMARK_DIR, 'benchmark_baseline.json')
+DEFAULT_DATA_DIR = os.path.join(BENCHMARK_DIR, 'benchmark_data')
+
+# Allowed slowdown in throughput and growth in peak memory before a run fails
+DEFAULT_TOLERANCE = 0.25
+
+# Stage name -> (input the stage consumes, function timed on that input)
+STAGES = {
+    'read': ('file', lambda file_path: pd.read_csv(file_path)),
+    'clean': ('raw', lambda df: clean_data(df.copy())),
+    # One shard per CPU, so the speedup over 'clean' shows at every size
+    'clean_sharded': ('raw', lambda df: clean_data(df.copy(), max_workers=None,
+                                                   shard_rows=-(-len(df) // (os.cpu_count() or 1)))),
+    'filter_location': ('clean', lambda df: filter_data_by_location(df, 'Remote')),
+    'location_index': ('clean', lambda df: filter_data_by_location(df, 'Remote', index=build_location_index(df))),
+    'aggregate_companies': ('clean', lambda df: aggregate_salary_by_company(df, top_n=30, box_stats=True)),
+    'summary_statistics': ('clean', lambda df: SummaryStatistics().update(df).describe()),
+    'salary_cube': ('clean', lambda df: SalaryCube.build(df)),
+}
+
+def dataset_path(rows, seed=0, data_dir=DEFAULT_DATA_DIR):
+    """
+    Returns the path of a generated dataset, generating it on first use.
+
+    Args:
+        rows (int): Number of rows.
+        seed (int): Seed of the dataset.
+        data_dir (str): Directory holding generated datasets.
+
+    Returns:
+        str: Path of the CSV file.
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    file_path = os.path.join(data_dir, f'salaries_{rows}_seed{seed}.csv')
+    if not os.path.isfile(file_path):
+        write_salaries(file_path, rows, seed=seed)
+    return file_path
+
+def measure(function, argument, rows, repeat=3):
+    """
+    Measures the throughput and peak memory of one stage.
+
+    The timed runs are separate from the traced run, so tracemalloc's
+    overhead does not distort the throughput. Output printed by the stage is discarded.
+
+    Args:
+        function (callable): The stage function.
+        argument: The stage input.
+        rows (int): Number of input rows, used for the throughput.
+        repeat (int): Number of timed runs; the fastest is kept.
+
+    Returns:
+        tuple: The stage result and a dict with 'seconds', 'rows_per_second' and 'peak_mb'.
+    """
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        seconds = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = function(argument)
+            seconds.append(time.perf_counter() - start)
+
+        tracemalloc.start()
+        try:
+            function(argument)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    best = min(seconds)
+    return result, {
+        'seconds': round(best, 6),
+        'rows_per_second': round(rows / best, 1) if best > 0 else float('inf'),
+        'peak_mb': round(peak / 2**20, 3),
+    }
+
+def run_benchmarks(sizes, stages=None, repeat=3, seed=0, data_dir=DEFAULT_DATA_DIR):
+    """
+    Benchmarks the pipeline stages on generated datasets of the given sizes.
+
+    Args:
+        sizes (list): Row counts of the datasets.
+        stages (list): Stage names to run; every stage in STAGES by default.
+            The stages producing the raw and cleaned data always run.
+        repeat (int): Number of timed runs per stage.
+        seed (int): Seed of the datasets.
+        data_dir (str): Directory holding generated datasets.
+
+    Returns:
+        dict: Results keyed by '<stage>@<rows>'.
+    """
+    selected = set(stages or STAGES) | {'read', 'clean'}
+    results = {}
+    for rows in sizes:
+        inputs = {'file': dataset_path(rows, seed=seed, data_dir=data_dir)}
+        for name, (input_name, function) in STAGES.items():
+            if name not in selected:
+                continue
+            output, result = measure(function, inputs[input_name], rows, repeat=repeat)
+            results[f'{name}@{rows}'] = result
+            if name == 'read':
+                inputs['raw'] = output
+            elif name == 'clean':
+                inputs['clean'] = output
+            print(f"{name:<20} {rows:>11,} rows {result['seconds']:>10.3f}s "
+                  f"{result['rows_per_second']:>14,.0f} rows/s {result['peak_mb']:>10.1f} MB peak")
+    return results
+
+def compare_to_baseline(results, baseline, tolerance=DEFAULT_TOLERANCE):
+    """
+    Compares benchmark results to a saved baseline.
+
+    Args:
+        results (dict): Results of `run_benchmarks`.
+        baseline (dict): Results saved from an earlier run.
+        tolerance (float): Allowed relative drop in throughput and growth in peak memory.
+
+    Returns:
+        list: A message for every regression; empty if there are none.
+    """
+    regressions = []
+    for key, result in results.items():
+        if key not in baseline:
+            continue
+        expected = baseline[key]
+        if result['rows_per_second'] < expected['rows_per_second'] * (1 - tolerance):
+            regressions.append(f"{key}: throughput {result['rows_per_second']:,.0f} rows/s "
+                               f"is below the baseline {expected['rows_per_second']:,.0f} rows/s")
+        if result['peak_mb'] > expected['peak_mb'] * (1 + tolerance):
+            regressions.append(f"{key}: peak memory {result['peak_mb']:.1f} MB "
+                               f"is above the baseline {expected['peak_mb']:.1f} MB")
+    return regressions
+
+def load_baseline(file_path):
+    """
+    Loads saved benchmark results, or an empty baseline if there is none.
+    """
+    if not os.path.isfile(file_path):
+        return {}
+    with open(file_path, encoding='utf-8') as baseline_file:
+        return json.load(baseline_file)
+
+def save_baseline(results, file_path):
+    """
+    Saves benchmark results as the new baseline, keeping entries not re-run.
+    """
+    baseline = load_baseline(file_path)
+    baseline.update(results)
+    with open(file_path, 'w', encoding='utf-8') as baseline_file:
+        json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+    print(f"Baseline saved to {file_path}")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the salary processing stages on generated data.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=DEFAULT_DATA_DIR)
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='store these results as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(args.rows, stages=args.stages, repeat=args.repeat, seed=args.seed, data_dir=args.data_dir)
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        return results
+
+    baseline = load_baseline(args.baseline)
+    if not baseline:
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+    regressions = compare_to_baseline(results, baseline, tolerance=args.tolerance)
+    if regressions:
+        print("\nPERFORMANCE REGRESSION:\n" + '\n'.join(f"  {message}" for message in regressions), file=sys.stderr)
+        sys.exit(1)
+    return results
+
+if __name__ == "__main__":
+    main()
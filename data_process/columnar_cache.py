@@ -0,0 +1,246 @@
+"""
+A binary columnar cache of parsed (and cleaned) CSV files.
+
+`read_data(..., cache=True)` stores the frame it parsed in a cache directory
+next to the source file, `.<file name>.cache/`, and later reads load it
+from there instead of parsing the CSV again:
+
+- numeric, boolean and datetime columns and the row index are stored as
+  `.npy` files and loaded with `np.load(mmap_mode='c')`, so concurrent
+  processes share the same physical pages and a reload costs almost nothing.
+  The mapping is copy-on-write: the loaded frame can be modified like a
+  parsed one, and a modified page is copied into the process, never written
+  back to the cache;
+- string columns are dictionary-encoded: the distinct values are kept in
+  the metadata and the per-row codes in a memory-mapped `.npy` file, which
+  are decoded with a single take per column. The decoded strings are a new
+  array in every process, so only the numeric columns share their pages.
+
+A cache is valid while the source file's size and modification time match
+the recorded ones and the cache was written under the same key, which the
+caller derives from the code that parsed and cleaned the frame (see
+`data_processing.cache_key`). When only the modification time changed (the
+file was touched or copied), the content hash decides, and a matching hash
+renews the recorded time. Raw and cleaned frames are cached separately.
+"""
+import glob
+import hashlib
+import json
+import os
+import numpy as np
+import pandas as pd
+
+# Bumped whenever the on-disk layout changes; older caches are rebuilt
+CACHE_FORMAT = 2
+
+def cache_dir(file_path):
+    """
+    Returns the cache directory of a source file.
+
+    Args:
+        file_path (str): Path of the source CSV file.
+
+    Returns:
+        str: The directory, next to the source file.
+    """
+    directory, name = os.path.split(os.path.abspath(file_path))
+    return os.path.join(directory, f'.{name}.cache')
+
+def file_hash(file_path, block_size=1 << 20):
+    """
+    Returns the BLAKE2b hash of a file's content.
+
+    Args:
+        file_path (str): Path of the file.
+        block_size (int): Bytes read at a time.
+
+    Returns:
+        str: The hexadecimal digest.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    with open(file_path, 'rb') as source:
+        for block in iter(lambda: source.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _kind(clean):
+    return 'clean' if clean else 'raw'
+
+def _meta_path(file_path, clean):
+    return os.path.join(cache_dir(file_path), f'{_kind(clean)}.json')
+
+def _write_atomic(path, write):
+    temporary_path = f'{path}.{os.getpid()}.tmp'
+    write(temporary_path)
+    os.replace(temporary_path, path)
+
+def _save_array(path, values):
+    # np.save appends '.npy' to names without it, so the temporary file is written through a handle
+    def write(temporary_path):
+        with open(temporary_path, 'wb') as array_file:
+            np.save(array_file, values, allow_pickle=False)
+    _write_atomic(path, write)
+
+def _encode_column(values):
+    """
+    Splits a column into an array to store and the metadata needed to rebuild it.
+
+    Returns:
+        tuple: The array and a dict, or (None, None) if the column cannot be stored.
+    """
+    dtype = values.dtype
+    if pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_datetime64_dtype(dtype):
+        if isinstance(dtype, np.dtype):
+            return values.to_numpy(), {'encoding': 'plain'}
+        return None, None
+    # Missing values get code -1 by default, on old and new pandas alike
+    codes, uniques = pd.factorize(values)
+    uniques = list(uniques)
+    if not all(isinstance(value, str) for value in uniques):
+        return None, None
+    codes = codes.astype(np.int32 if len(uniques) < 2**31 else np.int64)
+    return codes, {'encoding': 'dictionary', 'dtype': str(dtype), 'values': uniques}
+
+def _decode_column(array, column):
+    if column['encoding'] == 'plain':
+        # A plain ndarray view of the mapped pages; pandas treats memmap subclasses differently
+        return array.view(np.ndarray)
+    # Missing values have code -1, which picks the trailing NaN
+    values = np.array(column['values'] + [np.nan], dtype=object)
+    return pd.Series(values[array], copy=False).astype(column['dtype']).array
+
+def store(df, file_path, clean=False, key=''):
+    """
+    Caches a frame parsed from a source file.
+
+    Nothing is cached if a column has a type the cache cannot hold (e.g.
+    mixed Python objects); the reason is printed.
+
+    Args:
+        df (pd.DataFrame): The frame read (and cleaned) from the file.
+        file_path (str): Path of the source CSV file.
+        clean (bool): Whether `df` is the cleaned frame.
+        key (str): Identifies the code that produced `df`; a cache is only
+            loaded under the key it was written with.
+
+    Returns:
+        bool: Whether the cache was written.
+    """
+    stat = os.stat(file_path)
+    content_hash = file_hash(file_path)
+    kind = _kind(clean)
+    version = f'{kind}-{content_hash[:16]}'
+    directory = cache_dir(file_path)
+
+    encoded = []
+    for position, name in enumerate(df.columns):
+        array, column = _encode_column(df[name])
+        if array is None:
+            print(f"Column '{name}' of type {df[name].dtype} cannot be cached; {file_path} was not cached.")
+            return False
+        encoded.append((array, dict(column, name=name, file=f'{version}-{position}.npy')))
+    index = df.index
+    if not isinstance(index, pd.RangeIndex) and not pd.api.types.is_integer_dtype(index.dtype):
+        print(f"The {index.dtype} index of {file_path} cannot be cached; the file was not cached.")
+        return False
+
+    os.makedirs(directory, exist_ok=True)
+    for array, column in encoded:
+        _save_array(os.path.join(directory, column['file']), array)
+    if isinstance(index, pd.RangeIndex):
+        index_meta = {'start': index.start, 'stop': index.stop, 'step': index.step}
+    else:
+        index_meta = {'file': f'{version}-index.npy'}
+        _save_array(os.path.join(directory, index_meta['file']), index.to_numpy())
+
+    meta = {
+        'format': CACHE_FORMAT, 'key': key, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash,
+        'version': version, 'rows': len(df), 'index': index_meta, 'columns': [column for _, column in encoded],
+    }
+
+    def write(temporary_path):
+        with open(temporary_path, 'w', encoding='utf-8') as meta_file:
+            json.dump(meta, meta_file)
+    # The metadata is replaced last, so readers only ever see a complete version
+    _write_atomic(_meta_path(file_path, clean), write)
+
+    # Arrays of older versions; processes that mapped them keep their pages until they exit
+    for path in glob.glob(os.path.join(directory, f'{kind}-*.npy')):
+        if not os.path.basename(path).startswith(f'{version}-'):
+            os.remove(path)
+    return True
+
+def _valid_meta(file_path, clean, key):
+    """
+    Returns the metadata of a cache that matches the source file, or None.
+    """
+    try:
+        with open(_meta_path(file_path, clean), encoding='utf-8') as meta_file:
+            meta = json.load(meta_file)
+    except (OSError, ValueError):
+        return None
+    stat = os.stat(file_path)
+    if meta.get('format') != CACHE_FORMAT or meta['key'] != key or meta['size'] != stat.st_size:
+        return None
+    if meta['mtime_ns'] != stat.st_mtime_ns:
+        if file_hash(file_path) != meta['hash']:
+            return None
+        # Same content under a new modification time: renew it so the hash is not recomputed next time
+        meta['mtime_ns'] = stat.st_mtime_ns
+
+        def write(temporary_path):
+            with open(temporary_path, 'w', encoding='utf-8') as meta_file:
+                json.dump(meta, meta_file)
+        _write_atomic(_meta_path(file_path, clean), write)
+    return meta
+
+def load(file_path, clean=False, key=''):
+    """
+    Loads the cached frame of a source file.
+
+    Args:
+        file_path (str): Path of the source CSV file.
+        clean (bool): Whether to load the cleaned frame.
+        key (str): The key the cache must have been written with.
+
+    Returns:
+        pd.DataFrame: The frame, or None if there is no valid cache. Numeric
+            columns are copy-on-write views of memory-mapped files.
+    """
+    meta = _valid_meta(file_path, clean, key)
+    if meta is None:
+        return None
+    directory = cache_dir(file_path)
+    try:
+        columns = {}
+        for column in meta['columns']:
+            array = np.load(os.path.join(directory, column['file']), mmap_mode='c', allow_pickle=False)
+            columns[column['name']] = _decode_column(array, column)
+        if 'file' in meta['index']:
+            index = pd.Index(np.load(os.path.join(directory, meta['index']['file']), mmap_mode='r').view(np.ndarray))
+        else:
+            index = pd.RangeIndex(meta['index']['start'], meta['index']['stop'], meta['index']['step'])
+    except (OSError, ValueError):
+        # Arrays replaced by a concurrent writer since the metadata was read
+        return None
+    return pd.DataFrame(columns, index=index, columns=[column['name'] for column in meta['columns']], copy=False)
+
+def read_cached(file_path, clean, reader, key=''):
+    """
+    Returns the cached frame of a source file, parsing and caching it on a miss.
+
+    Args:
+        file_path (str): Path of the source CSV file.
+        clean (bool): Whether the frame is the cleaned one.
+        reader (callable): Called with `file_path` to parse the file on a miss.
+        key (str): Identifies the code of `reader`; a cache written under
+            another key is rebuilt.
+
+    Returns:
+        pd.DataFrame: The frame.
+    """
+    df = load(file_path, clean, key)
+    if df is None:
+        df = reader(file_path)
+        store(df, file_path, clean, key)
+    return df
@@ -1,20 +1,230 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import numpy as np
 import re
+import os
+import glob
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import sys
+# lazy_imports.py is shared with the web_scraping scripts and lives at the repository root
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.append(REPO_DIR)
+from lazy_imports import lazy_import
+import columnar_cache
+from sketches import SummaryStatistics
+from salary_cube import build_salary_cube
+from salary_store import save_to_store
 
-def read_data(file_path):
+# Plotting libraries are loaded on first use, so runs without plots start fast
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+
+# Column added to multi-file input recording which file each row came from
+SOURCE_COLUMN = 'Source_File'
+
+# Large-data plotting: number of companies drawn individually, the label of
+# the bucket holding all others, and the row count above which per-point
+# drawing and KDE curves are replaced by binned rendering
+DEFAULT_TOP_N = 30
+OTHER_LABEL = 'Other'
+LARGE_DATA_THRESHOLD = 100_000
+
+# Rows per shard when clean_data parses the salaries in a process pool
+DEFAULT_SHARD_ROWS = 250_000
+
+# DataFrame engines accepted by the `engine` argument. Both give identical
+# results; 'polars' runs the heavy parsing and group-bys multithreaded
+ENGINES = ['pandas', 'polars']
+
+def load_engine(engine):
     """
-    Reads the CSV file into a DataFrame.
+    Validates an engine name and loads its implementation.
+    
+    Args:
+        engine (str): 'pandas' or 'polars'.
+    
+    Returns:
+        module: The `polars_engine` module for 'polars', None for 'pandas'.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Error: Unknown engine '{engine}'. Use one of {ENGINES}.")
+    if engine == 'pandas':
+        return None
+    import polars_engine
+    polars_engine.import_polars()
+    return polars_engine
+
+def cache_key(engine):
+    """
+    Returns the columnar cache key of the code that parses and cleans the data.
+    
+    The key combines the engine with a hash of this module and of
+    `polars_engine`, so cached frames are rebuilt once either changes.
+    
+    Args:
+        engine (str): The DataFrame engine, 'pandas' or 'polars'.
+    
+    Returns:
+        str: The key passed to `columnar_cache.read_cached`.
+    """
+    directory = os.path.dirname(os.path.abspath(__file__))
+    hashes = [columnar_cache.file_hash(os.path.join(directory, name)) for name in ('data_processing.py', 'polars_engine.py')]
+    return '-'.join([engine] + hashes)
+
+def is_glob_pattern(path):
+    """
+    Checks whether a path is a glob pattern; an existing file such as 'salaries[2024].csv' is a plain path.
+    """
+    return any(char in path for char in '*?[') and not os.path.isfile(path)
+
+def resolve_input_files(file_path):
+    """
+    Expands an input specification into a sorted list of file paths.
+    
+    Args:
+        file_path (str or list): A path, a glob pattern, or a list of paths and patterns.
+    
+    Returns:
+        list: The matching file paths.
+    """
+    patterns = [file_path] if isinstance(file_path, str) else list(file_path)
+    paths = []
+    for pattern in patterns:
+        if is_glob_pattern(pattern):
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise FileNotFoundError(f"Error: No files match the pattern '{pattern}'.")
+            paths.extend(matches)
+        else:
+            paths.append(pattern)
+    return paths
+
+def is_multi_file_input(file_path):
+    """
+    Checks whether an input specification refers to more than a single plain path.
+    
+    Args:
+        file_path (str or list): A path, a glob pattern, or a list of paths and patterns.
+    
+    Returns:
+        bool: True for glob patterns and lists, False for a single path.
+    """
+    return not isinstance(file_path, str) or is_glob_pattern(file_path)
+
+def _read_file(file_path, clean, engine='pandas', cache=False):
+    """
+    Reads (and optionally cleans) one input file. Runs inside a worker process.
     
     Args:
         file_path (str): Path to the CSV file.
+        clean (bool): Whether to apply clean_data to the file.
+        engine (str): The DataFrame engine, 'pandas' or 'polars'.
+        cache (bool): Whether to load the file from its columnar cache (see `columnar_cache`).
+    
+    Returns:
+        tuple: The DataFrame, the read time and the clean time in seconds.
+    """
+    polars_engine = load_engine(engine)
+    start = time.perf_counter()
+    if cache:
+        # A cache hit includes the cleaning, so all of the time counts as reading
+        df = columnar_cache.read_cached(file_path, clean, lambda path: read_data(path, clean=clean, max_workers=1, engine=engine),
+                                        key=cache_key(engine))
+        df[SOURCE_COLUMN] = os.path.basename(file_path)
+        return df, time.perf_counter() - start, 0.0
+
+    df = pd.read_csv(file_path) if polars_engine is None else polars_engine.read_csv(file_path)
+    read_seconds = time.perf_counter() - start
+    
+    clean_seconds = 0.0
+    if clean:
+        start = time.perf_counter()
+        # Files are already cleaned in parallel; one file is not sharded again
+        df = clean_data(df, engine=engine, max_workers=1)
+        clean_seconds = time.perf_counter() - start
+    
+    df[SOURCE_COLUMN] = os.path.basename(file_path)
+    return df, read_seconds, clean_seconds
+
+def read_files(file_paths, clean=False, max_workers=None, engine='pandas', cache=False):
+    """
+    Reads several CSV files in a process pool and concatenates them.
+    
+    Every file is read (and cleaned when requested) in its own worker. The
+    results are aligned on the union of their columns, in order of first
+    appearance, and a source-file column is appended. Per-file timings are
+    printed and attached to the result as `df.attrs['file_timings']`.
+    
+    Args:
+        file_paths (list): Paths to the CSV files.
+        clean (bool): Whether to clean each file in its worker.
+        max_workers (int): Number of worker processes. Defaults to the CPU count.
+        engine (str): The DataFrame engine used in the workers, 'pandas' or 'polars'.
+        cache (bool): Whether each file is loaded from its columnar cache.
+    
+    Returns:
+        pd.DataFrame: The concatenated data from all files.
+    """
+    if not file_paths:
+        raise ValueError("Error: No input files were given.")
+    
+    if max_workers == 1 or len(file_paths) == 1:
+        results = [_read_file(path, clean, engine, cache) for path in file_paths]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            results = list(executor.map(_read_file, file_paths, [clean] * len(file_paths), [engine] * len(file_paths),
+                                        [cache] * len(file_paths)))
+    
+    # Align every frame on a single schema before concatenating
+    columns = []
+    for df, _, _ in results:
+        columns.extend(column for column in df.columns if column not in columns)
+    columns.remove(SOURCE_COLUMN)
+    columns.append(SOURCE_COLUMN)
+    
+    timings = []
+    for path, (df, read_seconds, clean_seconds) in zip(file_paths, results):
+        timings.append({'file': path, 'rows': len(df), 'read_seconds': read_seconds, 'clean_seconds': clean_seconds})
+        print(f"Ingested {path}: {len(df)} rows (read {read_seconds:.3f}s, clean {clean_seconds:.3f}s)")
+    
+    combined = pd.concat([df.reindex(columns=columns) for df, _, _ in results], ignore_index=True)
+    combined.attrs['file_timings'] = timings
+    return combined
+
+def read_data(file_path, clean=False, max_workers=None, engine='pandas', shard_rows=DEFAULT_SHARD_ROWS, cache=False):
+    """
+    Reads the CSV file into a DataFrame.
+    
+    Args:
+        file_path (str or list): Path to the CSV file, a glob pattern, or a list
+            of paths. Multiple files are read in parallel (see `read_files`).
+        clean (bool): Whether to also clean the data. For multiple files the
+            cleaning runs in the worker processes.
+        max_workers (int): Number of worker processes for multiple files, or
+            for the shards of a single large file (see `clean_data`).
+        engine (str): 'pandas', or 'polars' to parse the CSV and the salaries
+            with polars' multithreaded reader. The result is the same.
+        shard_rows (int): Rows per shard when a single file is cleaned in parallel.
+        cache (bool): Whether to keep a memory-mapped columnar cache of the
+            parsed (and cleaned) data next to each file and load it instead
+            of parsing again while the file is unchanged (see `columnar_cache`).
     
     Returns:
         pd.DataFrame: DataFrame containing the data from the CSV file.
     """
-    return pd.read_csv(file_path)
+    if is_multi_file_input(file_path):
+        return read_files(resolve_input_files(file_path), clean=clean, max_workers=max_workers, engine=engine, cache=cache)
+    if cache:
+        return columnar_cache.read_cached(file_path, clean, lambda path: read_data(
+            path, clean=clean, max_workers=max_workers, engine=engine, shard_rows=shard_rows), key=cache_key(engine))
+    
+    polars_engine = load_engine(engine)
+    if polars_engine is not None:
+        return polars_engine.read_csv(file_path, clean=clean)
+    df = pd.read_csv(file_path)
+    return clean_data(df, max_workers=max_workers, shard_rows=shard_rows) if clean else df
 
 def extract_salary(salary_str):
     """
@@ -58,82 +268,264 @@ def extract_salary(salary_str):
         return None, None, None
 
 
-def clean_data(df):
+def _clean_shard(memory_name, total_rows, start, salaries):
+    """
+    Parses one shard of salary strings into the shared result arrays. Runs inside a worker process.
+    
+    Args:
+        memory_name (str): Name of the shared memory block holding the results.
+        total_rows (int): Number of rows of the whole frame.
+        start (int): Position of the shard's first row.
+        salaries (np.ndarray): The shard's salary strings.
+    
+    Returns:
+        int: The number of rows parsed.
+    """
+    memory = shared_memory.SharedMemory(name=memory_name)
+    try:
+        results = np.ndarray((3, total_rows), dtype=float, buffer=memory.buf)
+        # None (an unparseable salary) becomes NaN in a float array
+        results[:, start:start + len(salaries)] = np.array([extract_salary(s) for s in salaries], dtype=float).T
+        # The view must be released before the block can be closed
+        del results
+    finally:
+        memory.close()
+    return len(salaries)
+
+def parse_salaries_sharded(salaries, max_workers=None, shard_rows=DEFAULT_SHARD_ROWS):
+    """
+    Parses salary strings with `extract_salary` in a process pool.
+    
+    The column is split into row shards. Each worker writes its low, high
+    and average salaries straight into one shared-memory array, so only
+    the salary strings are sent to the workers and no DataFrame is pickled
+    back.
+    
+    Args:
+        salaries (pd.Series): The salary strings.
+        max_workers (int): Number of worker processes. Defaults to the CPU count.
+        shard_rows (int): Rows per shard.
+    
+    Returns:
+        tuple: NumPy arrays of the low, high and average salary, NaN where
+            `extract_salary` returns None.
+    """
+    if shard_rows < 1:
+        raise ValueError("Error: shard_rows must be at least 1.")
+    values = salaries.to_numpy(dtype=object)
+    total_rows = len(values)
+    memory = shared_memory.SharedMemory(create=True, size=max(3 * total_rows * 8, 1))
+    try:
+        starts = list(range(0, total_rows, shard_rows))
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(_clean_shard, [memory.name] * len(starts), [total_rows] * len(starts), starts,
+                              [values[start:start + shard_rows] for start in starts]))
+        results = np.ndarray((3, total_rows), dtype=float, buffer=memory.buf).copy()
+    finally:
+        memory.close()
+        memory.unlink()
+    return results[0], results[1], results[2]
+
+def clean_data(df, engine='pandas', max_workers=1, shard_rows=DEFAULT_SHARD_ROWS):
     """
     Clean the dataset by removing unwanted characters from the salary
     column, handling missing values, and converting data types.
     
     Args:
-        df (pd.DataFrame): The raw data.
+        df (pd.DataFrame or str or list): The raw data, or a glob pattern or
+            list of files to read and clean in parallel.
+        engine (str): 'pandas', or 'polars' to parse the salary strings in
+            polars with the same rules as `extract_salary`.
+        max_workers (int): Number of worker processes parsing the salaries of
+            a frame longer than `shard_rows` (see `parse_salaries_sharded`);
+            None uses every CPU. 1 parses in this process. The polars engine
+            is multithreaded already and never shards.
+        shard_rows (int): Rows per shard.
 
     Returns:
         pd.DataFrame: The cleaned data.
     """
+    if not isinstance(df, pd.DataFrame):
+        return read_data(df, clean=True, max_workers=max_workers, engine=engine, shard_rows=shard_rows)
+    polars_engine = load_engine(engine)
+    workers = max_workers or os.cpu_count() or 1
+    
     # Ensure the 'Salary' column is a string
     df['Salary'] = df['Salary'].astype(str)
     
     # Extract salary components and create new columns
-    df[['Salary_Low', 'Salary_High', 'Average_Salary']] = df['Salary'].apply(lambda x: pd.Series(extract_salary(x)))
+    if polars_engine is not None:
+        df['Salary_Low'], df['Salary_High'], df['Average_Salary'] = polars_engine.parse_salaries(df['Salary'])
+    elif workers > 1 and len(df) > shard_rows:
+        df['Salary_Low'], df['Salary_High'], df['Average_Salary'] = parse_salaries_sharded(
+            df['Salary'], max_workers=workers, shard_rows=shard_rows)
+    else:
+        df[['Salary_Low', 'Salary_High', 'Average_Salary']] = df['Salary'].apply(lambda x: pd.Series(extract_salary(x)))
     
     # Drop rows where salary could not be extracted
     df = df.dropna(subset=['Salary_Low', 'Salary_High', 'Average_Salary'])
     
     return df
 
-def calculate_summary_statistics(df):
+def calculate_summary_statistics(df, use_sketches=False):
     """
     Calculates and prints summary statistics for numerical columns.
     
     Args:
         df (pd.DataFrame): The DataFrame to analyze.
+        use_sketches (bool): Whether to compute the statistics with the
+            mergeable sketches of `sketches.SummaryStatistics` instead of
+            `describe`. Percentiles and unique counts are then approximate.
     
     Returns:
         None
     """
     print("\nSummary Statistics:")
-    print(df.describe(include='all'))
+    if use_sketches:
+        print(SummaryStatistics().update(df).describe())
+    else:
+        print(df.describe(include='all'))
 
-def filter_data_by_location(df, location):
+def filter_data_by_location(df, location, index=None, engine='pandas'):
     """
     Filters the DataFrame by job location.
     
     Args:
         df (pd.DataFrame): The DataFrame to filter.
         location (str): The location to filter by.
+        index (LocationIndex): Optional location index built over `df`. When
+            given, the pattern is matched once per distinct location instead
+            of once per row.
+        engine (str): 'pandas', or 'polars' to match the pattern in polars.
     
     Returns:
         pd.DataFrame: Filtered DataFrame.
     """
+    if index is not None:
+        return df.iloc[index.contains_positions(location)]
+    polars_engine = load_engine(engine)
+    if polars_engine is not None:
+        return df[polars_engine.contains(df['Location'], location)]
     return df[df['Location'].str.contains(location, na=False)]
 
-def plot_salary_distribution(df):
+def bucket_companies(companies, top_n):
+    """
+    Keeps the `top_n` most frequent companies and labels all others as 'Other'.
+    
+    Args:
+        companies (pd.Series): The company of each row.
+        top_n (int): Number of companies to keep.
+    
+    Returns:
+        pd.Series: The company label of each row.
+    """
+    top = companies.value_counts().index[:top_n]
+    return companies.where(companies.isin(top), OTHER_LABEL)
+
+def aggregate_salary_by_company(df, top_n=None, box_stats=False, engine='pandas'):
+    """
+    Aggregates average salaries per company for the company plots.
+    
+    Args:
+        df (pd.DataFrame): The DataFrame containing salary information.
+        top_n (int): If given, keep the `top_n` most frequent companies and pool
+            the rest into an 'Other' bucket.
+        box_stats (bool): Whether to include the min, quartiles and max needed
+            by the box plot.
+        engine (str): 'pandas', or 'polars' to run the group-by in polars.
+    
+    Returns:
+        pd.DataFrame: One row per company with 'count' and 'mean' columns, plus
+            'min', '25%', '50%', '75%' and 'max' when `box_stats` is set.
+    """
+    polars_engine = load_engine(engine)
+    companies = df['Company'] if top_n is None else bucket_companies(df['Company'], top_n)
+    if polars_engine is not None:
+        return polars_engine.aggregate_by_company(companies, df['Average_Salary'], box_stats=box_stats)
+    grouped = df['Average_Salary'].groupby(companies)
+    aggregates = grouped.agg(['count', 'mean'])
+    if box_stats:
+        quantiles = grouped.quantile([0, 0.25, 0.5, 0.75, 1]).unstack()
+        quantiles.columns = ['min', '25%', '50%', '75%', 'max']
+        aggregates = aggregates.join(quantiles)
+    aggregates.index.name = 'Company'
+    return aggregates
+
+def collapse_company_aggregates(aggregates, top_n):
+    """
+    Keeps the `top_n` companies with the most rows of precomputed aggregates
+    and pools the rest into an 'Other' row with a count-weighted mean.
+    
+    Args:
+        aggregates (pd.DataFrame): Per-company 'count' and 'mean' columns.
+        top_n (int): Number of companies to keep.
+    
+    Returns:
+        pd.DataFrame: The collapsed 'count' and 'mean' columns.
+    """
+    aggregates = aggregates[['count', 'mean']].sort_values('count', ascending=False)
+    top, rest = aggregates.iloc[:top_n], aggregates.iloc[top_n:]
+    if rest.empty:
+        return top
+    other = pd.DataFrame({'count': [rest['count'].sum()], 'mean': [(rest['count'] * rest['mean']).sum() / rest['count'].sum()]}, index=[OTHER_LABEL])
+    return pd.concat([top, other])
+
+def _plot_histogram(values, bins, color):
+    """
+    Draws a histogram, with a KDE curve for small inputs only.
+    
+    Above LARGE_DATA_THRESHOLD values the bin counts are computed with
+    numpy and drawn as steps, so render time does not grow with the data.
+    
+    Args:
+        values (pd.Series): The values to plot.
+        bins (int): Number of bins.
+        color (str): Bar color.
+    """
+    if len(values) > LARGE_DATA_THRESHOLD:
+        counts, edges = np.histogram(values.dropna(), bins=bins)
+        plt.stairs(counts, edges, fill=True, color=color, alpha=0.6)
+    else:
+        sns.histplot(values, bins=bins, kde=True, color=color)
+
+def plot_salary_distribution(df, title='Average Salary Distribution'):
     """
     Plots the distribution of average salaries.
     
     Args:
         df (pd.DataFrame): The DataFrame containing salary information.
+        title (str): The plot title.
     
     Returns:
         None
     """
     plt.figure(figsize=(10, 6))
-    sns.histplot(df['Average_Salary'], bins=30, kde=True, color='blue')
-    plt.title('Average Salary Distribution')
+    _plot_histogram(df['Average_Salary'], bins=30, color='blue')
+    plt.title(title)
     plt.xlabel('Average Salary')
     plt.ylabel('Frequency')
     plt.show()
 
-def plot_salary_by_company(df):
+def plot_salary_by_company(df=None, top_n=None, aggregates=None, engine='pandas'):
     """
     Plots the average salary by company.
     
     Args:
         df (pd.DataFrame): The DataFrame containing salary information.
+        top_n (int): If given, plot only the `top_n` most frequent companies
+            and an 'Other' bar for the rest.
+        aggregates (pd.DataFrame): Precomputed per-company 'count' and 'mean'
+            columns (see `aggregate_salary_by_company`), used instead of `df`.
+        engine (str): The DataFrame engine used to aggregate `df`.
     
     Returns:
         None
     """
-    avg_salary_by_company = df.groupby('Company')['Average_Salary'].mean().sort_values()
+    if aggregates is None:
+        aggregates = aggregate_salary_by_company(df, top_n=top_n, engine=engine)
+    elif top_n is not None:
+        aggregates = collapse_company_aggregates(aggregates, top_n)
+    avg_salary_by_company = aggregates['mean'].sort_values()
     
     plt.figure(figsize=(12, 8))
     avg_salary_by_company.plot(kind='bar', color='green')
@@ -143,53 +535,86 @@ def plot_salary_by_company(df):
     plt.xticks(rotation=45, ha='right')
     plt.show()
 
-def plot_salary_boxplot(df):
+def plot_salary_boxplot(df=None, top_n=None, aggregates=None, engine='pandas'):
     """
     Creates a box plot for salary distribution.
     
     Args:
         df (pd.DataFrame): The DataFrame containing salary information.
+        top_n (int): If given, draw boxes only for the `top_n` most frequent
+            companies and an 'Other' box for the rest.
+        aggregates (pd.DataFrame): Precomputed per-company box statistics
+            (see `aggregate_salary_by_company` with `box_stats=True`). With
+            `top_n`, they must already hold at most `top_n` companies (plus
+            'Other'), since quartiles cannot be pooled into an 'Other' box
+            afterwards.
+        engine (str): The DataFrame engine used to aggregate `df`.
     
     Returns:
         None
     """
+    companies = 0 if aggregates is None else len(aggregates.index.drop(OTHER_LABEL, errors='ignore'))
+    if top_n is not None and companies > top_n:
+        raise ValueError(f"Error: The precomputed box statistics hold {companies} companies, more than top_n={top_n}; "
+                         "aggregate them with `aggregate_salary_by_company(df, top_n=top_n, box_stats=True)` instead.")
     plt.figure(figsize=(10, 6))
-    sns.boxplot(x='Company', y='Average_Salary', data=df, palette='Set2')
+    if top_n is None and aggregates is None:
+        sns.boxplot(x='Company', y='Average_Salary', data=df, palette='Set2')
+    else:
+        if aggregates is None:
+            aggregates = aggregate_salary_by_company(df, top_n=top_n, box_stats=True, engine=engine)
+        # Boxes are drawn from the precomputed statistics; whiskers span min to max
+        stats = [
+            {'label': company, 'whislo': row['min'], 'q1': row['25%'], 'med': row['50%'], 'q3': row['75%'], 'whishi': row['max'], 'fliers': []}
+            for company, row in aggregates.iterrows()
+        ]
+        plt.gca().bxp(stats, showfliers=False, patch_artist=True)
     plt.title('Salary Box Plot by Company')
     plt.xlabel('Company')
     plt.ylabel('Average Salary')
     plt.xticks(rotation=45, ha='right')
     plt.show()
 
-def plot_rating_distribution(df):
+def plot_rating_distribution(df, title='Company Rating Distribution'):
     """
     Plots the distribution of company ratings.
     
     Args:
         df (pd.DataFrame): The DataFrame containing company ratings.
+        title (str): The plot title.
     
     Returns:
         None
     """
     plt.figure(figsize=(10, 6))
-    sns.histplot(df['Company Score'], bins=20, kde=True, color='orange')
-    plt.title('Company Rating Distribution')
+    _plot_histogram(df['Company Score'], bins=20, color='orange')
+    plt.title(title)
     plt.xlabel('Company Rating')
     plt.ylabel('Frequency')
     plt.show()
 
-def plot_salary_vs_rating(df):
+def plot_salary_vs_rating(df, top_n=None):
     """
     Creates a scatter plot of salary versus company rating.
     
+    Above LARGE_DATA_THRESHOLD rows the points are binned into a hexbin
+    density plot instead of being drawn one by one.
+    
     Args:
         df (pd.DataFrame): The DataFrame containing salary and company rating.
+        top_n (int): If given, color only the `top_n` most frequent companies
+            and group the rest under 'Other' in the legend.
     
     Returns:
         None
     """
     plt.figure(figsize=(10, 6))
-    sns.scatterplot(x='Company Score', y='Average_Salary', data=df, hue='Company', palette='viridis')
+    if len(df) > LARGE_DATA_THRESHOLD:
+        plt.hexbin(df['Company Score'], df['Average_Salary'], gridsize=50, mincnt=1, bins='log', cmap='viridis')
+        plt.colorbar(label='Count')
+    else:
+        hue = df['Company'] if top_n is None else bucket_companies(df['Company'], top_n)
+        sns.scatterplot(x='Company Score', y='Average_Salary', data=df, hue=hue, palette='viridis')
     plt.title('Salary vs Company Rating')
     plt.xlabel('Company Rating')
     plt.ylabel('Average Salary')
@@ -218,21 +643,35 @@ def plot_heatmap_correlation(df):
     plt.title('Correlation Heatmap')
     plt.show()
 
-def save_processed_data(df, file_path):
+def save_processed_data(df, file_path, db_path=None, writer=None):
     """
     Saves the cleaned and processed DataFrame to a new CSV file.
     
     Args:
         df (pd.DataFrame): The DataFrame to save.
         file_path (str): Path where the CSV file will be saved.
+        db_path (str): Optional SQLite database that also receives the data,
+            indexed for repeated queries (see `salary_store.SalaryStore`).
+        writer (output_writer.OutputWriter): Optional background writer the CSV
+            is queued on, so the caller goes on while it is written. Errors
+            writing or renaming the file, such as a PermissionError while it
+            is open in another program, are then raised by the writer's
+            `flush` or `close` rather than reported here.
     
     Returns:
         None
     """
     try:
-        # Attempt to save the DataFrame to a CSV file
-        df.to_csv(file_path, index=False)
-        print(f"Processed data successfully saved to {file_path}")
+        if writer is not None:
+            # The CSV is written in the writer thread and renamed into place when complete
+            writer.write(df, file_path)
+            print(f"Processed data queued for {file_path}")
+        else:
+            # Attempt to save the DataFrame to a CSV file
+            df.to_csv(file_path, index=False)
+            print(f"Processed data successfully saved to {file_path}")
+        if db_path is not None:
+            save_to_store(df, db_path)
     except PermissionError:
         # Handle the case where the file is open or permissions are denied
         print(f"Error: The file '{file_path}' is currently open in another program. Please close the file and try again.")
@@ -244,34 +683,56 @@ def save_processed_data(df, file_path):
         print(f"An unexpected error occurred: {e}")
         
 # Main function to execute the script
-def main():
-    # File paths
-    input_file = 'software_engineer_salaries.csv'
-    output_file = 'processed_software_engineer_salaries.csv'
-    
-    # Read data
-    df = read_data(input_file)
-    
-    # Clean data
-    df = clean_data(df)
+def main(input_file='software_engineer_salaries.csv', output_file='processed_software_engineer_salaries.csv',
+         stream=False, chunksize=100_000, top_n=DEFAULT_TOP_N, cube_file='salary_cube.json', plots=True,
+         engine='pandas', max_workers=None, db_path=None, cache=False, sample=None, watch=False, writer=None):
+    if watch:
+        # Incremental mode: process the rows appended to the input since the last refresh, until interrupted
+        from watch import run_watch
+        run_watch(input_file, output_file, cube_file=cube_file, chunksize=chunksize, engine=engine)
+        return
+    
+    if sample:
+        # Exploratory mode: statistics with confidence intervals and distribution plots of a sample
+        from sampling import run_sampled
+        run_sampled(input_file, size=sample, plots=plots)
+        return
+    
+    if stream:
+        # Bounded-memory mode: clean and write chunk by chunk, keeping running aggregates
+        from streaming import run_streaming
+        run_streaming(input_file, output_file, chunksize=chunksize, top_n=top_n, plots=plots, engine=engine,
+                      db_path=db_path, writer=writer, cube_file=cube_file)
+        return
+    
+    # Read and clean data (a glob or list of shard files is ingested in parallel,
+    # and the salaries of a single large file are parsed in row shards)
+    df = read_data(input_file, clean=True, engine=engine, max_workers=max_workers, cache=cache)
     
     # Calculate summary statistics
     calculate_summary_statistics(df)
     
     # Filter data (example: filter for 'Remote' jobs)
-    remote_jobs = filter_data_by_location(df, 'Remote')
+    remote_jobs = filter_data_by_location(df, 'Remote', engine=engine)
     print(f"\nRemote Jobs Data:\n{remote_jobs.head()}")
     
-    # Plot visualizations
-    plot_salary_distribution(df)
-    plot_salary_by_company(df)
-    plot_salary_boxplot(df)
-    plot_rating_distribution(df)
-    plot_salary_vs_rating(df)
-    plot_heatmap_correlation(df)
+    # Plot visualizations (skipping them never loads matplotlib)
+    if plots:
+        plot_salary_distribution(df)
+        plot_salary_by_company(df, top_n=top_n, engine=engine)
+        plot_salary_boxplot(df, top_n=top_n, engine=engine)
+        plot_rating_distribution(df)
+        plot_salary_vs_rating(df, top_n=top_n)
+        plot_heatmap_correlation(df)
+    
+    # Save processed data (with a background writer, the cube is built while the CSV is written)
+    save_processed_data(df, output_file, db_path=db_path, writer=writer)
     
-    # Save processed data
-    save_processed_data(df, output_file)
+    # Materialize the aggregate cube used by the fast query API
+    build_salary_cube(df, cube_file)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Optional input path or glob pattern, e.g. 'exports/salaries_*.csv',
+    # '--stream' for the bounded-memory mode and '--watch' for the incremental mode
+    args = [arg for arg in sys.argv[1:] if arg not in ('--stream', '--watch')]
+    main(*args[:1], stream='--stream' in sys.argv[1:], watch='--watch' in sys.argv[1:])
\ No newline at end of file
@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+import os
+import time
+
+# Rows generated from one random stream; the output does not depend on how
+# many blocks are written at a time
+BLOCK_ROWS = 100_000
+
+COLUMNS = ['Company', 'Company Score', 'Job Title', 'Location', 'Date', 'Salary']
+
+# Default size of the company pool
+DEFAULT_COMPANIES = 5000
+
+# Shares of each salary format, matching software_engineer_salaries.csv
+SALARY_FORMATS = {
+    'range': 0.74,
+    'single': 0.04,
+    'hourly_range': 0.03,
+    'hourly': 0.02,
+    'malformed': 0.03,
+    'missing': 0.14,
+}
+
+MALFORMED_SALARIES = ['$80K - ', 'Competitive', '$100K - $120K - $140K', '-', '$', 'K']
+
+JOB_TITLES = {
+    'Software Engineer': 156, 'Senior Software Engineer': 41, 'Software Engineer II': 19,
+    'Software Developer': 15, 'Software Engineer III': 10, 'Sr. Software Engineer': 9,
+    'DevOps Engineer': 9, 'Software Development Engineer': 8, 'Associate Software Engineer': 6,
+    'Software Engineer I': 6, 'Backend Engineer': 5, 'Full Stack Engineer': 5, 'Staff Software Engineer': 4,
+    'Principal Software Engineer': 3, 'Embedded Software Engineer': 3, 'C# Software Engineer': 2,
+    'Software Engineer, Fullstack, 1+ Years of Experience': 1, 'Junior Software Developer': 2,
+}
+
+LOCATIONS = {
+    'United States': 48, 'Remote': 39, 'Annapolis Junction, MD': 35, 'San Francisco, CA': 28,
+    'Seattle, WA': 28, 'Boston, MA': 20, 'San Jose, CA': 20, 'New York, NY': 18, 'Chicago, IL': 12,
+    'Bellevue, WA': 12, 'Atlanta, GA': 12, 'Austin, TX': 12, 'Washington, DC': 10, 'Los Angeles, CA': 9,
+    'Phoenix, AZ': 9, 'Denver, CO': 8, 'Raleigh, NC': 7, 'Cary, NC': 5, 'Manassas, VA': 4, 'Dallas, TX': 6,
+    'California': 3, 'Hybrid remote in Austin, TX': 2, 'Remote in Boston, MA': 2, 'Minneapolis-Saint Paul': 2,
+}
+
+DATES = [f'{day}d' for day in range(1, 30)] + ['30d+']
+DATE_WEIGHTS = np.array([30.0 / day for day in range(1, 30)] + [20.0])
+
+_COMPANY_PREFIXES = ['Acme', 'Blue', 'Bright', 'Cloud', 'Data', 'Delta', 'Global', 'Green', 'Hyper', 'Iron',
+                     'Meta', 'Nova', 'Open', 'Pixel', 'Quantum', 'Red', 'Silver', 'Smart', 'Vertex', 'Zen']
+_COMPANY_SUFFIXES = ['Systems', 'Labs', 'Software', 'Technologies', 'Health', 'Analytics', 'Networks',
+                     'Solutions', 'Dynamics', 'Works', 'Group, Inc.', 'International, Inc.']
+
+def company_names(count):
+    """
+    Returns `count` distinct, realistic-looking company names.
+
+    Args:
+        count (int): Number of companies.
+
+    Returns:
+        np.ndarray: The company names.
+    """
+    names = []
+    for i in range(count):
+        # 'Acme Systems', ..., then 'Acme 2 Systems', ... once every pair is used
+        prefix = _COMPANY_PREFIXES[i % len(_COMPANY_PREFIXES)]
+        suffix = _COMPANY_SUFFIXES[i // len(_COMPANY_PREFIXES) % len(_COMPANY_SUFFIXES)]
+        series = i // (len(_COMPANY_PREFIXES) * len(_COMPANY_SUFFIXES))
+        names.append(f'{prefix} {suffix}' if series == 0 else f'{prefix} {series + 1} {suffix}')
+    return np.array(names, dtype=object)
+
+def _choice(rng, values, weights, size):
+    weights = np.asarray(list(weights), dtype=float)
+    return np.asarray(list(values), dtype=object)[rng.choice(len(weights), size=size, p=weights / weights.sum())]
+
+def _format_salaries(rng, size):
+    """
+    Draws salary strings in the formats of the source data, e.g.
+    '$68K - $94K (Glassdoor est.)' or '$50.00 - $70.00 Per Hour (Employer est.)'.
+    """
+    kinds = rng.choice(len(SALARY_FORMATS), size=size, p=list(SALARY_FORMATS.values()))
+    low = np.round(np.exp(rng.normal(np.log(100), 0.3, size))).astype(int)
+    high = np.round(low * rng.uniform(1.1, 1.6, size)).astype(int)
+    hourly_low = np.round(rng.uniform(15, 110, size), 2)
+    hourly_high = np.round(hourly_low * rng.uniform(1.05, 1.4, size), 2)
+    suffix = np.where(rng.random(size) < 0.55, '\xa0(Glassdoor est.)', '\xa0(Employer est.)')
+
+    salaries = np.empty(size, dtype=object)
+    names = list(SALARY_FORMATS)
+    for kind, name in enumerate(names):
+        rows = np.flatnonzero(kinds == kind)
+        if name == 'range':
+            values = [f'${l}K - ${h}K{s}' for l, h, s in zip(low[rows], high[rows], suffix[rows])]
+        elif name == 'single':
+            values = [f'${l}K\xa0(Employer est.)' for l in low[rows]]
+        elif name == 'hourly_range':
+            values = [f'${l:.2f} - ${h:.2f}\xa0Per Hour\xa0(Employer est.)' for l, h in zip(hourly_low[rows], hourly_high[rows])]
+        elif name == 'hourly':
+            values = [f'${l:.2f}\xa0Per Hour\xa0(Employer est.)' for l in hourly_low[rows]]
+        elif name == 'malformed':
+            values = _choice(rng, MALFORMED_SALARIES, np.ones(len(MALFORMED_SALARIES)), len(rows))
+        else:
+            values = [None] * len(rows)
+        salaries[rows] = values
+    return salaries
+
+def generate_block(block, rows, seed=0, companies=None):
+    """
+    Generates one block of synthetic raw salary rows.
+
+    The block is drawn from its own random stream, seeded by `seed` and the
+    block number, so any block can be regenerated on its own.
+
+    Args:
+        block (int): The block number.
+        rows (int): Number of rows in the block.
+        seed (int): Seed of the dataset.
+        companies (int): Size of the company pool; companies are drawn from a
+            Zipf-like distribution, so a few large employers dominate.
+
+    Returns:
+        pd.DataFrame: The rows, with the columns of the source data.
+    """
+    companies = companies or DEFAULT_COMPANIES
+    names = company_names(companies)
+    # Each company keeps the same rating in every block
+    scores = np.clip(np.round(np.random.default_rng([seed, companies, 0]).normal(3.9, 0.52, companies), 1), 1.0, 5.0)
+
+    rng = np.random.default_rng([seed, block])
+    company = rng.choice(companies, size=rows, p=_zipf_weights(companies))
+    score = scores[company]
+    score[rng.random(rows) < 0.09] = np.nan
+    location = _choice(rng, LOCATIONS, LOCATIONS.values(), rows)
+    location[rng.random(rows) < 0.015] = None
+    names_column = names[company]
+    names_column[rng.random(rows) < 0.002] = None
+    return pd.DataFrame({
+        'Company': names_column,
+        'Company Score': score,
+        'Job Title': _choice(rng, list(JOB_TITLES), JOB_TITLES.values(), rows),
+        'Location': location,
+        'Date': _choice(rng, DATES, DATE_WEIGHTS, rows),
+        'Salary': _format_salaries(rng, rows),
+    }, columns=COLUMNS)
+
+def _zipf_weights(count, exponent=1.1):
+    weights = 1.0 / np.arange(1, count + 1) ** exponent
+    return weights / weights.sum()
+
+def generate_salaries(rows, seed=0, companies=None):
+    """
+    Generates a synthetic raw salary dataset block by block.
+
+    Args:
+        rows (int): Total number of rows.
+        seed (int): Seed of the dataset; the same seed always gives the same rows.
+        companies (int): Size of the company pool.
+
+    Yields:
+        pd.DataFrame: Blocks of at most BLOCK_ROWS rows.
+    """
+    for block, start in enumerate(range(0, rows, BLOCK_ROWS)):
+        yield generate_block(block, min(BLOCK_ROWS, rows - start), seed=seed, companies=companies)
+
+def write_salaries(file_path, rows, seed=0, companies=None):
+    """
+    Writes a synthetic raw salary CSV, holding one block in memory at a time.
+
+    Args:
+        file_path (str): Path of the CSV file to write.
+        rows (int): Total number of rows.
+        seed (int): Seed of the dataset.
+        companies (int): Size of the company pool.
+
+    Returns:
+        str: The path of the written file.
+    """
+    start = time.perf_counter()
+    temporary_path = f'{file_path}.tmp'
+    for block, df in enumerate(generate_salaries(rows, seed=seed, companies=companies)):
+        df.to_csv(temporary_path, mode='w' if block == 0 else 'a', header=block == 0, index=False)
+    os.replace(temporary_path, file_path)
+    print(f"Generated {rows} rows in {file_path} ({time.perf_counter() - start:.2f}s)")
+    return file_path
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate a synthetic raw salary CSV.')
+    parser.add_argument('rows', type=int)
+    parser.add_argument('--output', default=None, help="defaults to 'synthetic_salaries_<rows>.csv'")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--companies', type=int, default=None)
+    args = parser.parse_args()
+    write_salaries(args.output or f'synthetic_salaries_{args.rows}.csv', args.rows, seed=args.seed, companies=args.companies)
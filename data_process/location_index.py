@@ -0,0 +1,250 @@
+import re
+import numpy as np
+import pandas as pd
+
+# Full US state names mapped to their postal abbreviations
+US_STATES = {
+    'Alabama': 'AL', 'Alaska': 'AK', 'Arizona': 'AZ', 'Arkansas': 'AR', 'California': 'CA',
+    'Colorado': 'CO', 'Connecticut': 'CT', 'Delaware': 'DE', 'District of Columbia': 'DC',
+    'Florida': 'FL', 'Georgia': 'GA', 'Hawaii': 'HI', 'Idaho': 'ID', 'Illinois': 'IL',
+    'Indiana': 'IN', 'Iowa': 'IA', 'Kansas': 'KS', 'Kentucky': 'KY', 'Louisiana': 'LA',
+    'Maine': 'ME', 'Maryland': 'MD', 'Massachusetts': 'MA', 'Michigan': 'MI', 'Minnesota': 'MN',
+    'Mississippi': 'MS', 'Missouri': 'MO', 'Montana': 'MT', 'Nebraska': 'NE', 'Nevada': 'NV',
+    'New Hampshire': 'NH', 'New Jersey': 'NJ', 'New Mexico': 'NM', 'New York': 'NY',
+    'North Carolina': 'NC', 'North Dakota': 'ND', 'Ohio': 'OH', 'Oklahoma': 'OK', 'Oregon': 'OR',
+    'Pennsylvania': 'PA', 'Rhode Island': 'RI', 'South Carolina': 'SC', 'South Dakota': 'SD',
+    'Tennessee': 'TN', 'Texas': 'TX', 'Utah': 'UT', 'Vermont': 'VT', 'Virginia': 'VA',
+    'Washington': 'WA', 'West Virginia': 'WV', 'Wisconsin': 'WI', 'Wyoming': 'WY',
+}
+
+LOCATION_FIELDS = ['City', 'State', 'Remote', 'Hybrid']
+
+_STATE_ABBREVIATIONS = set(US_STATES.values())
+# 'in' is only part of the prefix after 'Remote' or 'Hybrid', so a bare 'IN' stays Indiana
+_WORK_MODE_PREFIX = re.compile(r'^(?:(hybrid\b\s*)?(remote\b)|(hybrid\b))(?:\s*in\b)?\s*', re.IGNORECASE)
+
+
+def normalize_state(state):
+    """
+    Normalizes a state name or abbreviation to its two-letter postal code.
+
+    Args:
+        state (str): A state name ('California', 'New York State') or code ('CA').
+
+    Returns:
+        str: The postal code, or None if the value is not a US state.
+    """
+    if not isinstance(state, str):
+        return None
+    state = state.strip()
+    if state.upper() in _STATE_ABBREVIATIONS:
+        return state.upper()
+    if state.endswith(' State'):
+        state = state[:-len(' State')]
+    return US_STATES.get(state.title())
+
+
+def parse_location(location):
+    """
+    Parses a raw location string into City, State, Remote and Hybrid fields.
+
+    Handles the formats found in the salary data: 'City, ST', 'Remote',
+    full state names, 'United States' and bare city names, plus the
+    'Remote in ...' and 'Hybrid remote in ...' prefixes.
+
+    Args:
+        location (str): The raw location string.
+
+    Returns:
+        tuple: A tuple containing the city, state, remote flag and hybrid flag.
+    """
+    if not isinstance(location, str) or not location.strip():
+        return None, None, False, False
+
+    location = location.strip()
+    prefix = _WORK_MODE_PREFIX.match(location)
+    hybrid = bool(prefix and (prefix.group(1) or prefix.group(3)))
+    remote = bool(prefix and prefix.group(2)) and not hybrid
+    rest = location[prefix.end():].strip() if prefix else location
+
+    if not rest or rest == 'United States':
+        return None, None, remote, hybrid
+
+    if ',' in rest:
+        city, _, state = rest.rpartition(',')
+        return city.strip() or None, normalize_state(state), remote, hybrid
+
+    state = normalize_state(rest)
+    if state is not None:
+        return None, state, remote, hybrid
+    return rest, None, remote, hybrid
+
+
+def _parse_distinct(locations):
+    """
+    Parses every distinct location once.
+
+    Returns:
+        tuple: The factorized codes of `locations` (-1 for missing values),
+        the distinct values, and a DataFrame of their fields with a last
+        row for missing locations.
+    """
+    codes, uniques = pd.factorize(locations)
+    parsed = [parse_location(value) for value in uniques]
+    # Missing locations get code -1, the last entry, and parse to empty fields
+    parsed.append(parse_location(None))
+    return codes, uniques, pd.DataFrame(parsed, columns=LOCATION_FIELDS)
+
+
+def location_fields(locations):
+    """
+    Parses a location column into City, State, Remote and Hybrid columns,
+    parsing every distinct value once (see `parse_location`).
+
+    Args:
+        locations (pd.Series): The raw locations.
+
+    Returns:
+        pd.DataFrame: The four fields, aligned with `locations`.
+    """
+    codes, _, parsed = _parse_distinct(locations)
+    return parsed.iloc[codes].set_index(locations.index)
+
+
+class LocationIndex:
+    """
+    An inverted index from location values to row positions of a DataFrame.
+
+    The 'Location' column is parsed once (per distinct value) into City,
+    State, Remote and Hybrid fields, and a posting list of row positions is
+    kept for every value of every field. Structured queries then cost time
+    proportional to the posting lists involved rather than to the frame.
+    """
+
+    def __init__(self, df):
+        """
+        Builds the index over the 'Location' column of a DataFrame.
+
+        Args:
+            df (pd.DataFrame): The DataFrame to index.
+        """
+        self.df = df
+        locations = df['Location']
+
+        # Parse every distinct location only once and broadcast the result
+        codes, uniques, parsed = _parse_distinct(locations)
+        self.fields = parsed.iloc[codes].set_index(df.index)
+
+        # Posting lists keyed by the raw location value, used for substring queries
+        self._raw_values = pd.Series(uniques, dtype=object)
+        self._raw = self._group_positions(codes, range(len(uniques)))
+
+        # Group each parsed field at the level of distinct locations, then
+        # broadcast the group codes to rows. Cities are keyed in lower case.
+        self._postings = {}
+        for field in LOCATION_FIELDS:
+            values = parsed[field].str.lower() if field == 'City' else parsed[field]
+            field_codes, field_uniques = pd.factorize(values)
+            self._postings[field] = self._group_positions(field_codes[codes], field_uniques)
+
+    @staticmethod
+    def _group_positions(codes, keys):
+        """
+        Groups row positions by integer group code.
+
+        Args:
+            codes (np.ndarray): One group code per row, -1 for missing values.
+            keys (iterable): The key of each group code.
+
+        Returns:
+            dict: A mapping from each key to a sorted array of row positions.
+        """
+        order = np.argsort(codes, kind='stable')
+        counts = np.bincount(codes[codes >= 0], minlength=len(keys))
+        # Rows with a missing value (code -1) sort first and are skipped
+        start = len(codes) - counts.sum()
+        postings = {}
+        for key, count in zip(keys, counts):
+            postings[key] = order[start:start + count]
+            start += count
+        return postings
+
+    def positions(self, city=None, state=None, remote=None, hybrid=None):
+        """
+        Returns the row positions matching all of the given field values.
+
+        Args:
+            city (str): Exact city name (case-insensitive).
+            state (str): State name or postal code.
+            remote (bool): Whether the job is remote.
+            hybrid (bool): Whether the job is hybrid.
+
+        Returns:
+            np.ndarray: Sorted row positions of the matching rows.
+        """
+        postings = []
+        if city is not None:
+            postings.append(self._postings['City'].get(city.strip().lower(), np.empty(0, dtype=np.int64)))
+        if state is not None:
+            postings.append(self._postings['State'].get(normalize_state(state), np.empty(0, dtype=np.int64)))
+        if remote is not None:
+            postings.append(self._postings['Remote'].get(bool(remote), np.empty(0, dtype=np.int64)))
+        if hybrid is not None:
+            postings.append(self._postings['Hybrid'].get(bool(hybrid), np.empty(0, dtype=np.int64)))
+
+        if not postings:
+            return np.arange(len(self.df))
+
+        # Intersect starting from the shortest posting list
+        postings.sort(key=len)
+        result = postings[0]
+        for other in postings[1:]:
+            result = np.intersect1d(result, other, assume_unique=True)
+        return result
+
+    def query(self, city=None, state=None, remote=None, hybrid=None):
+        """
+        Returns the rows matching all of the given field values.
+
+        Args:
+            city (str): Exact city name (case-insensitive).
+            state (str): State name or postal code.
+            remote (bool): Whether the job is remote.
+            hybrid (bool): Whether the job is hybrid.
+
+        Returns:
+            pd.DataFrame: The matching rows in their original order.
+        """
+        return self.df.iloc[self.positions(city=city, state=state, remote=remote, hybrid=hybrid)]
+
+    def contains_positions(self, location):
+        """
+        Returns the row positions whose raw location contains a pattern.
+
+        Matches the semantics of `Series.str.contains`, but the pattern is
+        only evaluated once per distinct location value.
+
+        Args:
+            location (str): The pattern to search for.
+
+        Returns:
+            np.ndarray: Sorted row positions of the matching rows.
+        """
+        matched = self._raw_values.str.contains(location, na=False).to_numpy()
+        postings = [self._raw[code] for code in np.flatnonzero(matched)]
+        if not postings:
+            return np.empty(0, dtype=np.int64)
+        return np.sort(np.concatenate(postings))
+
+
+def build_location_index(df):
+    """
+    Builds a location index over a DataFrame.
+
+    Args:
+        df (pd.DataFrame): The DataFrame with a 'Location' column.
+
+    Returns:
+        LocationIndex: The index over the DataFrame's locations.
+    """
+    return LocationIndex(df)
@@ -0,0 +1,187 @@
+"""
+Polars implementations of the heavy salary-processing steps.
+
+`data_processing` calls into this module when a function is given
+`engine='polars'`. Every function takes and returns pandas objects with the
+same values, dtypes and index as the pandas code path, so the engine can be
+switched without changing the callers; only the CSV parsing, the salary
+string parsing, the location matching and the per-company group-bys run in
+Polars, on Arrow string buffers and all CPU cores.
+
+Polars is optional. Conversions are done column by column through NumPy, so
+pyarrow is not needed.
+"""
+import numpy as np
+import pandas as pd
+
+INSTALL_HINT = "The 'polars' engine needs the polars package. Install it with `pip install polars`."
+
+# Strings pandas.read_csv reads as missing values by default
+NA_VALUES = ['', '#N/A', '#N/A N/A', '#NA', '-1.#IND', '-1.#QNAN', '-NaN', '-nan', '1.#IND', '1.#QNAN',
+             '<NA>', 'N/A', 'NA', 'NULL', 'NaN', 'None', 'n/a', 'nan', 'null']
+
+SALARY_COLUMNS = ['Salary_Low', 'Salary_High', 'Average_Salary']
+
+def import_polars():
+    """
+    Imports polars, with an installation hint if it is missing.
+
+    Returns:
+        module: The polars module.
+    """
+    try:
+        import polars
+    except ImportError as e:
+        raise ImportError(f"Error: {INSTALL_HINT}") from e
+    return polars
+
+def to_polars(series):
+    """
+    Converts a pandas Series to a polars Series; missing values become nulls.
+
+    Args:
+        series (pd.Series): The pandas Series.
+
+    Returns:
+        polars.Series: The polars Series.
+    """
+    pl = import_polars()
+    if pd.api.types.is_numeric_dtype(series.dtype):
+        return pl.Series(series.name, series.to_numpy(dtype=float, na_value=np.nan), nan_to_null=True)
+    # A list, since polars cannot cast an object array that starts with a null
+    return pl.Series(series.name, series.to_numpy(dtype=object, na_value=None).tolist(), dtype=pl.String)
+
+def to_pandas(frame, index=None):
+    """
+    Converts a polars DataFrame to pandas with the dtypes `pd.read_csv` would give.
+
+    Args:
+        frame (polars.DataFrame): The polars DataFrame.
+        index (array-like): Row labels; a RangeIndex by default.
+
+    Returns:
+        pd.DataFrame: The pandas DataFrame.
+    """
+    pl = import_polars()
+    columns = {}
+    for column in frame.get_columns():
+        values = column.to_numpy()
+        if column.dtype == pl.String:
+            values = values.astype(object)
+            # Missing strings are NaN in frames read by pandas
+            values[pd.isna(values)] = np.nan
+        columns[column.name] = values
+    return pd.DataFrame(columns, index=index, columns=frame.columns)
+
+def with_salaries(frame, column='Salary'):
+    """
+    Adds the low, high and average salary parsed from a salary-string column,
+    with exactly the rules of `extract_salary`: every character but digits,
+    'K' and '-' is dropped, 'K' is removed, and one number or a '-'-separated
+    pair is read in thousands. Any other shape, or a part that is not a
+    number, gives nulls for all three.
+
+    Args:
+        frame (polars.DataFrame): The data.
+        column (str): The salary-string column.
+
+    Returns:
+        polars.DataFrame: The data with 'Salary_Low', 'Salary_High' and 'Average_Salary' appended.
+    """
+    pl = import_polars()
+    # The split is materialized once; chaining it into every output expression re-runs the regex per use
+    parts = frame.select(
+        pl.col(column).str.replace_all(r'[^\dK-]+', '').str.replace_all('K', '', literal=True)
+        .str.split('-').alias('parts')
+    ).select(
+        pl.col('parts').list.len().alias('count'),
+        (pl.col('parts').list.get(0, null_on_oob=True).cast(pl.Float64, strict=False) * 1000).alias('first'),
+        (pl.col('parts').list.get(1, null_on_oob=True).cast(pl.Float64, strict=False) * 1000).alias('second'),
+    )
+    count, first, second = pl.col('count'), pl.col('first'), pl.col('second')
+    valid = ((count == 1) & first.is_not_null()) | ((count == 2) & first.is_not_null() & second.is_not_null())
+    parsed = parts.select(
+        pl.when(valid).then(first).alias('Salary_Low'),
+        pl.when(valid).then(pl.when(count == 2).then(second).otherwise(first)).alias('Salary_High'),
+        pl.when(valid).then(pl.when(count == 2).then((first + second) / 2).otherwise(first)).alias('Average_Salary'),
+    )
+    return pl.concat([frame, parsed], how='horizontal')
+
+def parse_salaries(salaries):
+    """
+    Parses salary strings in polars.
+
+    Args:
+        salaries (pd.Series): The salary strings.
+
+    Returns:
+        tuple: NumPy arrays of the low, high and average salary, NaN where
+            `extract_salary` returns None.
+    """
+    pl = import_polars()
+    parsed = with_salaries(pl.DataFrame([to_polars(salaries).alias('Salary')]))
+    return tuple(parsed[name].to_numpy().astype(float) for name in SALARY_COLUMNS)
+
+def read_csv(file_path, clean=False):
+    """
+    Reads a CSV file with polars' multithreaded reader.
+
+    Args:
+        file_path (str): Path to the CSV file.
+        clean (bool): Whether to parse the salaries and drop the rows without
+            one before converting to pandas, like `clean_data` does.
+
+    Returns:
+        pd.DataFrame: The data, as `pd.read_csv` (and `clean_data`) would return it.
+    """
+    pl = import_polars()
+    frame = pl.read_csv(file_path, null_values=NA_VALUES, infer_schema_length=None)
+    if not clean:
+        return to_pandas(frame)
+
+    frame = with_salaries(frame.with_row_index('__row').with_columns(pl.col('Salary').cast(pl.String)))
+    frame = frame.filter(pl.col('Average_Salary').is_not_null())
+    return to_pandas(frame.drop('__row'), index=pd.Index(frame['__row'].to_numpy().astype(np.int64)))
+
+def contains(values, pattern):
+    """
+    Matches a regular expression against every value; missing values do not match.
+
+    Args:
+        values (pd.Series): The strings to search.
+        pattern (str): The pattern. Polars uses Rust regular expressions, which
+            agree with Python's for plain text and common syntax.
+
+    Returns:
+        np.ndarray: Boolean mask of the matching values.
+    """
+    return to_polars(values).str.contains(pattern).fill_null(False).to_numpy()
+
+def aggregate_by_company(companies, salaries, box_stats=False):
+    """
+    Computes per-company salary aggregates in polars.
+
+    Args:
+        companies (pd.Series): The company label of each row.
+        salaries (pd.Series): The average salary of each row.
+        box_stats (bool): Whether to add the min, quartiles and max.
+
+    Returns:
+        pd.DataFrame: Sorted by company, laid out like the pandas group-by in
+            `aggregate_salary_by_company`.
+    """
+    pl = import_polars()
+    salary = pl.col('Average_Salary')
+    aggregations = [salary.count().cast(pl.Int64).alias('count'), salary.mean().alias('mean')]
+    if box_stats:
+        aggregations += [salary.min().alias('min')]
+        aggregations += [salary.quantile(q, interpolation='linear').alias(name) for q, name in [(0.25, '25%'), (0.5, '50%'), (0.75, '75%')]]
+        aggregations += [salary.max().alias('max')]
+    frame = (pl.DataFrame([to_polars(companies).alias('Company'), to_polars(salaries).alias('Average_Salary')])
+             .filter(pl.col('Company').is_not_null())
+             .group_by('Company').agg(aggregations)
+             .sort('Company'))
+    result = to_pandas(frame.drop('Company'), index=pd.Index(to_pandas(frame.select('Company'))['Company'], name='Company'))
+    for name in result.columns.drop('count'):
+        result[name] = result[name].astype(float)
+    return result
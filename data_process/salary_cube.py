@@ -0,0 +1,341 @@
+import json
+import os
+import re
+import numpy as np
+import pandas as pd
+from location_index import parse_location
+from sketches import QuantileSketch
+
+# Dimensions of the cube, in key order
+DIMENSIONS = ['Company', 'State', 'Title']
+# Label for rows whose dimension value is missing, and for remote jobs without a state
+UNKNOWN = 'Unknown'
+REMOTE = 'Remote'
+# Cuboids materialized at build time: the grand total, each single dimension and the full cube
+CUBOIDS = [(), ('Company',), ('State',), ('Title',), tuple(DIMENSIONS)]
+# Statistics reported by queries
+QUERY_COLUMNS = ['count', 'sum', 'mean', 'min', '25%', '50%', '75%', 'max']
+
+_TITLE_ABBREVIATIONS = {'sr': 'senior', 'jr': 'junior', 'eng': 'engineer', 'engr': 'engineer', 'dev': 'developer', 'mgr': 'manager'}
+
+def normalize_job_title(title):
+    """
+    Normalizes a job title for grouping: lower case, punctuation removed and
+    common abbreviations expanded ('Sr. Software Eng.' -> 'senior software engineer').
+
+    Args:
+        title (str): The raw job title.
+
+    Returns:
+        str: The normalized title, or 'Unknown' for missing titles.
+    """
+    if not isinstance(title, str):
+        return UNKNOWN
+    words = [_TITLE_ABBREVIATIONS.get(word, word) for word in re.findall(r'[a-z0-9+#]+', title.lower())]
+    return ' '.join(words) or UNKNOWN
+
+def cube_dimensions(df):
+    """
+    Derives the Company, State and normalized Title dimensions of each row.
+
+    Args:
+        df (pd.DataFrame): Cleaned salary data.
+
+    Returns:
+        pd.DataFrame: The three dimension columns, aligned with `df`.
+    """
+    def state_of(location):
+        _, state, remote, _ = parse_location(location)
+        return state or (REMOTE if remote else UNKNOWN)
+
+    # Parse each distinct location and title once
+    locations = df['Location'] if 'Location' in df else pd.Series(np.nan, index=df.index)
+    titles = df['Job Title'] if 'Job Title' in df else pd.Series(np.nan, index=df.index)
+    return pd.DataFrame({
+        'Company': df['Company'].fillna(UNKNOWN).astype(str),
+        'State': locations.map({value: state_of(value) for value in locations.unique()}).fillna(UNKNOWN),
+        'Title': titles.map({value: normalize_job_title(value) for value in titles.unique()}).fillna(UNKNOWN),
+    }, index=df.index)
+
+class _Cuboid:
+    """
+    Aggregates of Average_Salary grouped by a subset of the dimensions, with
+    an index from each dimension value to the cells holding it.
+    """
+
+    def __init__(self, dims, keys, counts, sums, mins, maxs, sketches):
+        self.dims = tuple(dims)
+        self.keys = keys
+        self.counts = np.asarray(counts, dtype=np.int64)
+        self.sums = np.asarray(sums, dtype=float)
+        self.mins = np.asarray(mins, dtype=float)
+        self.maxs = np.asarray(maxs, dtype=float)
+        self.sketches = sketches
+        self.index = {dim: {} for dim in self.dims}
+        for cell, key in enumerate(self.keys):
+            for dim, value in zip(self.dims, key):
+                self.index[dim].setdefault(value, []).append(cell)
+        self.index = {dim: {value: np.asarray(cells) for value, cells in values.items()} for dim, values in self.index.items()}
+
+    @classmethod
+    def build(cls, dims, dimensions, salaries, relative_accuracy):
+        """
+        Aggregates salaries into the cells of the given dimensions.
+
+        Args:
+            dims (tuple): The dimensions of the cuboid.
+            dimensions (pd.DataFrame): The dimension columns of every row.
+            salaries (pd.Series): The Average_Salary of every row.
+            relative_accuracy (float): Relative accuracy of the cell quantile sketches.
+
+        Returns:
+            _Cuboid: The cuboid.
+        """
+        if dims:
+            cells, uniques = pd.MultiIndex.from_frame(dimensions[list(dims)]).factorize()
+            keys = [tuple(key) for key in uniques]
+        else:
+            cells, keys = np.zeros(len(salaries), dtype=np.int64), [()]
+        values = salaries.to_numpy(dtype=float)
+        grouped = pd.Series(values).groupby(cells)
+        stats = grouped.agg(['count', 'sum', 'min', 'max']).reindex(range(len(keys)))
+
+        # Fill every cell's quantile sketch from one bulk count of (cell, bucket) pairs
+        sketches = [QuantileSketch(relative_accuracy) for _ in keys]
+        positive = values > 0
+        buckets = sketches[0].bucket_keys(values[positive]) if len(keys) else []
+        pairs = pd.Series(1, index=pd.MultiIndex.from_arrays([cells[positive], buckets])).groupby(level=[0, 1]).size()
+        for (cell, bucket), count in pairs.items():
+            sketches[cell].positive[int(bucket)] = int(count)
+            sketches[cell].count += int(count)
+        for cell, value in zip(cells[~positive], values[~positive]):
+            sketches[cell].update([value])
+
+        return cls(dims, keys, stats['count'].fillna(0), stats['sum'].fillna(0), stats['min'], stats['max'], sketches)
+
+    def cells(self, filters):
+        """
+        Returns the cells matching all filters.
+
+        Args:
+            filters (dict): Dimension to a list of accepted values.
+
+        Returns:
+            np.ndarray: The matching cell numbers.
+        """
+        result = None
+        for dim, values in filters.items():
+            matches = [self.index[dim][value] for value in values if value in self.index[dim]]
+            cells = np.unique(np.concatenate(matches)) if matches else np.empty(0, dtype=np.int64)
+            result = cells if result is None else np.intersect1d(result, cells, assume_unique=True)
+        return np.arange(len(self.keys)) if result is None else result
+
+    def summarize(self, cells):
+        """
+        Rolls up a set of cells into the query statistics.
+
+        Args:
+            cells (np.ndarray): The cell numbers to roll up.
+
+        Returns:
+            dict: count, sum, mean, min, quartiles and max.
+        """
+        cells = cells[self.counts[cells] > 0]
+        if len(cells) == 0:
+            return {'count': 0, 'sum': 0.0, 'mean': np.nan, 'min': np.nan, '25%': np.nan, '50%': np.nan, '75%': np.nan, 'max': np.nan}
+        sketch = QuantileSketch(self.sketches[cells[0]].relative_accuracy)
+        for cell in cells:
+            sketch.merge(self.sketches[cell])
+        count, total = int(self.counts[cells].sum()), float(self.sums[cells].sum())
+        return {
+            'count': count, 'sum': total, 'mean': total / count,
+            'min': float(self.mins[cells].min()),
+            '25%': sketch.quantile(0.25), '50%': sketch.quantile(0.5), '75%': sketch.quantile(0.75),
+            'max': float(self.maxs[cells].max()),
+        }
+
+    def merge(self, other):
+        """
+        Combines the cells of two cuboids over the same dimensions.
+
+        Args:
+            other (_Cuboid): The cuboid to merge.
+
+        Returns:
+            _Cuboid: A new cuboid holding both.
+        """
+        positions = {key: cell for cell, key in enumerate(self.keys)}
+        keys = list(self.keys) + [key for key in other.keys if key not in positions]
+        size = len(keys)
+        counts, sums = np.zeros(size, dtype=np.int64), np.zeros(size)
+        mins, maxs = np.full(size, np.inf), np.full(size, -np.inf)
+        sketches = [QuantileSketch.from_dict(sketch.to_dict()) for sketch in self.sketches]
+        sketches += [QuantileSketch(other.sketches[0].relative_accuracy) for _ in range(size - len(self.keys))]
+        counts[:len(self.keys)], sums[:len(self.keys)] = self.counts, self.sums
+        mins[:len(self.keys)], maxs[:len(self.keys)] = self.mins, self.maxs
+        lookup = {key: cell for cell, key in enumerate(keys)}
+        for cell, key in enumerate(other.keys):
+            target = lookup[key]
+            counts[target] += other.counts[cell]
+            sums[target] += other.sums[cell]
+            mins[target] = np.fmin(mins[target], other.mins[cell])
+            maxs[target] = np.fmax(maxs[target], other.maxs[cell])
+            sketches[target].merge(other.sketches[cell])
+        return _Cuboid(self.dims, keys, counts, sums, mins, maxs, sketches)
+
+    def to_dict(self):
+        return {
+            'dims': list(self.dims),
+            'keys': [list(key) for key in self.keys],
+            'counts': self.counts.tolist(),
+            'sums': self.sums.tolist(),
+            'mins': self.mins.tolist(),
+            'maxs': self.maxs.tolist(),
+            'sketches': [sketch.to_dict() for sketch in self.sketches],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        return cls(state['dims'], [tuple(key) for key in state['keys']], state['counts'], state['sums'],
+                   state['mins'], state['maxs'], [QuantileSketch.from_dict(sketch) for sketch in state['sketches']])
+
+class SalaryCube:
+    """
+    A materialized aggregate cube of Average_Salary over Company, State and
+    normalized Job Title.
+
+    Every cell holds the count, sum, min, max and a quantile sketch of its
+    salaries. The grand total and the single-dimension roll-ups are
+    materialized as well, so queries merge at most the cells of the
+    smallest cuboid covering the requested dimensions and never touch raw rows.
+    """
+
+    def __init__(self, cuboids, rows=0):
+        self.cuboids = {cuboid.dims: cuboid for cuboid in cuboids}
+        self.rows = rows
+
+    @classmethod
+    def build(cls, df, relative_accuracy=0.01):
+        """
+        Builds the cube from cleaned salary data.
+
+        Args:
+            df (pd.DataFrame): Cleaned data with an 'Average_Salary' column.
+            relative_accuracy (float): Relative accuracy of the quantile sketches.
+
+        Returns:
+            SalaryCube: The cube.
+        """
+        df = df[df['Average_Salary'].notna()]
+        dimensions = cube_dimensions(df)
+        return cls([_Cuboid.build(dims, dimensions, df['Average_Salary'], relative_accuracy) for dims in CUBOIDS], rows=len(df))
+
+    def merge(self, other):
+        """
+        Combines this cube with a cube built over other rows, e.g. a new chunk or shard.
+
+        Args:
+            other (SalaryCube): The cube to merge.
+
+        Returns:
+            SalaryCube: A new cube holding both.
+        """
+        return SalaryCube([cuboid.merge(other.cuboids[dims]) for dims, cuboid in self.cuboids.items()], rows=self.rows + other.rows)
+
+    def _cuboid_for(self, dims):
+        """
+        Returns the smallest materialized cuboid containing all the given dimensions.
+        """
+        candidates = [cuboid for key, cuboid in self.cuboids.items() if set(dims) <= set(key)]
+        return min(candidates, key=lambda cuboid: len(cuboid.keys))
+
+    def query(self, company=None, state=None, title=None, title_contains=None, group_by=None):
+        """
+        Answers a slice or roll-up from the cube.
+
+        Args:
+            company (str or list): Company name(s) to include.
+            state (str or list): State code(s), 'Remote' or 'Unknown'.
+            title (str or list): Job title(s); normalized before matching.
+            title_contains (str): Case-insensitive substring of the normalized title.
+            group_by (str or list): Dimension(s) to group the result by
+                ('Company', 'State' or 'Title').
+
+        Returns:
+            dict or pd.DataFrame: The statistics of the slice, or one row of
+                statistics per group when `group_by` is given.
+        """
+        filters = {}
+        if company is not None:
+            filters['Company'] = [company] if isinstance(company, str) else list(company)
+        if state is not None:
+            filters['State'] = [state] if isinstance(state, str) else list(state)
+        if title is not None:
+            filters['Title'] = [normalize_job_title(t) for t in ([title] if isinstance(title, str) else title)]
+        group_by = [] if group_by is None else ([group_by] if isinstance(group_by, str) else list(group_by))
+        unknown = [dim for dim in group_by if dim not in DIMENSIONS]
+        if unknown:
+            raise ValueError(f"Error: Unknown cube dimensions {unknown}. Use {DIMENSIONS}.")
+
+        dims = set(filters) | set(group_by) | ({'Title'} if title_contains else set())
+        cuboid = self._cuboid_for(dims)
+        if title_contains:
+            needle = title_contains.lower()
+            matching = [value for value in cuboid.index['Title'] if needle in value]
+            filters['Title'] = [value for value in filters.get('Title', matching) if value in matching]
+        cells = cuboid.cells(filters)
+
+        if not group_by:
+            return cuboid.summarize(cells)
+
+        positions = [cuboid.dims.index(dim) for dim in group_by]
+        groups = {}
+        for cell in cells:
+            groups.setdefault(tuple(cuboid.keys[cell][p] for p in positions), []).append(cell)
+        rows = {key: cuboid.summarize(np.asarray(group)) for key, group in groups.items()}
+        index = pd.MultiIndex.from_tuples(rows.keys(), names=group_by) if len(group_by) > 1 else pd.Index([key[0] for key in rows], name=group_by[0])
+        return pd.DataFrame(list(rows.values()), index=index, columns=QUERY_COLUMNS).sort_index()
+
+    def save(self, file_path):
+        """
+        Persists the cube as JSON, replacing the file atomically.
+
+        Args:
+            file_path (str): Path of the cube file.
+        """
+        temporary_path = f'{file_path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as cube_file:
+            # json.dumps encodes in C, json.dump in Python
+            cube_file.write(json.dumps({'rows': self.rows, 'cuboids': [cuboid.to_dict() for cuboid in self.cuboids.values()]}))
+        os.replace(temporary_path, file_path)
+
+    @classmethod
+    def load(cls, file_path):
+        """
+        Loads a cube saved with `save`.
+
+        Args:
+            file_path (str): Path of the cube file.
+
+        Returns:
+            SalaryCube: The cube.
+        """
+        with open(file_path, encoding='utf-8') as cube_file:
+            state = json.load(cube_file)
+        return cls([_Cuboid.from_dict(cuboid) for cuboid in state['cuboids']], rows=state['rows'])
+
+def build_salary_cube(df, file_path):
+    """
+    Builds the cube from cleaned salary data and persists it.
+
+    Args:
+        df (pd.DataFrame): Cleaned salary data.
+        file_path (str): Path where the cube is saved.
+
+    Returns:
+        SalaryCube: The cube.
+    """
+    cube = SalaryCube.build(df)
+    cube.save(file_path)
+    print(f"Salary cube with {len(cube.cuboids[tuple(DIMENSIONS)].keys)} cells saved to {file_path}")
+    return cube
@@ -0,0 +1,217 @@
+import re
+import sqlite3
+import numpy as np
+import pandas as pd
+from location_index import LOCATION_FIELDS, location_fields, normalize_state
+
+# Table holding the cleaned salaries, one row per posting in the original order
+TABLE = 'salaries'
+# Rows inserted per transaction
+BATCH_ROWS = 10_000
+# Columns with a B-tree index. Location is indexed so that location filters
+# can look up the matching distinct values instead of scanning every row
+INDEXED_COLUMNS = ['Company', 'State', 'Job Title', 'Average_Salary', 'Location']
+
+def _quote(name):
+    return '"' + name.replace('"', '""') + '"'
+
+def _sql_type(dtype):
+    """
+    Maps a pandas dtype to a SQLite column type.
+
+    Args:
+        dtype: The pandas dtype.
+
+    Returns:
+        str: 'INTEGER', 'REAL' or 'TEXT'.
+    """
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+class SalaryStore:
+    """
+    A SQLite store of cleaned salary data.
+
+    The cleaned columns are stored as they are, together with the City,
+    State, Remote and Hybrid fields parsed from 'Location', and indexed on
+    INDEXED_COLUMNS. Filters are translated to SQL so SQLite answers them
+    from the indexes instead of the whole file being re-read and re-scanned.
+
+        store = SalaryStore('salaries.db')
+        store.write(df)
+        store.filter_by_location('Remote')
+        store.query(state='CA', min_salary=150_000)
+    """
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path (str): Path of the database file; it is created if missing.
+        """
+        self.db_path = db_path
+        self.connection = sqlite3.connect(db_path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self.connection.close()
+
+    def columns(self):
+        """
+        Returns the stored columns, or an empty list if nothing was written yet.
+        """
+        return [row[1] for row in self.connection.execute(f'PRAGMA table_info({_quote(TABLE)})')]
+
+    def write(self, df, batch_rows=BATCH_ROWS, append=False):
+        """
+        Writes cleaned salary data in batched transactions.
+
+        Args:
+            df (pd.DataFrame): Cleaned salary data.
+            batch_rows (int): Rows inserted per transaction.
+            append (bool): Whether to add the rows to the stored ones instead of replacing them.
+
+        Returns:
+            int: The number of rows written.
+        """
+        df = df.reset_index(drop=True)
+        if 'Location' in df:
+            df = pd.concat([df, location_fields(df['Location'])], axis=1)
+        columns = list(df.columns)
+
+        if not append or not self.columns():
+            with self.connection:
+                self.connection.execute(f'DROP TABLE IF EXISTS {_quote(TABLE)}')
+                definitions = ', '.join(f'{_quote(name)} {_sql_type(df[name].dtype)}' for name in columns)
+                self.connection.execute(f'CREATE TABLE {_quote(TABLE)} ({definitions})')
+        elif self.columns() != columns:
+            raise ValueError(f"Error: The columns {columns} do not match the stored columns {self.columns()}.")
+
+        # Missing values are stored as NULL; NumPy scalars as plain Python values
+        values = df.astype(object).where(df.notna(), None)
+        placeholders = ', '.join('?' * len(columns))
+        insert = f'INSERT INTO {_quote(TABLE)} VALUES ({placeholders})'
+        for start in range(0, len(values), batch_rows):
+            rows = [[value.item() if isinstance(value, np.generic) else value for value in row]
+                    for row in values.iloc[start:start + batch_rows].itertuples(index=False, name=None)]
+            with self.connection:
+                self.connection.executemany(insert, rows)
+
+        # A new table gets its indexes after loading, which is faster than maintaining them per insert;
+        # appended rows (append=True) update the existing indexes as they are inserted
+        with self.connection:
+            for name in INDEXED_COLUMNS:
+                if name in columns:
+                    index_name = 'idx_' + re.sub(r'\W+', '_', name).lower()
+                    self.connection.execute(f'CREATE INDEX IF NOT EXISTS {_quote(index_name)} '
+                                            f'ON {_quote(TABLE)} ({_quote(name)})')
+        return len(df)
+
+    def _select(self, conditions, parameters, columns=None):
+        stored = self.columns()
+        if columns is None:
+            # The parsed location fields are storage details, not part of the cleaned data
+            columns = [name for name in stored if name not in LOCATION_FIELDS] if 'Location' in stored else stored
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        sql = f"SELECT {', '.join(_quote(name) for name in columns)} FROM {_quote(TABLE)}{where} ORDER BY rowid"
+        return pd.read_sql_query(sql, self.connection, params=parameters)
+
+    @staticmethod
+    def _conditions(company=None, state=None, title=None, remote=None, min_salary=None, max_salary=None):
+        conditions, parameters = [], []
+        equalities = [('Company', company), ('State', None if state is None else normalize_state(state) or state),
+                      ('Job Title', title), ('Remote', None if remote is None else int(bool(remote)))]
+        for name, value in equalities:
+            if value is not None:
+                conditions.append(f'{_quote(name)} = ?')
+                parameters.append(value)
+        if min_salary is not None:
+            conditions.append('"Average_Salary" >= ?')
+            parameters.append(float(min_salary))
+        if max_salary is not None:
+            conditions.append('"Average_Salary" <= ?')
+            parameters.append(float(max_salary))
+        return conditions, parameters
+
+    def query(self, company=None, state=None, title=None, remote=None, min_salary=None, max_salary=None, columns=None):
+        """
+        Returns the rows matching all of the given filters.
+
+        Args:
+            company (str): Exact company name.
+            state (str): State name or postal code.
+            title (str): Exact job title.
+            remote (bool): Whether the job is remote.
+            min_salary (float): Lowest average salary, inclusive.
+            max_salary (float): Highest average salary, inclusive.
+            columns (list): Columns to return; the cleaned columns by default.
+
+        Returns:
+            pd.DataFrame: The matching rows, in the order they were written.
+        """
+        conditions, parameters = self._conditions(company, state, title, remote, min_salary, max_salary)
+        return self._select(conditions, parameters, columns)
+
+    def filter_by_location(self, location, columns=None):
+        """
+        Returns the rows whose location contains a pattern, like `filter_data_by_location`.
+
+        The pattern is matched against the distinct locations, read from the
+        Location index, and the matching rows are then fetched by value.
+
+        Args:
+            location (str): The pattern to search for (a regular expression, as in `Series.str.contains`).
+            columns (list): Columns to return; the cleaned columns by default.
+
+        Returns:
+            pd.DataFrame: The matching rows, in the order they were written.
+        """
+        distinct = pd.Series([row[0] for row in self.connection.execute(
+            f'SELECT DISTINCT "Location" FROM {_quote(TABLE)} WHERE "Location" IS NOT NULL')], dtype=object)
+        matched = distinct[distinct.str.contains(location, na=False)].tolist()
+        if not matched:
+            return self._select(['0'], [], columns)
+        return self._select([f'"Location" IN ({", ".join("?" * len(matched))})'], matched, columns)
+
+    def salary_by(self, group_by='Company', **filters):
+        """
+        Aggregates the average salary per value of a column inside SQLite.
+
+        Args:
+            group_by (str): The column to group by, e.g. 'Company', 'State' or 'Job Title'.
+            **filters: Filters accepted by `query`, except `columns`.
+
+        Returns:
+            pd.DataFrame: 'count', 'mean', 'min' and 'max' per group, indexed by the group column.
+        """
+        if group_by not in self.columns():
+            raise ValueError(f"Error: Unknown column '{group_by}'.")
+        conditions, parameters = self._conditions(**filters)
+        conditions.append(f'{_quote(group_by)} IS NOT NULL')
+        sql = (f'SELECT {_quote(group_by)}, COUNT("Average_Salary") AS "count", AVG("Average_Salary") AS "mean", '
+               f'MIN("Average_Salary") AS "min", MAX("Average_Salary") AS "max" FROM {_quote(TABLE)} '
+               f"WHERE {' AND '.join(conditions)} GROUP BY {_quote(group_by)} ORDER BY {_quote(group_by)}")
+        return pd.read_sql_query(sql, self.connection, params=parameters, index_col=group_by)
+
+def save_to_store(df, db_path):
+    """
+    Writes cleaned salary data to a SQLite store, replacing what it held.
+
+    Args:
+        df (pd.DataFrame): Cleaned salary data.
+        db_path (str): Path of the database file.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with SalaryStore(db_path) as store:
+        rows = store.write(df)
+    print(f"{rows} rows saved to the salary store {db_path}")
+    return rows
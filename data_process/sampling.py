@@ -0,0 +1,359 @@
+import numpy as np
+import pandas as pd
+from data_processing import clean_data, resolve_input_files
+
+# Rows read from the input per chunk while sampling
+DEFAULT_CHUNKSIZE = 100_000
+# Default number of rows kept by the reservoir sampler
+DEFAULT_SAMPLE_SIZE = 100_000
+# Bootstrap replicates behind each confidence interval
+DEFAULT_RESAMPLES = 400
+# Raw columns the cleaned data is built from; the sampler parses only these
+SAMPLED_COLUMNS = ['Company', 'Company Score', 'Job Title', 'Location', 'Date', 'Salary']
+# Column holding the number of input rows each sampled row stands for
+WEIGHT_COLUMN = 'Sample_Weight'
+# Numeric columns of the cleaned data that get confidence intervals
+ESTIMATED_COLUMNS = ['Average_Salary', 'Salary_Low', 'Salary_High', 'Company Score']
+# Statistics reported for each column, as (label, quantile); None is the mean
+ESTIMATES = [('mean', None), ('25%', 0.25), ('50%', 0.5), ('75%', 0.75)]
+# Lower bound of the bootstrap Gamma shape, reached by strata of one or two sampled rows
+MIN_GAMMA_SHAPE = 0.1
+
+_KEY = '_sample_key'
+_STRATUM = '_sample_stratum'
+
+def _iter_chunks(file_path, chunksize, usecols=None):
+    # A callable skips the requested columns a file lacks instead of failing on them
+    columns = None if usecols is None else set(usecols).__contains__
+    for path in resolve_input_files(file_path):
+        yield from pd.read_csv(path, chunksize=chunksize, usecols=columns)
+
+def _strata(sample, column):
+    return sample[column].astype(str).where(sample[column].notna(), '')
+
+def reservoir_sample(file_path, size=DEFAULT_SAMPLE_SIZE, seed=0, chunksize=DEFAULT_CHUNKSIZE, usecols=None):
+    """
+    Draws a uniform random sample of raw rows in a single pass over the input.
+
+    Every row gets a uniform random key and the sample keeps the `size` rows
+    with the smallest keys seen so far, which is a reservoir sample without
+    replacement. A chunk only adds the rows whose keys beat the current
+    largest kept key, so memory stays at one chunk plus the sample.
+
+    Args:
+        file_path (str or list): A CSV path, a glob pattern, or a list of paths and patterns.
+        size (int): Number of rows to keep.
+        seed (int): Seed of the random keys; the same seed gives the same sample.
+        chunksize (int): Rows read per chunk.
+        usecols (list): Columns to read, or None for all of them; columns a file lacks are skipped.
+
+    Returns:
+        tuple: The sampled rows in input order, with a `Sample_Weight`
+            column, and the number of rows read.
+    """
+    if size < 1:
+        raise ValueError("Error: The sample size must be at least 1.")
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    rows_seen = 0
+    for chunk in _iter_chunks(file_path, chunksize, usecols):
+        keys = rng.random(len(chunk))
+        rows_seen += len(chunk)
+        chunk = chunk.set_axis(pd.RangeIndex(rows_seen - len(chunk), rows_seen))
+        if reservoir is not None and len(reservoir) == size:
+            candidates = keys < reservoir[_KEY].max()
+            chunk, keys = chunk[candidates], keys[candidates]
+        chunk = chunk.assign(**{_KEY: keys})
+        reservoir = chunk if reservoir is None else pd.concat([reservoir, chunk])
+        if len(reservoir) > size:
+            reservoir = reservoir.nsmallest(size, _KEY)
+    if reservoir is None:
+        raise ValueError("Error: The input has no rows to sample.")
+
+    sample = reservoir.sort_index().drop(columns=_KEY)
+    sample[WEIGHT_COLUMN] = rows_seen / len(sample)
+    return sample, rows_seen
+
+def stratified_sample(file_path, per_stratum, column='Company', seed=0, chunksize=DEFAULT_CHUNKSIZE, usecols=None):
+    """
+    Draws up to `per_stratum` random raw rows of every value of `column` in a single pass.
+
+    Small companies keep all their rows, so their estimates are exact, and
+    large ones are capped. Each row is weighted by the number of rows of its
+    stratum it stands for, so estimates over the whole input stay unbiased.
+
+    Args:
+        file_path (str or list): A CSV path, a glob pattern, or a list of paths and patterns.
+        per_stratum (int): Rows kept per value of `column`.
+        column (str): The column to stratify by; missing values form one stratum.
+        seed (int): Seed of the random keys.
+        chunksize (int): Rows read per chunk.
+        usecols (list): Columns to read, or None for all of them; columns a file lacks are skipped.
+
+    Returns:
+        tuple: The sampled rows in input order, with a `Sample_Weight`
+            column, and the number of rows read per stratum (a pd.Series
+            indexed by the values of `column` as strings).
+    """
+    if per_stratum < 1:
+        raise ValueError("Error: The number of rows per stratum must be at least 1.")
+    rng = np.random.default_rng(seed)
+    reservoir = None
+    stratum_rows = pd.Series(dtype='int64')
+    for chunk in _iter_chunks(file_path, chunksize, usecols):
+        if column not in chunk:
+            raise ValueError(f"Error: Cannot stratify by '{column}'; the column is missing.")
+        start = int(stratum_rows.sum())
+        chunk = chunk.set_axis(pd.RangeIndex(start, start + len(chunk)))
+        strata = _strata(chunk, column)
+        chunk = chunk.assign(**{_KEY: rng.random(len(chunk)), _STRATUM: strata})
+        stratum_rows = stratum_rows.add(strata.value_counts(), fill_value=0)
+        reservoir = chunk if reservoir is None else pd.concat([reservoir, chunk])
+        reservoir = reservoir.sort_values(_KEY).groupby(_STRATUM, sort=False).head(per_stratum)
+    if reservoir is None:
+        raise ValueError("Error: The input has no rows to sample.")
+
+    sample = reservoir.sort_index()
+    kept = sample[_STRATUM].map(sample[_STRATUM].value_counts())
+    sample[WEIGHT_COLUMN] = sample[_STRATUM].map(stratum_rows) / kept
+    return sample.drop(columns=[_KEY, _STRATUM]), stratum_rows.astype('int64')
+
+def sample_data(file_path, size=DEFAULT_SAMPLE_SIZE, per_company=None, seed=0, chunksize=DEFAULT_CHUNKSIZE,
+                usecols=SAMPLED_COLUMNS):
+    """
+    Samples the raw input and cleans only the sampled rows.
+
+    Args:
+        file_path (str or list): A CSV path, a glob pattern, or a list of paths and patterns.
+        size (int): Number of rows of the uniform reservoir sample.
+        per_company (int): If given, draw a sample stratified by company with
+            this many rows per company instead.
+        seed (int): Seed of the sampler.
+        chunksize (int): Rows read per chunk.
+        usecols (list): Raw columns to read, by default those of the cleaned
+            data; None reads every column.
+
+    Returns:
+        pd.DataFrame: The cleaned sample with a `Sample_Weight` column. Its
+            `attrs` hold 'rows_seen', 'sampled_rows' (before cleaning),
+            'stratify_by' and, for a stratified sample, 'stratum_rows'.
+    """
+    stratum_rows = None
+    if per_company is not None:
+        raw, stratum_rows = stratified_sample(file_path, per_company, seed=seed, chunksize=chunksize, usecols=usecols)
+        rows_seen = int(stratum_rows.sum())
+        stratum_rows = stratum_rows.to_dict()
+    else:
+        raw, rows_seen = reservoir_sample(file_path, size, seed=seed, chunksize=chunksize, usecols=usecols)
+    sampled_rows = len(raw)
+    sample = clean_data(raw)
+    sample.attrs.update(rows_seen=rows_seen, sampled_rows=sampled_rows,
+                        stratify_by='Company' if per_company is not None else None, stratum_rows=stratum_rows)
+    return sample
+
+def weighted_quantile(sorted_values, weights, q):
+    """
+    Returns the quantiles of values weighted by how many rows they stand for.
+
+    Args:
+        sorted_values (np.ndarray): The values in ascending order.
+        weights (np.ndarray): The weight of each value.
+        q (list of float): Quantiles between 0 and 1.
+
+    Returns:
+        np.ndarray: The smallest values whose cumulative weight reaches each quantile.
+    """
+    cumulative = np.cumsum(weights)
+    positions = np.searchsorted(cumulative, np.asarray(q) * cumulative[-1])
+    return sorted_values[np.minimum(positions, len(sorted_values) - 1)]
+
+def _estimates(sorted_values, weights):
+    quantiles = weighted_quantile(sorted_values, weights, [q for _, q in ESTIMATES[1:]])
+    return np.concatenate([[np.average(sorted_values, weights=weights)], quantiles])
+
+def confidence_intervals(values, weights=None, strata=None, stratum_rows=None, confidence=0.95,
+                         resamples=DEFAULT_RESAMPLES, seed=0):
+    """
+    Estimates the mean and quartiles of a column from a sample, with bootstrap confidence intervals.
+
+    Each replicate reweights the sampled rows with Gamma factors (a Bayesian
+    bootstrap, with the shape corrected for small strata), rescaled within
+    every stratum so the strata keep their input sizes. Sampled rows whose value is missing, or that cleaning dropped,
+    still count towards their stratum, so the share of present values varies
+    between replicates too. Rows of a stratum that was sampled completely
+    keep their weight, so a complete sample gives intervals of zero width.
+
+    Args:
+        values (pd.Series): The sampled values; missing ones are ignored.
+        weights (pd.Series): Rows of the input each value stands for; None
+            weights all values equally, as a sample without missing values.
+        strata (pd.Series): Stratum of each value, or None for a uniform sample.
+        stratum_rows (dict or int): Input rows per stratum, or the input rows
+            of a uniform sample. None takes them from the weights, assuming
+            no sampled value is missing, or from an unbounded input without weights.
+        confidence (float): Coverage of the intervals, e.g. 0.95.
+        resamples (int): Number of bootstrap replicates.
+        seed (int): Seed of the bootstrap.
+
+    Returns:
+        pd.DataFrame: 'estimate', 'ci_low', 'ci_high' and 'std_error' for the
+            mean and the 25%, 50% and 75% quantiles.
+    """
+    if not 0 < confidence < 1:
+        raise ValueError("Error: The confidence level must be between 0 and 1.")
+    values = pd.Series(values, dtype=float)
+    weighted = weights is not None
+    weights = pd.Series(weights if weighted else 1.0, index=values.index, dtype=float)
+    present = values.notna().to_numpy()
+    labels = pd.Series(np.nan, index=[label for label, _ in ESTIMATES])
+    if not present.any():
+        return pd.DataFrame({'estimate': labels, 'ci_low': labels, 'ci_high': labels, 'std_error': labels})
+
+    order = np.argsort(values.to_numpy()[present], kind='stable')
+    sorted_values = values.to_numpy()[present][order]
+    base = weights.to_numpy()[present][order]
+    if strata is None:
+        codes, uniques = np.zeros(len(sorted_values), dtype=int), [None]
+        stratum_rows = None if stratum_rows is None else {None: stratum_rows}
+    else:
+        codes, uniques = pd.factorize(pd.Series(strata, index=values.index).to_numpy()[present][order])
+    estimate = _estimates(sorted_values, base)
+
+    # Per stratum: rows present, rows sampled and rows of the input
+    present_rows = np.bincount(codes)
+    weight = np.bincount(codes, weights=base) / present_rows
+    if stratum_rows is None:
+        input_rows = weight * present_rows if weighted else np.full(len(present_rows), np.inf)
+    else:
+        input_rows = np.array([stratum_rows[label] for label in uniques], dtype=float)
+    sampled_rows = np.maximum(np.round(input_rows / weight), present_rows) if weighted else present_rows
+    absent_rows = sampled_rows - present_rows
+    # Strata standing for more rows than were sampled carry sampling error
+    varies = input_rows > sampled_rows + 1e-9
+    # Gamma shape of the factors, chosen so a replicate mean varies like the
+    # sample mean does: s² / n, times the finite population correction 1 - n/N
+    sampled_share = np.minimum(sampled_rows / input_rows, 1 - 1e-9)
+    shape = np.maximum(((sampled_rows - 1) / (1 - sampled_share) - 1) / sampled_rows, MIN_GAMMA_SHAPE)
+
+    rng = np.random.default_rng(seed)
+    rows_vary = varies[codes]
+    replicates = np.empty((resamples, len(ESTIMATES)))
+    for i in range(resamples):
+        factors = np.ones(len(sorted_values))
+        factors[rows_vary] = rng.gamma(shape[codes][rows_vary])
+        # The absent rows' factors only matter through their sum, itself a Gamma draw
+        absent = np.where(varies & (absent_rows > 0), rng.gamma(np.maximum(absent_rows, 1) * shape), 0.0)
+        total = np.bincount(codes, weights=factors, minlength=len(varies)) + absent
+        scale = np.where(varies, sampled_rows / total, 1.0)
+        replicates[i] = _estimates(sorted_values, base * factors * scale[codes])
+
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(replicates, [tail, 1 - tail], axis=0)
+    return pd.DataFrame({
+        'estimate': estimate,
+        'ci_low': np.minimum(low, estimate),
+        'ci_high': np.maximum(high, estimate),
+        'std_error': replicates.std(axis=0, ddof=1) if resamples > 1 else np.nan,
+    }, index=labels.index)
+
+def summarize_sample(sample, columns=None, confidence=0.95, resamples=DEFAULT_RESAMPLES, seed=0):
+    """
+    Confidence intervals of the mean and quartiles of the numeric columns of a cleaned sample.
+
+    Args:
+        sample (pd.DataFrame): A sample from `sample_data`.
+        columns (list): Columns to estimate; by default the numeric columns of ESTIMATED_COLUMNS.
+        confidence (float): Coverage of the intervals.
+        resamples (int): Number of bootstrap replicates.
+        seed (int): Seed of the bootstrap.
+
+    Returns:
+        pd.DataFrame: One row per (column, statistic) with 'estimate',
+            'ci_low', 'ci_high' and 'std_error'.
+    """
+    if columns is None:
+        columns = [column for column in ESTIMATED_COLUMNS if column in sample and pd.api.types.is_numeric_dtype(sample[column])]
+    weights = sample[WEIGHT_COLUMN] if WEIGHT_COLUMN in sample else None
+    stratify_by = sample.attrs.get('stratify_by')
+    if stratify_by:
+        strata, stratum_rows = _strata(sample, stratify_by), sample.attrs['stratum_rows']
+    else:
+        strata, stratum_rows = None, sample.attrs.get('rows_seen')
+    tables = {column: confidence_intervals(sample[column], weights, strata, stratum_rows, confidence, resamples, seed)
+              for column in columns}
+    return pd.concat(tables, names=['column', 'statistic'])
+
+def unweighted_view(sample, seed=0):
+    """
+    Returns rows that can be plotted or described like an unweighted sample.
+
+    A uniform sample is returned as is. A stratified sample is resampled with
+    replacement in proportion to its weights, so every company appears as
+    often as in the input.
+
+    Args:
+        sample (pd.DataFrame): A sample from `sample_data`.
+        seed (int): Seed of the resampling.
+
+    Returns:
+        pd.DataFrame: The rows, without the `Sample_Weight` column.
+    """
+    if WEIGHT_COLUMN not in sample or sample.empty:
+        return sample
+    weights = sample[WEIGHT_COLUMN]
+    if np.allclose(weights, weights.iloc[0]):
+        return sample.drop(columns=WEIGHT_COLUMN)
+    view = sample.sample(n=len(sample), replace=True, weights=weights, random_state=seed).sort_index()
+    return view.drop(columns=WEIGHT_COLUMN)
+
+def print_sample_summary(sample, confidence=0.95, resamples=DEFAULT_RESAMPLES, seed=0):
+    """
+    Prints the summary statistics of a sample followed by the confidence intervals of its estimates.
+
+    Args:
+        sample (pd.DataFrame): A sample from `sample_data`.
+        confidence (float): Coverage of the intervals.
+        resamples (int): Number of bootstrap replicates.
+        seed (int): Seed of the bootstrap and of the view of a stratified sample.
+
+    Returns:
+        pd.DataFrame: The table of `summarize_sample`.
+    """
+    rows_seen = sample.attrs.get('rows_seen')
+    sampled_rows = sample.attrs.get('sampled_rows', len(sample))
+    print(f"\nSummary Statistics (sample of {sampled_rows:,} of {rows_seen:,} rows, {len(sample):,} after cleaning):")
+    print(unweighted_view(sample, seed).describe(include='all'))
+    table = summarize_sample(sample, confidence=confidence, resamples=resamples, seed=seed)
+    print(f"\n{confidence:.0%} Confidence Intervals:")
+    print(table.to_string())
+    return table
+
+def run_sampled(input_file='software_engineer_salaries.csv', size=DEFAULT_SAMPLE_SIZE, per_company=None, seed=0,
+                chunksize=DEFAULT_CHUNKSIZE, confidence=0.95, plots=True):
+    """
+    Exploratory mode: summary statistics with confidence intervals and the distribution plots of a sample.
+
+    Only the sampled rows are cleaned, so the cost is one pass of CSV parsing
+    regardless of how many salaries the input holds. Nothing is saved.
+
+    Args:
+        input_file (str or list): A CSV path, a glob pattern, or a list of paths and patterns.
+        size (int): Rows of the uniform sample.
+        per_company (int): If given, sample this many rows per company instead.
+        seed (int): Seed of the sampler and the bootstrap.
+        chunksize (int): Rows read per chunk.
+        confidence (float): Coverage of the intervals.
+        plots (bool): Whether to draw the salary and rating distributions.
+
+    Returns:
+        pd.DataFrame: The cleaned sample.
+    """
+    from data_processing import plot_rating_distribution, plot_salary_distribution
+    sample = sample_data(input_file, size=size, per_company=per_company, seed=seed, chunksize=chunksize)
+    print_sample_summary(sample, confidence=confidence, seed=seed)
+    if plots:
+        view = unweighted_view(sample, seed)
+        note = f" (sample of {len(view):,} rows)"
+        plot_salary_distribution(view, title='Average Salary Distribution' + note)
+        plot_rating_distribution(view, title='Company Rating Distribution' + note)
+    return sample
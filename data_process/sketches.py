@@ -0,0 +1,625 @@
+import base64
+import math
+import numpy as np
+import pandas as pd
+
+# Rows of the summary, in the order used by `DataFrame.describe(include='all')`
+SUMMARY_ROWS = ['count', 'unique', 'top', 'freq', 'mean', 'std', 'min', '25%', '50%', '75%', 'max']
+
+class RunningMoments:
+    """
+    Count, mean, sum of squared deviations, min and max of a numeric column,
+    accumulated batch by batch with the parallel update of Chan et al.
+    The mean and standard deviation are exact up to floating point rounding.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values):
+        """
+        Adds a batch of values, ignoring missing ones.
+
+        Args:
+            values (array-like): The values to add.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return
+        batch = RunningMoments()
+        batch.count = len(values)
+        batch.mean = values.mean()
+        batch.m2 = ((values - batch.mean) ** 2).sum()
+        batch.min = values.min()
+        batch.max = values.max()
+        self.merge(batch)
+
+    def merge(self, other):
+        """
+        Merges the moments of another batch into this one.
+
+        Args:
+            other (RunningMoments): The moments to merge.
+
+        Returns:
+            RunningMoments: This object, for chaining.
+        """
+        if other.count == 0:
+            return self
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def std(self):
+        """
+        float: The sample standard deviation, as reported by `describe`.
+        """
+        return np.sqrt(self.m2 / (self.count - 1)) if self.count > 1 else np.nan
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: A JSON-serializable representation of the moments.
+        """
+        if self.count == 0:
+            return {'count': 0}
+        return {'count': self.count, 'mean': self.mean, 'm2': self.m2, 'min': self.min, 'max': self.max}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Args:
+            state (dict): A representation returned by `to_dict`.
+
+        Returns:
+            RunningMoments: The restored moments.
+        """
+        moments = cls()
+        if state['count']:
+            moments.count = state['count']
+            moments.mean, moments.m2 = state['mean'], state['m2']
+            moments.min, moments.max = state['min'], state['max']
+        return moments
+
+class QuantileSketch:
+    """
+    A relative-error quantile sketch (DDSketch, Masson et al. 2019).
+
+    Values are counted in logarithmically sized buckets, so every quantile
+    estimate is within a relative error of `relative_accuracy` of the true
+    order statistic at that rank. Sketches with the same accuracy merge by
+    adding their bucket counts.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Args:
+            relative_accuracy (float): The maximum relative error of quantile estimates.
+        """
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def bucket_keys(self, values):
+        """
+        Returns the bucket index of each value, for callers that count buckets in bulk.
+
+        Args:
+            values (np.ndarray): Strictly positive values.
+
+        Returns:
+            np.ndarray: The bucket index of each value.
+        """
+        return np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+
+    def _add_buckets(self, store, values):
+        """
+        Counts positive magnitudes into a bucket store.
+
+        Args:
+            store (dict): The store mapping bucket index to count.
+            values (np.ndarray): Strictly positive values.
+        """
+        buckets, counts = np.unique(self.bucket_keys(values), return_counts=True)
+        for bucket, count in zip(buckets.tolist(), counts.tolist()):
+            store[bucket] = store.get(bucket, 0) + count
+
+    def update(self, values):
+        """
+        Adds a batch of values, ignoring missing ones.
+
+        Args:
+            values (array-like): The values to add.
+        """
+        values = np.asarray(values, dtype=float)
+        values = values[~np.isnan(values)]
+        self.count += len(values)
+        self.zero_count += int((values == 0).sum())
+        self._add_buckets(self.positive, values[values > 0])
+        self._add_buckets(self.negative, -values[values < 0])
+
+    def merge(self, other):
+        """
+        Merges another sketch into this one.
+
+        Args:
+            other (QuantileSketch): A sketch with the same relative accuracy.
+
+        Returns:
+            QuantileSketch: This object, for chaining.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Error: Only quantile sketches with the same relative accuracy can be merged.")
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for bucket, count in other_store.items():
+                store[bucket] = store.get(bucket, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        return self
+
+    def _bucket_value(self, bucket):
+        """
+        Returns the representative value of a bucket, equidistant in relative terms from both edges.
+        """
+        return 2 * self.gamma ** bucket / (self.gamma + 1)
+
+    def quantile(self, q):
+        """
+        Estimates a quantile.
+
+        Args:
+            q (float): The quantile, between 0 and 1.
+
+        Returns:
+            float: The estimated value at rank q * (count - 1), or NaN for an empty sketch.
+        """
+        if self.count == 0:
+            return np.nan
+        rank = q * (self.count - 1)
+        seen = 0
+        # Walk the buckets in ascending order of value: negatives, zeros, positives
+        for bucket in sorted(self.negative, reverse=True):
+            seen += self.negative[bucket]
+            if seen > rank:
+                return -self._bucket_value(bucket)
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        for bucket in sorted(self.positive):
+            seen += self.positive[bucket]
+            if seen > rank:
+                return self._bucket_value(bucket)
+        return self._bucket_value(max(self.positive))
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: A JSON-serializable representation of the sketch.
+        """
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': {str(bucket): count for bucket, count in self.positive.items()},
+            'negative': {str(bucket): count for bucket, count in self.negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Args:
+            state (dict): A representation returned by `to_dict`.
+
+        Returns:
+            QuantileSketch: The restored sketch.
+        """
+        sketch = cls(state['relative_accuracy'])
+        sketch.positive = {int(bucket): count for bucket, count in state['positive'].items()}
+        sketch.negative = {int(bucket): count for bucket, count in state['negative'].items()}
+        sketch.zero_count = state['zero_count']
+        sketch.count = state['count']
+        return sketch
+
+class DistinctCountSketch:
+    """
+    A HyperLogLog distinct-value counter (Flajolet et al. 2007).
+
+    Uses 2**precision one-byte registers. The relative standard error of
+    the estimate is about 1.04 / sqrt(2**precision), 0.8% for the default
+    precision of 14. Sketches with the same precision merge by taking the
+    register-wise maximum.
+    """
+
+    def __init__(self, precision=14):
+        """
+        Args:
+            precision (int): Number of hash bits used to select a register (4 to 18).
+        """
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    @property
+    def standard_error(self):
+        """
+        float: The relative standard error of the estimate.
+        """
+        return 1.04 / math.sqrt(len(self.registers))
+
+    def update(self, values):
+        """
+        Adds a batch of values, ignoring missing ones.
+
+        Args:
+            values (array-like): The values to add.
+        """
+        values = pd.Series(values).dropna()
+        if values.empty:
+            return
+        # Adding a value twice does not change the registers, so only hash distinct values
+        hashes = pd.util.hash_pandas_object(pd.Series(values.unique()).astype(str), index=False).to_numpy()
+        suffix_bits = 64 - self.precision
+        registers = (hashes >> np.uint64(suffix_bits)).astype(np.int64)
+        suffix = hashes & np.uint64((1 << suffix_bits) - 1)
+        # The rank is the position of the leftmost 1-bit in the suffix; split it
+        # into 32-bit halves so the float conversion used by frexp stays exact
+        high = (suffix >> np.uint64(32)).astype(np.float64)
+        low = (suffix & np.uint64(0xFFFFFFFF)).astype(np.float64)
+        bit_length = np.where(high > 0, 32 + np.frexp(high)[1], np.frexp(low)[1])
+        ranks = (suffix_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, registers, ranks)
+
+    def merge(self, other):
+        """
+        Merges another sketch into this one.
+
+        Args:
+            other (DistinctCountSketch): A sketch with the same precision.
+
+        Returns:
+            DistinctCountSketch: This object, for chaining.
+        """
+        if other.precision != self.precision:
+            raise ValueError("Error: Only distinct-count sketches with the same precision can be merged.")
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        """
+        Estimates the number of distinct values added so far.
+
+        Returns:
+            float: The estimated distinct count.
+        """
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int((self.registers == 0).sum())
+        # Small-range correction: linear counting is more accurate while registers are empty
+        if estimate <= 2.5 * m and zeros:
+            estimate = m * math.log(m / zeros)
+        return float(estimate)
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: A JSON-serializable representation of the sketch.
+        """
+        return {'precision': self.precision, 'registers': base64.b64encode(self.registers.tobytes()).decode('ascii')}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Args:
+            state (dict): A representation returned by `to_dict`.
+
+        Returns:
+            DistinctCountSketch: The restored sketch.
+        """
+        sketch = cls(state['precision'])
+        sketch.registers = np.frombuffer(base64.b64decode(state['registers']), dtype=np.uint8).copy()
+        return sketch
+
+class TopKSketch:
+    """
+    A Misra-Gries frequent-items summary with at most `capacity` counters.
+
+    Every reported frequency underestimates the true frequency by at most
+    total / (capacity + 1), and any value more frequent than that is kept.
+    Summaries merge by adding counters and reducing back to capacity.
+    """
+
+    def __init__(self, capacity=1024):
+        """
+        Args:
+            capacity (int): The maximum number of counters kept.
+        """
+        self.capacity = capacity
+        self.counters = {}
+        self.total = 0
+
+    @property
+    def max_error(self):
+        """
+        float: The largest possible underestimate of any frequency.
+        """
+        return self.total / (self.capacity + 1)
+
+    def _reduce(self):
+        """
+        Drops counters until at most `capacity` remain, subtracting the
+        (capacity + 1)-th largest count from all of them.
+        """
+        if len(self.counters) <= self.capacity:
+            return
+        cutoff = sorted(self.counters.values(), reverse=True)[self.capacity]
+        self.counters = {value: count - cutoff for value, count in self.counters.items() if count > cutoff}
+
+    def update(self, values):
+        """
+        Adds a batch of values, ignoring missing ones.
+
+        Args:
+            values (array-like): The values to add.
+        """
+        counts = pd.Series(values).value_counts()
+        self.total += int(counts.sum())
+        for value, count in counts.items():
+            self.counters[value] = self.counters.get(value, 0) + int(count)
+        self._reduce()
+
+    def merge(self, other):
+        """
+        Merges another summary into this one.
+
+        Args:
+            other (TopKSketch): The summary to merge.
+
+        Returns:
+            TopKSketch: This object, for chaining.
+        """
+        for value, count in other.counters.items():
+            self.counters[value] = self.counters.get(value, 0) + count
+        self.total += other.total
+        self._reduce()
+        return self
+
+    def top(self, k=1):
+        """
+        Returns the most frequent values.
+
+        Args:
+            k (int): Number of values to return.
+
+        Returns:
+            list: (value, estimated frequency) pairs in descending order of frequency.
+        """
+        return sorted(self.counters.items(), key=lambda item: item[1], reverse=True)[:k]
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: A JSON-serializable representation of the summary.
+        """
+        return {'capacity': self.capacity, 'total': self.total, 'counters': [[value, count] for value, count in self.counters.items()]}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Args:
+            state (dict): A representation returned by `to_dict`.
+
+        Returns:
+            TopKSketch: The restored summary.
+        """
+        sketch = cls(state['capacity'])
+        sketch.total = state['total']
+        sketch.counters = {value: count for value, count in state['counters']}
+        return sketch
+
+class SummaryStatistics:
+    """
+    A mergeable replacement for `DataFrame.describe(include='all')`.
+
+    Numeric columns keep exact streaming moments and a quantile sketch;
+    other columns keep a non-null count, a distinct-count sketch and a
+    top-k summary. Statistics built on separate chunks, shards or workers
+    can be merged and report the same figures as if built on all rows.
+
+    Error bounds against `describe`:
+        - count, mean, std, min, max: exact up to floating point rounding.
+        - 25%, 50%, 75%: within `relative_accuracy` of an order statistic
+          adjacent to the interpolated percentile.
+        - unique: relative standard error of 1.04 / sqrt(2**hll_precision).
+        - top/freq: exact whenever the top value is more frequent than
+          count / (top_k + 1); freq underestimates by at most that amount.
+    """
+
+    def __init__(self, relative_accuracy=0.01, hll_precision=14, top_k=1024):
+        """
+        Args:
+            relative_accuracy (float): Relative accuracy of the quantile sketches.
+            hll_precision (int): Precision of the distinct-count sketches.
+            top_k (int): Number of counters kept by the top-k summaries.
+        """
+        self.relative_accuracy = relative_accuracy
+        self.hll_precision = hll_precision
+        self.top_k = top_k
+        self.columns = []
+        self.moments = {}
+        self.quantiles = {}
+        self.counts = {}
+        self.distinct = {}
+        self.frequent = {}
+
+    @property
+    def numeric_columns(self):
+        """
+        list: The numeric columns seen so far, in order of first appearance.
+        """
+        return [column for column in self.columns if column in self.moments]
+
+    def _to_categorical(self, column):
+        """
+        Turns a numeric column into a categorical one after a chunk of non-numeric values.
+
+        The numeric rows seen so far stay in the count, but not in the
+        distinct-count and top-k sketches, which only cover the rows from the change on.
+        """
+        moments = self.moments.pop(column)
+        self.quantiles.pop(column)
+        self.counts[column] = self.counts.get(column, 0) + moments.count
+        self.distinct.setdefault(column, DistinctCountSketch(self.hll_precision))
+        self.frequent.setdefault(column, TopKSketch(self.top_k))
+
+    def _to_numeric(self, column):
+        """
+        Drops the categorical state of a column that had no values, e.g. an all-missing first chunk read as object.
+        """
+        for sketches in (self.counts, self.distinct, self.frequent):
+            sketches.pop(column, None)
+
+    def update(self, df):
+        """
+        Adds a batch of rows.
+
+        A column whose type changes between batches (for example one whose
+        first chunk was all missing, then held text) falls back to the
+        categorical statistics instead of failing.
+
+        Args:
+            df (pd.DataFrame): The rows to add.
+
+        Returns:
+            SummaryStatistics: This object, for chaining.
+        """
+        for column in df.columns:
+            if column not in self.columns:
+                self.columns.append(column)
+            values = df[column]
+            numeric = pd.api.types.is_numeric_dtype(values)
+            if column in self.moments and not numeric and values.count():
+                self._to_categorical(column)
+            elif column in self.counts and numeric and self.counts[column] == 0:
+                self._to_numeric(column)
+            if column in self.moments or (column not in self.counts and numeric):
+                self.moments.setdefault(column, RunningMoments()).update(values)
+                self.quantiles.setdefault(column, QuantileSketch(self.relative_accuracy)).update(values)
+            else:
+                self.counts[column] = self.counts.get(column, 0) + int(values.count())
+                self.distinct.setdefault(column, DistinctCountSketch(self.hll_precision)).update(values)
+                self.frequent.setdefault(column, TopKSketch(self.top_k)).update(values)
+        return self
+
+    def merge(self, other):
+        """
+        Merges statistics built over other rows into this object.
+
+        Args:
+            other (SummaryStatistics): The statistics to merge.
+
+        Returns:
+            SummaryStatistics: This object, for chaining.
+        """
+        for column in other.columns:
+            if column not in self.columns:
+                self.columns.append(column)
+        # A column numeric on one side and categorical on the other is merged as categorical
+        for column in [column for column in self.moments if column in other.counts]:
+            self._to_categorical(column)
+        if any(column in self.counts for column in other.moments):
+            other = SummaryStatistics.from_dict(other.to_dict())
+            for column in [column for column in other.moments if column in self.counts]:
+                other._to_categorical(column)
+        for name in ('moments', 'quantiles', 'distinct', 'frequent'):
+            mine, theirs = getattr(self, name), getattr(other, name)
+            for column, sketch in theirs.items():
+                if column in mine:
+                    mine[column].merge(sketch)
+                else:
+                    mine[column] = type(sketch).from_dict(sketch.to_dict())
+        for column, count in other.counts.items():
+            self.counts[column] = self.counts.get(column, 0) + count
+        return self
+
+    def describe(self):
+        """
+        Returns the summary laid out like `DataFrame.describe(include='all')`.
+
+        Returns:
+            pd.DataFrame: One column per input column, one row per statistic.
+        """
+        summary = {}
+        for column in self.columns:
+            if column in self.moments:
+                moments, quantiles = self.moments[column], self.quantiles[column]
+                empty = moments.count == 0
+                summary[column] = {
+                    'count': float(moments.count),
+                    'mean': np.nan if empty else moments.mean,
+                    'std': moments.std,
+                    'min': np.nan if empty else moments.min,
+                    '25%': quantiles.quantile(0.25),
+                    '50%': quantiles.quantile(0.5),
+                    '75%': quantiles.quantile(0.75),
+                    'max': np.nan if empty else moments.max,
+                }
+            else:
+                top = self.frequent[column].top(1)
+                summary[column] = {
+                    'count': float(self.counts[column]),
+                    'unique': round(self.distinct[column].estimate()),
+                    'top': top[0][0] if top else np.nan,
+                    'freq': top[0][1] if top else np.nan,
+                }
+        frame = pd.DataFrame(summary, columns=self.columns, dtype=object)
+        return frame.reindex([row for row in SUMMARY_ROWS if row in frame.index])
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: A JSON-serializable representation of all sketches.
+        """
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'hll_precision': self.hll_precision,
+            'top_k': self.top_k,
+            'columns': list(self.columns),
+            'counts': dict(self.counts),
+            'moments': {column: sketch.to_dict() for column, sketch in self.moments.items()},
+            'quantiles': {column: sketch.to_dict() for column, sketch in self.quantiles.items()},
+            'distinct': {column: sketch.to_dict() for column, sketch in self.distinct.items()},
+            'frequent': {column: sketch.to_dict() for column, sketch in self.frequent.items()},
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Args:
+            state (dict): A representation returned by `to_dict`.
+
+        Returns:
+            SummaryStatistics: The restored statistics.
+        """
+        statistics = cls(state['relative_accuracy'], state['hll_precision'], state['top_k'])
+        statistics.columns = list(state['columns'])
+        statistics.counts = dict(state['counts'])
+        statistics.moments = {column: RunningMoments.from_dict(s) for column, s in state['moments'].items()}
+        statistics.quantiles = {column: QuantileSketch.from_dict(s) for column, s in state['quantiles'].items()}
+        statistics.distinct = {column: DistinctCountSketch.from_dict(s) for column, s in state['distinct'].items()}
+        statistics.frequent = {column: TopKSketch.from_dict(s) for column, s in state['frequent'].items()}
+        return statistics
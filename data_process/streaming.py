@@ -0,0 +1,393 @@
+import numpy as np
+import pandas as pd
+import time
+from data_processing import DEFAULT_TOP_N, clean_data, plot_salary_by_company
+from lazy_imports import lazy_import
+from salary_cube import SalaryCube
+from salary_store import SalaryStore
+from sketches import RunningMoments, SummaryStatistics
+
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
+
+# Default number of rows read, cleaned and written per chunk
+DEFAULT_CHUNKSIZE = 100_000
+
+class RunningCovariance:
+    """
+    Co-moments of a pair of numeric columns over the rows where both are present.
+    """
+
+    def __init__(self):
+        self.x = RunningMoments()
+        self.y = RunningMoments()
+        self.c = 0.0
+
+    def update(self, x, y):
+        """
+        Adds a batch of paired values, ignoring rows where either is missing.
+
+        Args:
+            x (array-like): Values of the first column.
+            y (array-like): Values of the second column.
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.asarray(y, dtype=float)
+        present = ~(np.isnan(x) | np.isnan(y))
+        x, y = x[present], y[present]
+        if len(x) == 0:
+            return
+        batch = RunningCovariance()
+        batch.x.update(x)
+        batch.y.update(y)
+        batch.c = ((x - batch.x.mean) * (y - batch.y.mean)).sum()
+
+        count = self.x.count + batch.x.count
+        self.c += batch.c + (batch.x.mean - self.x.mean) * (batch.y.mean - self.y.mean) * self.x.count * batch.x.count / count
+        self.x.merge(batch.x)
+        self.y.merge(batch.y)
+
+    @property
+    def correlation(self):
+        """
+        float: The Pearson correlation of the pair.
+        """
+        denominator = np.sqrt(self.x.m2 * self.y.m2)
+        return self.c / denominator if self.x.count > 1 and denominator > 0 else np.nan
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: A JSON-serializable representation of the co-moments.
+        """
+        return {'x': self.x.to_dict(), 'y': self.y.to_dict(), 'c': self.c}
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Args:
+            state (dict): A representation returned by `to_dict`.
+
+        Returns:
+            RunningCovariance: The restored co-moments.
+        """
+        covariance = cls()
+        covariance.x = RunningMoments.from_dict(state['x'])
+        covariance.y = RunningMoments.from_dict(state['y'])
+        covariance.c = state['c']
+        return covariance
+
+class StreamingAggregates:
+    """
+    Running aggregates of cleaned salary data that back the summary and the
+    plots in streaming mode. Memory is bounded by the number of distinct
+    companies, salary bins and ratings, not by the number of rows.
+    """
+
+    def __init__(self, salary_bin_width=5000):
+        """
+        Args:
+            salary_bin_width (float): Width of the Average_Salary histogram bins.
+        """
+        self.salary_bin_width = salary_bin_width
+        self.rows = 0
+        self.statistics = SummaryStatistics()
+        self.covariances = {}
+        self.company_sum = pd.Series(dtype=float)
+        self.company_count = pd.Series(dtype=float)
+        self.salary_bins = pd.Series(dtype=float)
+        self.rating_counts = pd.Series(dtype=float)
+
+    def update(self, df):
+        """
+        Adds a chunk of cleaned data to the aggregates.
+
+        Args:
+            df (pd.DataFrame): A cleaned chunk.
+        """
+        self.rows += len(df)
+        self.statistics.update(df)
+        numeric = df.select_dtypes(include=[np.number])
+        for i, first in enumerate(numeric.columns):
+            for second in numeric.columns[i + 1:]:
+                self.covariances.setdefault((first, second), RunningCovariance()).update(numeric[first], numeric[second])
+
+        if 'Company' in df and 'Average_Salary' in df:
+            grouped = df.groupby('Company')['Average_Salary']
+            self.company_sum = self.company_sum.add(grouped.sum(), fill_value=0)
+            self.company_count = self.company_count.add(grouped.count(), fill_value=0)
+        if 'Average_Salary' in df:
+            bins = np.floor(df['Average_Salary'].dropna() / self.salary_bin_width).value_counts()
+            self.salary_bins = self.salary_bins.add(bins, fill_value=0)
+        if 'Company Score' in df:
+            self.rating_counts = self.rating_counts.add(df['Company Score'].value_counts(), fill_value=0)
+
+    def summary(self):
+        """
+        Returns the sketch-based summary of every column.
+
+        Returns:
+            pd.DataFrame: The summary, laid out like `DataFrame.describe(include='all')`.
+        """
+        return self.statistics.describe()
+
+    def correlation(self):
+        """
+        Returns the Pearson correlation matrix of the numeric columns.
+
+        Returns:
+            pd.DataFrame: The correlation matrix, as `DataFrame.corr` would compute it.
+        """
+        columns = self.statistics.numeric_columns
+        matrix = pd.DataFrame(np.eye(len(columns)), index=columns, columns=columns)
+        for (first, second), covariance in self.covariances.items():
+            matrix.loc[first, second] = matrix.loc[second, first] = covariance.correlation
+        return matrix
+
+    def company_aggregates(self):
+        """
+        Returns the row count and average salary of every company.
+
+        Returns:
+            pd.DataFrame: 'count' and 'mean' columns indexed by company, the
+                precomputed form accepted by `plot_salary_by_company`.
+        """
+        return pd.DataFrame({'count': self.company_count, 'mean': self.company_sum / self.company_count})
+
+    def company_means(self):
+        """
+        Returns the average salary of every company, in ascending order.
+
+        Returns:
+            pd.Series: Average salary indexed by company.
+        """
+        return (self.company_sum / self.company_count).sort_values()
+
+    def salary_histogram(self):
+        """
+        Returns the Average_Salary histogram.
+
+        Returns:
+            tuple: The left bin edges and the count of each bin.
+        """
+        bins = self.salary_bins.sort_index()
+        return bins.index.to_numpy() * self.salary_bin_width, bins.to_numpy()
+
+    def to_dict(self):
+        """
+        Returns:
+            dict: A JSON-serializable representation of all aggregates.
+        """
+        def pairs(series):
+            items = [[key.item() if isinstance(key, np.generic) else key, float(value)] for key, value in series.items()]
+            return {'name': series.name, 'index_name': series.index.name, 'items': items}
+
+        return {
+            'salary_bin_width': self.salary_bin_width,
+            'rows': self.rows,
+            'statistics': self.statistics.to_dict(),
+            'covariances': [[first, second, covariance.to_dict()] for (first, second), covariance in self.covariances.items()],
+            'company_sum': pairs(self.company_sum),
+            'company_count': pairs(self.company_count),
+            'salary_bins': pairs(self.salary_bins),
+            'rating_counts': pairs(self.rating_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        """
+        Args:
+            state (dict): A representation returned by `to_dict`.
+
+        Returns:
+            StreamingAggregates: The restored aggregates.
+        """
+        def series(pairs):
+            keys = [key for key, _ in pairs['items']]
+            values = [value for _, value in pairs['items']]
+            return pd.Series(values, index=pd.Index(keys, name=pairs['index_name']), name=pairs['name'], dtype=float)
+
+        aggregates = cls(state['salary_bin_width'])
+        aggregates.rows = state['rows']
+        aggregates.statistics = SummaryStatistics.from_dict(state['statistics'])
+        aggregates.covariances = {(first, second): RunningCovariance.from_dict(covariance)
+                                  for first, second, covariance in state['covariances']}
+        aggregates.company_sum = series(state['company_sum'])
+        aggregates.company_count = series(state['company_count'])
+        aggregates.salary_bins = series(state['salary_bins'])
+        aggregates.rating_counts = series(state['rating_counts'])
+        return aggregates
+
+def stream_process(input_file, output_file, chunksize=DEFAULT_CHUNKSIZE, aggregates=None, engine='pandas', db_path=None,
+                   writer=None, cube_file=None):
+    """
+    Cleans a salary CSV chunk by chunk, appending each cleaned chunk to the output.
+
+    Only one chunk is held in memory at a time; the summary statistics and
+    plot data are kept as running aggregates.
+
+    Args:
+        input_file (str): Path to the raw CSV file.
+        output_file (str): Path where the processed CSV file will be written.
+        chunksize (int): Number of rows per chunk.
+        aggregates (StreamingAggregates): Aggregates to update. A new object is created if omitted.
+        engine (str): The DataFrame engine used to clean each chunk, 'pandas' or 'polars'.
+        db_path (str): Optional SQLite salary store that also receives every cleaned chunk.
+        writer (output_writer.OutputWriter): Optional background writer the cleaned
+            chunks are appended through, so the next chunk is cleaned while one is written.
+        cube_file (str): Optional path where the salary cube, merged chunk by chunk, is saved.
+
+    Returns:
+        StreamingAggregates: The aggregates over all cleaned rows.
+    """
+    if aggregates is None:
+        aggregates = StreamingAggregates()
+    store = SalaryStore(db_path) if db_path is not None else None
+    cube = None
+
+    start = time.perf_counter()
+    first_chunk = True
+    try:
+        for chunk in pd.read_csv(input_file, chunksize=chunksize):
+            cleaned = clean_data(chunk, engine=engine)
+            if writer is not None:
+                writer.append(cleaned, output_file)
+            else:
+                # The first chunk truncates the output and writes the header
+                cleaned.to_csv(output_file, mode='w' if first_chunk else 'a', header=first_chunk, index=False)
+            if store is not None:
+                store.write(cleaned, append=not first_chunk)
+            aggregates.update(cleaned)
+            if cube_file is not None and len(cleaned):
+                chunk_cube = SalaryCube.build(cleaned)
+                cube = chunk_cube if cube is None else cube.merge(chunk_cube)
+            if first_chunk and writer is None:
+                print(f"First {len(cleaned)} processed rows written to {output_file} after {time.perf_counter() - start:.2f}s")
+            first_chunk = False
+    finally:
+        # The store is closed even when a chunk fails, so its connection is not leaked
+        if store is not None:
+            store.close()
+    if first_chunk:
+        raise ValueError(f"Error: The file '{input_file}' contains no rows.")
+    if writer is not None:
+        writer.finish(output_file)
+        print(f"Processed data queued for {output_file} ({aggregates.rows} rows)")
+    else:
+        print(f"Processed data successfully saved to {output_file} ({aggregates.rows} rows)")
+    if store is not None:
+        print(f"{aggregates.rows} rows saved to the salary store {db_path}")
+    if cube is not None:
+        cube.save(cube_file)
+        print(f"Salary cube of {cube.rows} rows saved to {cube_file}")
+    return aggregates
+
+def print_streamed_summary(aggregates):
+    """
+    Prints the summary statistics held by streaming aggregates.
+
+    Args:
+        aggregates (StreamingAggregates): The aggregates to report.
+
+    Returns:
+        None
+    """
+    print("\nSummary Statistics:")
+    print(aggregates.summary())
+
+def plot_streamed_salary_distribution(aggregates):
+    """
+    Plots the distribution of average salaries from the running histogram.
+
+    Args:
+        aggregates (StreamingAggregates): The aggregates to plot.
+
+    Returns:
+        None
+    """
+    edges, counts = aggregates.salary_histogram()
+    plt.figure(figsize=(10, 6))
+    plt.bar(edges, counts, width=aggregates.salary_bin_width, align='edge', color='blue', alpha=0.6)
+    plt.title('Average Salary Distribution')
+    plt.xlabel('Average Salary')
+    plt.ylabel('Frequency')
+    plt.show()
+
+def plot_streamed_salary_by_company(aggregates, top_n=DEFAULT_TOP_N):
+    """
+    Plots the average salary by company from the running per-company sums.
+
+    Args:
+        aggregates (StreamingAggregates): The aggregates to plot.
+        top_n (int): Number of companies drawn individually; None draws all.
+
+    Returns:
+        None
+    """
+    plot_salary_by_company(aggregates=aggregates.company_aggregates(), top_n=top_n)
+
+def plot_streamed_rating_distribution(aggregates):
+    """
+    Plots the distribution of company ratings from the running rating counts.
+
+    Args:
+        aggregates (StreamingAggregates): The aggregates to plot.
+
+    Returns:
+        None
+    """
+    ratings = aggregates.rating_counts.sort_index()
+    plt.figure(figsize=(10, 6))
+    plt.bar(ratings.index, ratings.to_numpy(), width=0.08, color='orange')
+    plt.title('Company Rating Distribution')
+    plt.xlabel('Company Rating')
+    plt.ylabel('Frequency')
+    plt.show()
+
+def plot_streamed_heatmap_correlation(aggregates):
+    """
+    Plots a heatmap of the correlation matrix built from the running co-moments.
+
+    Args:
+        aggregates (StreamingAggregates): The aggregates to plot.
+
+    Returns:
+        None
+    """
+    plt.figure(figsize=(10, 8))
+    sns.heatmap(aggregates.correlation(), annot=True, cmap='coolwarm', fmt='.2f')
+    plt.title('Correlation Heatmap')
+    plt.show()
+
+def run_streaming(input_file, output_file, chunksize=DEFAULT_CHUNKSIZE, top_n=DEFAULT_TOP_N, plots=True, engine='pandas',
+                  db_path=None, writer=None, cube_file=None):
+    """
+    Runs the bounded-memory version of the salary workflow.
+
+    The box plot and the per-company scatter plot need every row and are
+    skipped in streaming mode.
+
+    Args:
+        input_file (str): Path to the raw CSV file.
+        output_file (str): Path where the processed CSV file will be written.
+        chunksize (int): Number of rows per chunk.
+        top_n (int): Number of companies drawn individually in the company plot.
+        plots (bool): Whether to draw the plots.
+        engine (str): The DataFrame engine used to clean each chunk.
+        db_path (str): Optional SQLite salary store that also receives the cleaned rows.
+        writer (output_writer.OutputWriter): Optional background writer of the processed CSV.
+        cube_file (str): Optional path where the salary cube of the cleaned rows is saved.
+
+    Returns:
+        StreamingAggregates: The aggregates over all cleaned rows.
+    """
+    aggregates = stream_process(input_file, output_file, chunksize=chunksize, engine=engine, db_path=db_path,
+                                writer=writer, cube_file=cube_file)
+    print_streamed_summary(aggregates)
+    if not plots:
+        return aggregates
+    plot_streamed_salary_distribution(aggregates)
+    plot_streamed_salary_by_company(aggregates, top_n=top_n)
+    plot_streamed_rating_distribution(aggregates)
+    plot_streamed_heatmap_correlation(aggregates)
+    return aggregates
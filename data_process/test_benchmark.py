@@ -0,0 +1,65 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+from benchmark import STAGES, compare_to_baseline, main, run_benchmarks
+
+class TestBenchmark(unittest.TestCase):
+    """
+    This class contains unit tests for the benchmark harness.
+    It runs the stages on a tiny generated dataset and checks the baseline comparison.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.baseline = os.path.join(self.directory, 'baseline.json')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _main(self, *args):
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()) as errors:
+            main(['--rows', '500', '--repeat', '1', '--data-dir', self.directory, '--baseline', self.baseline, *args])
+        return errors.getvalue()
+
+    def test_run_benchmarks(self):
+        """
+        Test that every stage reports throughput and peak memory.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            results = run_benchmarks([300], repeat=1, data_dir=self.directory)
+        self.assertEqual(sorted(results), sorted(f'{name}@300' for name in STAGES))
+        for result in results.values():
+            self.assertGreater(result['rows_per_second'], 0)
+            self.assertGreaterEqual(result['peak_mb'], 0)
+
+    def test_compare_to_baseline(self):
+        """
+        Test that slower or larger stages are reported and faster ones are not.
+        """
+        baseline = {'clean@10': {'rows_per_second': 1000.0, 'peak_mb': 10.0}}
+        self.assertEqual(compare_to_baseline({'clean@10': {'rows_per_second': 900.0, 'peak_mb': 11.0}}, baseline), [])
+        self.assertEqual(compare_to_baseline({'read@10': {'rows_per_second': 1.0, 'peak_mb': 99.0}}, baseline), [])
+        regressions = compare_to_baseline({'clean@10': {'rows_per_second': 500.0, 'peak_mb': 20.0}}, baseline)
+        self.assertEqual(len(regressions), 2)
+
+    def test_regression_fails(self):
+        """
+        Test that a run slower than the saved baseline exits with an error.
+        """
+        self._main('--stages', 'read', '--save-baseline')
+        with open(self.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+        self.assertIn('clean@500', baseline)
+        baseline['clean@500']['rows_per_second'] *= 1000
+        with open(self.baseline, 'w') as baseline_file:
+            json.dump(baseline, baseline_file)
+        with self.assertRaises(SystemExit):
+            self._main('--stages', 'read')
+        self.assertEqual(self._main('--stages', 'read', '--tolerance', '1000'), '')
+
+if __name__ == '__main__':
+    unittest.main()
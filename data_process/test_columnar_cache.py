@@ -0,0 +1,123 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import pandas as pd
+from unittest.mock import patch
+import columnar_cache
+from data_processing import read_data
+from generate_salaries import generate_block
+
+class TestColumnarCache(unittest.TestCase):
+    """
+    This class contains unit tests for the columnar_cache module.
+    It checks that cached frames equal parsed ones and that stale caches are rebuilt.
+    """
+
+    def setUp(self):
+        """
+        Write a generated raw salary CSV to a temporary directory.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'salaries.csv')
+        generate_block(0, 800, seed=9, companies=30).to_csv(self.file_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _read(self, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            return read_data(self.file_path, **kwargs)
+
+    def test_round_trip(self):
+        """
+        Test that raw and cleaned frames load back identical, with memory-mapped numeric columns.
+        """
+        for clean in (False, True):
+            expected = self._read(clean=clean)
+            self.assertTrue(columnar_cache.store(expected, self.file_path, clean))
+            loaded = columnar_cache.load(self.file_path, clean)
+            pd.testing.assert_frame_equal(loaded, expected, check_exact=True)
+
+    def test_loaded_frame_is_writable(self):
+        """
+        Test that a loaded frame can be modified like a parsed one without changing the cache.
+        """
+        expected = self._read(clean=True)
+        columnar_cache.store(expected, self.file_path, clean=True)
+        loaded = columnar_cache.load(self.file_path, clean=True)
+        loaded.loc[0, 'Company Score'] = -1.0
+        loaded['Company Score'] *= 2
+        self.assertEqual(loaded.loc[0, 'Company Score'], -2.0)
+        pd.testing.assert_frame_equal(columnar_cache.load(self.file_path, clean=True), expected, check_exact=True)
+
+    def test_key_change_rebuilds(self):
+        """
+        Test that a cache written under another key, e.g. by another engine or cleaning code, is not loaded.
+        """
+        df = self._read()
+        columnar_cache.store(df, self.file_path, key='pandas-old')
+        self.assertIsNotNone(columnar_cache.load(self.file_path, key='pandas-old'))
+        self.assertIsNone(columnar_cache.load(self.file_path, key='pandas-new'))
+
+        self._read(cache=True)
+        with patch('data_processing.cache_key', return_value='changed'), patch('data_processing.pd.read_csv', wraps=pd.read_csv) as mock_read_csv:
+            self._read(cache=True)
+        mock_read_csv.assert_called_once()
+
+    def test_read_data_uses_cache(self):
+        """
+        Test that a second cached read does not parse the CSV.
+        """
+        first = self._read(clean=True, cache=True)
+        with patch('data_processing.pd.read_csv') as mock_read_csv:
+            second = self._read(clean=True, cache=True)
+        mock_read_csv.assert_not_called()
+        pd.testing.assert_frame_equal(second, first, check_exact=True)
+
+    def test_invalidation(self):
+        """
+        Test that a touched file keeps its cache and a changed file of the same size does not.
+        """
+        df = self._read()
+        columnar_cache.store(df, self.file_path)
+
+        os.utime(self.file_path, ns=(0, 10**18))
+        self.assertIsNotNone(columnar_cache.load(self.file_path))
+        with open(os.path.join(columnar_cache.cache_dir(self.file_path), 'raw.json')) as meta_file:
+            self.assertEqual(json.load(meta_file)['mtime_ns'], 10**18)
+
+        with open(self.file_path, 'r+b') as source:
+            source.seek(-2, os.SEEK_END)
+            source.write(b'X\n')
+        self.assertIsNone(columnar_cache.load(self.file_path))
+        reread = self._read(cache=True)
+        self.assertEqual(reread['Salary'].iloc[-1][-1], 'X')
+        self.assertEqual(len(os.listdir(columnar_cache.cache_dir(self.file_path))), len(df.columns) + 1)
+
+    def test_multiple_files(self):
+        """
+        Test that each file of a glob is cached and loaded with its source column.
+        """
+        generate_block(1, 300, seed=9, companies=30).to_csv(os.path.join(self.directory, 'salaries_2.csv'), index=False)
+        pattern = os.path.join(self.directory, 'salaries*.csv')
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = read_data(pattern, clean=True, max_workers=1)
+            read_data(pattern, clean=True, max_workers=1, cache=True)
+            loaded = read_data(pattern, clean=True, max_workers=1, cache=True)
+        pd.testing.assert_frame_equal(loaded, expected, check_exact=True)
+
+    def test_unsupported_column(self):
+        """
+        Test that a column of mixed Python objects is not cached.
+        """
+        df = pd.DataFrame({'Mixed': pd.Series(['a', 1], dtype=object)})
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(columnar_cache.store(df, self.file_path))
+        self.assertIsNone(columnar_cache.load(self.file_path))
+
+if __name__ == '__main__':
+    unittest.main()
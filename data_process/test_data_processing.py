@@ -1,9 +1,14 @@
 import unittest
+import os
+import tempfile
 import pandas as pd
 from data_processing import (
     read_data,
+    resolve_input_files,
+    is_multi_file_input,
     extract_salary,
     clean_data,
+    parse_salaries_sharded,
     calculate_summary_statistics,
     filter_data_by_location,
     plot_salary_distribution,
@@ -12,7 +17,9 @@ from data_processing import (
     plot_rating_distribution,
     plot_salary_vs_rating,
     plot_heatmap_correlation,
-    save_processed_data
+    save_processed_data,
+    aggregate_salary_by_company,
+    collapse_company_aggregates
 )
 from unittest.mock import patch, MagicMock
 import numpy as np
@@ -37,6 +44,68 @@ class TestDataProcessing(unittest.TestCase):
         df = read_data('dummy_path.csv')
         pd.testing.assert_frame_equal(df, mock_df)
     
+    def _write_shards(self, directory):
+        """
+        Write two small salary shard files with slightly different columns.
+        """
+        first = pd.DataFrame({'Company': ['A', 'B'], 'Salary': ['50K-100K', 'Invalid'], 'Location': ['Remote', 'Austin, TX']})
+        second = pd.DataFrame({'Company': ['C'], 'Salary': ['60K'], 'Location': ['Remote'], 'Company Score': [4.1]})
+        first.to_csv(os.path.join(directory, 'salaries_1.csv'), index=False)
+        second.to_csv(os.path.join(directory, 'salaries_2.csv'), index=False)
+    
+    def test_read_data_multiple_files(self):
+        """
+        Test that read_data reads a glob of shard files in a process pool and concatenates them.
+        Checks the unified schema, the source-file column and the per-file timings.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            self._write_shards(directory)
+            with patch('data_processing.print'):
+                df = read_data(os.path.join(directory, 'salaries_*.csv'), max_workers=2)
+        
+        self.assertEqual(list(df.columns), ['Company', 'Salary', 'Location', 'Company Score', 'Source_File'])
+        self.assertEqual(df['Company'].tolist(), ['A', 'B', 'C'])
+        self.assertEqual(df['Source_File'].tolist(), ['salaries_1.csv', 'salaries_1.csv', 'salaries_2.csv'])
+        self.assertEqual([timing['rows'] for timing in df.attrs['file_timings']], [2, 1])
+    
+    def test_clean_data_multiple_files(self):
+        """
+        Test that clean_data accepts a list of files and cleans each of them.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            self._write_shards(directory)
+            paths = resolve_input_files(os.path.join(directory, '*.csv'))
+            with patch('data_processing.print'):
+                df = clean_data(paths)
+        
+        self.assertEqual(df['Company'].tolist(), ['A', 'C'])
+        self.assertEqual(df['Average_Salary'].tolist(), [75000.0, 60000.0])
+    
+    @patch('data_processing.read_data')
+    def test_clean_data_files_keep_max_workers(self, mock_read_data):
+        """
+        Test that clean_data passes max_workers on when it reads the files itself.
+        """
+        clean_data(['a.csv', 'b.csv'], max_workers=3)
+        self.assertEqual(mock_read_data.call_args.kwargs['max_workers'], 3)
+    
+    def test_resolve_input_files_no_match(self):
+        """
+        Test that a glob pattern without matches raises a FileNotFoundError.
+        """
+        with self.assertRaises(FileNotFoundError):
+            resolve_input_files('no_such_directory/*.csv')
+    
+    def test_resolve_input_files_literal_brackets(self):
+        """
+        Test that an existing file whose name contains glob characters is read as a plain path.
+        """
+        with tempfile.TemporaryDirectory() as directory:
+            file_path = os.path.join(directory, 'salaries[2024].csv')
+            pd.DataFrame({'Company': ['A']}).to_csv(file_path, index=False)
+            self.assertEqual(resolve_input_files(file_path), [file_path])
+            self.assertFalse(is_multi_file_input(file_path))
+    
     def test_extract_salary(self):
         """
         Test the extract_salary function to ensure it correctly parses salary strings.
@@ -69,6 +138,23 @@ class TestDataProcessing(unittest.TestCase):
         # Test: Compare the cleaned DataFrame with the expected DataFrame
         pd.testing.assert_frame_equal(cleaned_df, expected_df)
     
+    def test_clean_data_sharded(self):
+        """
+        Test that cleaning in a process pool over shared memory gives the same frame
+        as cleaning in one process, for shards that do not divide the rows evenly.
+        """
+        salaries = ['50K-100K', '60K', None, '$70K - $120K (est.)', 'Invalid', '$80K - ', '$1.5K'] * 3
+        df = pd.DataFrame({'Salary': salaries, 'Location': ['Remote'] * len(salaries)})
+        with patch('data_processing.print'):
+            expected = clean_data(df.copy())
+        # The workers inherit stdout; their salary logs are not of interest here
+        with open(os.devnull, 'w') as devnull, patch('sys.stdout', devnull):
+            actual = clean_data(df.copy(), max_workers=2, shard_rows=4)
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+        
+        with self.assertRaises(ValueError):
+            parse_salaries_sharded(df['Salary'], max_workers=2, shard_rows=0)
+    
     @patch('data_processing.print')
     def test_calculate_summary_statistics(self, mock_print):
         """
@@ -146,6 +232,59 @@ class TestDataProcessing(unittest.TestCase):
         # Test: Ensure plt.show was called to display the plot
         mock_show.assert_called()
     
+    def test_aggregate_salary_by_company_top_n(self):
+        """
+        Test that aggregate_salary_by_company keeps the most frequent companies and pools the rest into 'Other'.
+        """
+        df = pd.DataFrame({'Company': ['A', 'A', 'A', 'B', 'B', 'C', 'D'], 'Average_Salary': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 80.0]})
+        aggregates = aggregate_salary_by_company(df, top_n=2, box_stats=True)
+        self.assertEqual(sorted(aggregates.index), ['A', 'B', 'Other'])
+        self.assertEqual(aggregates.loc['Other', 'count'], 2)
+        self.assertEqual(aggregates.loc['Other', 'mean'], 70.0)
+        self.assertEqual(aggregates.loc['A', '50%'], 20.0)
+        self.assertEqual(aggregates.loc['A', 'max'], 30.0)
+    
+    def test_collapse_company_aggregates(self):
+        """
+        Test that precomputed aggregates collapse into the top companies and a count-weighted 'Other' mean.
+        """
+        aggregates = pd.DataFrame({'count': [5, 1, 3], 'mean': [10.0, 40.0, 20.0]}, index=['A', 'B', 'C'])
+        collapsed = collapse_company_aggregates(aggregates, top_n=2)
+        self.assertEqual(list(collapsed.index), ['A', 'C', 'Other'])
+        self.assertEqual(collapsed.loc['Other', 'mean'], 40.0)
+    
+    @patch('data_processing.plt.show')
+    def test_plot_company_plots_large_data_mode(self, mock_show):
+        """
+        Test the company plots with top-N bucketing and with precomputed aggregates.
+        """
+        df = pd.DataFrame({'Company': ['A', 'B', 'C', 'A'], 'Company Score': [4.5, 3.7, 4.8, 4.5], 'Average_Salary': [50000, 60000, 70000, 55000]})
+        plot_salary_by_company(df, top_n=1)
+        plot_salary_by_company(aggregates=aggregate_salary_by_company(df), top_n=2)
+        plot_salary_boxplot(df, top_n=2)
+        plot_salary_vs_rating(df, top_n=1)
+        plot_salary_boxplot(aggregates=aggregate_salary_by_company(df, top_n=1, box_stats=True), top_n=1)
+        self.assertEqual(mock_show.call_count, 5)
+        # Per-company quartiles cannot be pooled into an 'Other' box
+        with self.assertRaises(ValueError):
+            plot_salary_boxplot(aggregates=aggregate_salary_by_company(df, box_stats=True), top_n=1)
+    
+    @patch('data_processing.LARGE_DATA_THRESHOLD', 2)
+    @patch('data_processing.sns.scatterplot')
+    @patch('data_processing.sns.histplot')
+    @patch('data_processing.plt.show')
+    def test_plots_above_large_data_threshold(self, mock_show, mock_histplot, mock_scatterplot):
+        """
+        Test that binned rendering replaces per-point drawing and KDE above the size threshold.
+        """
+        df = pd.DataFrame({'Company': ['A', 'B', 'C'], 'Company Score': [4.5, 3.7, 4.8], 'Average_Salary': [50000, 60000, 70000]})
+        plot_salary_vs_rating(df)
+        plot_salary_distribution(df)
+        plot_rating_distribution(df)
+        mock_scatterplot.assert_not_called()
+        mock_histplot.assert_not_called()
+        self.assertEqual(mock_show.call_count, 3)
+    
     @patch('data_processing.plt.show')
     def test_plot_heatmap_correlation(self, mock_show):
         """
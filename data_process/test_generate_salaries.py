@@ -0,0 +1,65 @@
+import unittest
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import pandas as pd
+from data_processing import clean_data
+from generate_salaries import BLOCK_ROWS, COLUMNS, generate_block, generate_salaries, write_salaries
+
+class TestGenerateSalaries(unittest.TestCase):
+    """
+    This class contains unit tests for the generate_salaries module.
+    It checks that the synthetic data is deterministic and looks like the source data.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_deterministic(self):
+        """
+        Test that the same seed gives the same rows and a different seed does not.
+        """
+        pd.testing.assert_frame_equal(generate_block(3, 500, seed=1), generate_block(3, 500, seed=1))
+        self.assertFalse(generate_block(3, 500, seed=1).equals(generate_block(3, 500, seed=2)))
+
+    def test_blocks(self):
+        """
+        Test that a dataset is split into blocks that can be regenerated on their own.
+        """
+        blocks = list(generate_salaries(BLOCK_ROWS + 10, seed=4))
+        self.assertEqual([len(block) for block in blocks], [BLOCK_ROWS, 10])
+        pd.testing.assert_frame_equal(blocks[1], generate_block(1, 10, seed=4))
+
+    def test_formats(self):
+        """
+        Test the columns, the salary formats and the skew of the company distribution.
+        """
+        df = generate_block(0, 20_000)
+        self.assertEqual(list(df.columns), COLUMNS)
+        salaries = df['Salary'].dropna()
+        self.assertGreater(salaries.str.contains('Glassdoor est.').mean(), 0.3)
+        self.assertGreater(salaries.str.contains('Per Hour').mean(), 0.02)
+        self.assertTrue(salaries.str.match(r'^\$\d+K - \$\d+K\xa0\((Glassdoor|Employer) est\.\)$').any())
+        self.assertAlmostEqual(df['Salary'].isna().mean(), 0.14, delta=0.02)
+        counts = df['Company'].value_counts()
+        self.assertGreater(counts.iloc[0], 100 * counts.median())
+
+    def test_write_and_clean(self):
+        """
+        Test that a written file reads back and that clean_data parses most salaries.
+        """
+        file_path = write_salaries(os.path.join(self.directory, 'salaries.csv'), 1000, seed=5)
+        df = pd.read_csv(file_path)
+        self.assertEqual(len(df), 1000)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cleaned = clean_data(df)
+        self.assertGreater(len(cleaned), 750)
+        self.assertLess(len(cleaned), 900)
+
+if __name__ == '__main__':
+    unittest.main()
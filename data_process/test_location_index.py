@@ -0,0 +1,90 @@
+import unittest
+import pandas as pd
+from location_index import LocationIndex, build_location_index, location_fields, normalize_state, parse_location
+from data_processing import filter_data_by_location
+
+class TestLocationIndex(unittest.TestCase):
+    """
+    This class contains unit tests for the location_index module.
+    It checks location parsing, structured queries and the substring fallback.
+    """
+
+    def setUp(self):
+        """
+        Build a small DataFrame covering the location formats found in the salary data.
+        """
+        self.df = pd.DataFrame({
+            'Company': ['A', 'B', 'C', 'D', 'E', 'F', 'G', 'H'],
+            'Location': ['Seattle, WA', 'Remote', 'California', 'San Jose, CA',
+                         'Hybrid remote in Austin, TX', None, 'United States', 'seattle, WA'],
+        })
+        self.index = build_location_index(self.df)
+
+    def test_parse_location(self):
+        """
+        Test parse_location on each supported location format.
+        """
+        self.assertEqual(parse_location('Seattle, WA'), ('Seattle', 'WA', False, False))
+        self.assertEqual(parse_location('Remote'), (None, None, True, False))
+        self.assertEqual(parse_location('Remote in Boston, MA'), ('Boston', 'MA', True, False))
+        self.assertEqual(parse_location('Hybrid remote in Austin, TX'), ('Austin', 'TX', False, True))
+        self.assertEqual(parse_location('New York State'), (None, 'NY', False, False))
+        self.assertEqual(parse_location('United States'), (None, None, False, False))
+        self.assertEqual(parse_location('IN'), (None, 'IN', False, False))
+        self.assertEqual(parse_location('Indianapolis, IN'), ('Indianapolis', 'IN', False, False))
+        self.assertEqual(parse_location('Hybrid in Denver, CO'), ('Denver', 'CO', False, True))
+        self.assertEqual(parse_location('Minneapolis-Saint Paul'), ('Minneapolis-Saint Paul', None, False, False))
+        self.assertEqual(parse_location(float('nan')), (None, None, False, False))
+
+    def test_normalize_state(self):
+        """
+        Test that state names and codes normalize to postal codes.
+        """
+        self.assertEqual(normalize_state('California'), 'CA')
+        self.assertEqual(normalize_state('wa'), 'WA')
+        self.assertEqual(normalize_state('Washington State'), 'WA')
+        self.assertIsNone(normalize_state('Atlantis'))
+
+    def test_fields(self):
+        """
+        Test that the parsed fields are aligned with the rows of the DataFrame.
+        """
+        self.assertEqual(list(self.index.fields.columns), ['City', 'State', 'Remote', 'Hybrid'])
+        self.assertEqual(self.index.fields.loc[4, 'City'], 'Austin')
+        self.assertTrue(self.index.fields.loc[1, 'Remote'])
+        self.assertTrue(pd.isna(self.index.fields.loc[5, 'State']))
+        # The salary store parses its location columns with the same function
+        pd.testing.assert_frame_equal(location_fields(self.df['Location']), self.index.fields)
+
+    def test_query(self):
+        """
+        Test exact, state-level and remote queries against the index.
+        """
+        self.assertEqual(self.index.query(state='CA')['Company'].tolist(), ['C', 'D'])
+        self.assertEqual(self.index.query(state='California')['Company'].tolist(), ['C', 'D'])
+        self.assertEqual(self.index.query(city='Seattle')['Company'].tolist(), ['A', 'H'])
+        self.assertEqual(self.index.query(remote=True)['Company'].tolist(), ['B'])
+        self.assertEqual(self.index.query(hybrid=True, state='TX')['Company'].tolist(), ['E'])
+        self.assertTrue(self.index.query(city='Seattle', state='CA').empty)
+        self.assertEqual(len(self.index.query()), len(self.df))
+
+    def test_filter_with_index_matches_scan(self):
+        """
+        Test that filter_data_by_location returns the same rows with and without an index.
+        """
+        for location in ['Remote', 'WA', 'CA$', 'Nowhere']:
+            expected = filter_data_by_location(self.df, location)
+            actual = filter_data_by_location(self.df, location, index=self.index)
+            pd.testing.assert_frame_equal(actual, expected)
+
+    def test_index_on_filtered_frame(self):
+        """
+        Test that the index works on frames with a non-default index.
+        """
+        subset = self.df.iloc[2:]
+        index = LocationIndex(subset)
+        self.assertEqual(index.query(state='CA')['Company'].tolist(), ['C', 'D'])
+        pd.testing.assert_frame_equal(filter_data_by_location(subset, 'seattle', index=index), subset.iloc[[5]])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import contextlib
+import importlib.util
+import io
+import os
+import shutil
+import tempfile
+import pandas as pd
+import data_processing
+from generate_salaries import generate_block
+
+HAS_POLARS = importlib.util.find_spec('polars') is not None
+
+@unittest.skipUnless(HAS_POLARS, 'polars is not installed')
+class TestPolarsEngine(unittest.TestCase):
+    """
+    This class contains cross-engine parity tests: every function given
+    engine='polars' must return exactly what the pandas engine returns.
+    """
+
+    def setUp(self):
+        """
+        Write a synthetic raw salary file with hourly, malformed and missing values.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.raw = generate_block(0, 3000, seed=3, companies=50)
+        # Edge cases of extract_salary on top of the generated formats
+        self.raw.loc[:5, 'Salary'] = ['$1,200K', '12.5.3K', '$80K-', '$5 - $K', '-$90K', '$0K']
+        self.file_path = os.path.join(self.directory, 'salaries.csv')
+        self.raw.to_csv(self.file_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _both(self, function, *args, **kwargs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = function(*args, **kwargs)
+            actual = function(*args, engine='polars', **kwargs)
+        return expected, actual
+
+    def test_read_data(self):
+        """
+        Test that reading, with and without cleaning, gives identical frames.
+        """
+        for clean in (False, True):
+            expected, actual = self._both(data_processing.read_data, self.file_path, clean=clean)
+            pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+    def test_clean_data(self):
+        """
+        Test that parsing the salaries in polars matches extract_salary row by row.
+        """
+        expected = data_processing.clean_data(self.raw.copy())
+        actual = data_processing.clean_data(self.raw.copy(), engine='polars')
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+        # A chunk may start with a missing salary
+        tail = self.raw[self.raw['Salary'].isna()].index[0]
+        expected = data_processing.clean_data(self.raw.loc[tail:].copy())
+        actual = data_processing.clean_data(self.raw.loc[tail:].copy(), engine='polars')
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+    def test_filter_data_by_location(self):
+        """
+        Test that location filtering keeps the same rows for plain and regex patterns.
+        """
+        df = data_processing.clean_data(self.raw.copy())
+        for pattern in ('Remote', 'CA$', 'Austin|Boston'):
+            expected, actual = self._both(data_processing.filter_data_by_location, df, pattern)
+            pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+    def test_aggregate_salary_by_company(self):
+        """
+        Test the per-company aggregates, with and without the top-N bucket and box statistics.
+        """
+        df = data_processing.clean_data(self.raw.copy())
+        for top_n in (None, 10):
+            for box_stats in (False, True):
+                expected, actual = self._both(data_processing.aggregate_salary_by_company, df,
+                                              top_n=top_n, box_stats=box_stats)
+                pd.testing.assert_frame_equal(actual, expected, check_exact=False, rtol=1e-12)
+
+    def test_multi_file_read(self):
+        """
+        Test that the polars engine is used in the workers of a multi-file read.
+        """
+        second = os.path.join(self.directory, 'salaries_2.csv')
+        self.raw.iloc[:100].to_csv(second, index=False)
+        pattern = os.path.join(self.directory, 'salaries*.csv')
+        expected, actual = self._both(data_processing.read_data, pattern, clean=True, max_workers=1)
+        pd.testing.assert_frame_equal(actual, expected, check_exact=True)
+
+class TestEngineSelection(unittest.TestCase):
+    """
+    Tests of the engine argument itself.
+    """
+
+    def test_unknown_engine(self):
+        """
+        Test that an unknown engine name raises a ValueError.
+        """
+        df = pd.DataFrame({'Location': ['Remote'], 'Salary': ['$50K']})
+        with self.assertRaises(ValueError):
+            data_processing.filter_data_by_location(df, 'Remote', engine='dask')
+        with self.assertRaises(ValueError):
+            data_processing.clean_data(df, engine='arrow')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from salary_cube import SalaryCube, build_salary_cube, normalize_job_title
+
+class TestSalaryCube(unittest.TestCase):
+    """
+    This class contains unit tests for the salary_cube module.
+    It checks cube queries against pandas group-bys, merging and persistence.
+    """
+
+    def setUp(self):
+        """
+        Build a small cleaned DataFrame with repeated companies, states and titles.
+        """
+        rng = np.random.default_rng(7)
+        rows = 400
+        self.df = pd.DataFrame({
+            'Company': rng.choice(['Acme', 'Globex', 'Initech', None], rows),
+            'Job Title': rng.choice(['Sr. Software Eng.', 'Senior Software Engineer', 'Data Engineer', 'Jr Dev'], rows),
+            'Location': rng.choice(['Seattle, WA', 'Remote', 'San Jose, CA', 'Austin, TX', 'United States'], rows),
+            'Average_Salary': rng.integers(60, 250, rows) * 1000.0,
+        })
+        self.df.loc[::50, 'Average_Salary'] = np.nan
+        self.salaries = self.df['Average_Salary'].dropna()
+        self.cube = SalaryCube.build(self.df)
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertMatches(self, result, salaries):
+        """
+        Check cube statistics: exact counts, sums and extremes, approximate quartiles.
+        """
+        self.assertEqual(result['count'], len(salaries))
+        self.assertAlmostEqual(result['sum'], salaries.sum())
+        self.assertEqual(result['min'], salaries.min())
+        self.assertEqual(result['max'], salaries.max())
+        for q in ['25%', '50%', '75%']:
+            # The sketch returns an observed-rank value, pandas interpolates between neighbours
+            self.assertLess(abs(result[q] - salaries.quantile(float(q[:-1]) / 100)), 0.05 * salaries.max())
+
+    def test_normalize_job_title(self):
+        """
+        Test that common spellings of a title normalize to the same value.
+        """
+        self.assertEqual(normalize_job_title('Sr. Software Eng.'), 'senior software engineer')
+        self.assertEqual(normalize_job_title('Senior Software Engineer'), 'senior software engineer')
+        self.assertEqual(normalize_job_title('C++ Dev'), 'c++ developer')
+        self.assertEqual(normalize_job_title(None), 'Unknown')
+
+    def test_query_slices(self):
+        """
+        Test totals and single- and multi-dimension slices against pandas.
+        """
+        valid = self.df[self.df['Average_Salary'].notna()]
+        self.assertMatches(self.cube.query(), self.salaries)
+        self.assertMatches(self.cube.query(company='Acme'), valid[valid['Company'] == 'Acme']['Average_Salary'])
+        self.assertMatches(self.cube.query(company='Unknown'), valid[valid['Company'].isna()]['Average_Salary'])
+        self.assertMatches(self.cube.query(state='Remote'), valid[valid['Location'] == 'Remote']['Average_Salary'])
+        self.assertMatches(self.cube.query(state=['WA', 'CA']),
+                           valid[valid['Location'].isin(['Seattle, WA', 'San Jose, CA'])]['Average_Salary'])
+        senior = valid['Job Title'].str.startswith('S')
+        self.assertMatches(self.cube.query(company='Globex', title='senior software engineer'),
+                           valid[(valid['Company'] == 'Globex') & senior]['Average_Salary'])
+        self.assertMatches(self.cube.query(title_contains='SENIOR', state='TX'),
+                           valid[senior & (valid['Location'] == 'Austin, TX')]['Average_Salary'])
+        self.assertEqual(self.cube.query(company='Nobody')['count'], 0)
+
+    def test_group_by(self):
+        """
+        Test grouped roll-ups against a pandas group-by.
+        """
+        result = self.cube.query(group_by='Company')
+        expected = self.df.fillna({'Company': 'Unknown'}).groupby('Company')['Average_Salary'].agg(['count', 'sum'])
+        pd.testing.assert_frame_equal(result[['count', 'sum']], expected, check_dtype=False)
+
+        grouped = self.cube.query(company='Acme', group_by=['State', 'Title'])
+        self.assertEqual(grouped.index.names, ['State', 'Title'])
+        self.assertEqual(grouped['count'].sum(), self.cube.query(company='Acme')['count'])
+        with self.assertRaises(ValueError):
+            self.cube.query(group_by='Salary')
+
+    def test_merge(self):
+        """
+        Test that merging cubes built over two halves equals the cube over all rows.
+        """
+        merged = SalaryCube.build(self.df.iloc[:150]).merge(SalaryCube.build(self.df.iloc[150:]))
+        self.assertEqual(merged.rows, self.cube.rows)
+        for query in [{}, {'company': 'Initech'}, {'state': 'CA', 'title': 'Jr Dev'}]:
+            self.assertEqual(merged.query(**query), self.cube.query(**query))
+
+    def test_save_and_load(self):
+        """
+        Test that a saved cube answers queries like the original.
+        """
+        file_path = os.path.join(self.directory, 'cube.json')
+        with patch('builtins.print') as mock_print:
+            build_salary_cube(self.df, file_path)
+        mock_print.assert_called_once()
+        loaded = SalaryCube.load(file_path)
+        self.assertEqual(loaded.query(state='WA'), self.cube.query(state='WA'))
+        pd.testing.assert_frame_equal(loaded.query(group_by='Title'), self.cube.query(group_by='Title'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+from data_processing import clean_data, filter_data_by_location, save_processed_data
+from generate_salaries import generate_block
+from salary_store import SalaryStore, location_fields
+from streaming import stream_process
+
+class TestSalaryStore(unittest.TestCase):
+    """
+    This class contains unit tests for the salary_store module.
+    It checks that the SQLite store returns the rows the pandas filters return.
+    """
+
+    def setUp(self):
+        """
+        Clean a generated salary frame and write it to a temporary store.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.directory, 'salaries.db')
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.df = clean_data(generate_block(0, 1500, seed=5, companies=40))
+        self.store = SalaryStore(self.db_path)
+        self.store.write(self.df, batch_rows=400)
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.directory)
+
+    def test_filter_by_location(self):
+        """
+        Test that location filters match filter_data_by_location, including regular expressions.
+        """
+        for pattern in ('Remote', 'CA$', 'Austin|Boston', 'Nowhere'):
+            expected = filter_data_by_location(self.df, pattern).reset_index(drop=True)
+            pd.testing.assert_frame_equal(self.store.filter_by_location(pattern), expected, check_dtype=False)
+
+    def test_query(self):
+        """
+        Test the structured filters against the equivalent pandas masks.
+        """
+        states = location_fields(self.df['Location'])['State']
+        mask = (states == 'CA') & (self.df['Average_Salary'] >= 100_000)
+        result = self.store.query(state='California', min_salary=100_000)
+        pd.testing.assert_frame_equal(result, self.df[mask].reset_index(drop=True), check_dtype=False)
+
+        company = self.df['Company'].dropna().iloc[0]
+        result = self.store.query(company=company, remote=True, columns=['Company', 'Location'])
+        self.assertEqual(list(result.columns), ['Company', 'Location'])
+        self.assertEqual(len(result), ((self.df['Company'] == company) & (self.df['Location'] == 'Remote')).sum())
+
+    def test_salary_by(self):
+        """
+        Test the grouped aggregate against a pandas group-by.
+        """
+        result = self.store.salary_by('Company', max_salary=150_000)
+        subset = self.df[self.df['Average_Salary'] <= 150_000]
+        expected = subset.groupby('Company')['Average_Salary'].agg(['count', 'mean', 'min', 'max'])
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False, check_index_type=False, check_names=False)
+        with self.assertRaises(ValueError):
+            self.store.salary_by('Nope')
+
+    def test_indexes_are_used(self):
+        """
+        Test that the indexed filters are answered with an index search, not a table scan.
+        """
+        plan = self.store.connection.execute('EXPLAIN QUERY PLAN SELECT * FROM salaries WHERE "State" = ?', ['CA']).fetchall()
+        self.assertIn('USING INDEX idx_state', plan[0][-1])
+        names = {row[0] for row in self.store.connection.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertEqual(names, {'idx_company', 'idx_state', 'idx_job_title', 'idx_average_salary', 'idx_location'})
+
+    def test_append_and_replace(self):
+        """
+        Test that appending adds rows, that mismatched columns are rejected and that a write replaces the data.
+        """
+        self.store.write(self.df.iloc[:10], append=True)
+        self.assertEqual(len(self.store.query(columns=['Company'])), len(self.df) + 10)
+        with self.assertRaises(ValueError):
+            self.store.write(self.df[['Company', 'Average_Salary']], append=True)
+        self.store.write(self.df.iloc[:10])
+        self.assertEqual(len(self.store.query(columns=['Company'])), 10)
+
+    def test_save_processed_data_and_streaming(self):
+        """
+        Test that the in-memory and streaming workflows both fill the store.
+        """
+        raw_file = os.path.join(self.directory, 'raw.csv')
+        output_file = os.path.join(self.directory, 'out.csv')
+        generate_block(1, 500, seed=5, companies=40).to_csv(raw_file, index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cleaned = clean_data(pd.read_csv(raw_file))
+            save_processed_data(cleaned, output_file, db_path=os.path.join(self.directory, 'saved.db'))
+            stream_process(raw_file, output_file, chunksize=120, db_path=os.path.join(self.directory, 'streamed.db'))
+        for name in ('saved.db', 'streamed.db'):
+            with SalaryStore(os.path.join(self.directory, name)) as store:
+                result = store.query()
+            np.testing.assert_array_equal(result['Average_Salary'].to_numpy(), cleaned['Average_Salary'].to_numpy())
+
+if __name__ == '__main__':
+    unittest.main()
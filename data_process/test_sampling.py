@@ -0,0 +1,135 @@
+import unittest
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+import numpy as np
+import pandas as pd
+import sampling
+from generate_salaries import generate_block
+
+class TestSampling(unittest.TestCase):
+    """
+    This class contains unit tests for the sampling module.
+    It checks the samplers, their weights and the coverage of the confidence intervals.
+    """
+
+    def setUp(self):
+        """
+        Write a generated raw salary CSV to a temporary directory.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.directory, 'salaries.csv')
+        generate_block(0, 1000, seed=3, companies=20).to_csv(self.file_path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_reservoir_sample(self):
+        """
+        Test that the reservoir sample is reproducible and independent of the chunk size.
+        """
+        sample, rows_seen = sampling.reservoir_sample(self.file_path, size=50, seed=1, chunksize=64)
+        again, _ = sampling.reservoir_sample(self.file_path, size=50, seed=1, chunksize=64)
+        self.assertEqual(rows_seen, 1000)
+        self.assertEqual(len(sample), 50)
+        self.assertTrue(sample.index.is_monotonic_increasing)
+        self.assertAlmostEqual(sample[sampling.WEIGHT_COLUMN].sum(), 1000)
+        pd.testing.assert_frame_equal(sample, again)
+        # The keys are drawn row by row, so the chunking does not change the sample
+        single, _ = sampling.reservoir_sample(self.file_path, size=50, seed=1, chunksize=5000)
+        pd.testing.assert_frame_equal(single, sample)
+
+        raw = pd.read_csv(self.file_path)
+        pd.testing.assert_frame_equal(sample.drop(columns=sampling.WEIGHT_COLUMN), raw.loc[sample.index])
+
+    def test_reservoir_sample_is_uniform(self):
+        """
+        Test that every row is about equally likely to be sampled.
+        """
+        small_file = os.path.join(self.directory, 'small.csv')
+        pd.DataFrame({'Row': range(40)}).to_csv(small_file, index=False)
+        counts = np.zeros(40)
+        for seed in range(400):
+            sample, _ = sampling.reservoir_sample(small_file, size=10, seed=seed, chunksize=7)
+            counts[sample['Row'].to_numpy()] += 1
+        # Each row is expected in 100 of the 400 samples
+        self.assertLess(abs(counts[:20].sum() - counts[20:].sum()), 200)
+        self.assertTrue(((counts > 60) & (counts < 140)).all())
+
+    def test_stratified_sample(self):
+        """
+        Test that every company keeps at most `per_stratum` rows, weighted by its number of rows.
+        """
+        sample, stratum_rows = sampling.stratified_sample(self.file_path, per_stratum=5, chunksize=128)
+        raw = pd.read_csv(self.file_path)
+        self.assertEqual(stratum_rows.sum(), 1000)
+        self.assertTrue((sample.groupby('Company').size() <= 5).all())
+        weights = sample.groupby('Company')[sampling.WEIGHT_COLUMN].sum()
+        pd.testing.assert_series_equal(weights, raw['Company'].value_counts().sort_index().astype(float),
+                                       check_names=False)
+
+    def test_complete_sample_is_exact(self):
+        """
+        Test that a sample of every row reproduces the statistics of the full data with zero-width intervals.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            sample = sampling.sample_data(self.file_path, size=5000)
+        self.assertEqual(sample.attrs['rows_seen'], 1000)
+        table = sampling.summarize_sample(sample, columns=['Average_Salary'], resamples=20)
+        mean = table.loc[('Average_Salary', 'mean')]
+        self.assertAlmostEqual(mean['estimate'], sample['Average_Salary'].mean())
+        self.assertEqual(mean['ci_low'], mean['ci_high'])
+        self.assertEqual(table.loc[('Average_Salary', '50%'), 'estimate'], sample['Average_Salary'].quantile(0.5, interpolation='lower'))
+
+    def test_sample_reads_only_cleaned_columns(self):
+        """
+        Test that the sampler skips raw columns the cleaned data does not use and tolerates missing ones.
+        """
+        raw = pd.read_csv(self.file_path).drop(columns='Date')
+        raw['Description'] = 'long text'
+        raw.to_csv(self.file_path, index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            sample = sampling.sample_data(self.file_path, size=10, per_company=2)
+        self.assertEqual([column for column in sample.columns if column in raw.columns],
+                         [column for column in raw.columns if column in sampling.SAMPLED_COLUMNS])
+        self.assertNotIn('Description', sample.columns)
+
+    def test_interval_coverage(self):
+        """
+        Test that 90% intervals of the mean and median cover the true values about 90% of the time.
+        """
+        rng = np.random.default_rng(0)
+        covered = np.zeros(2)
+        trials = 200
+        for trial in range(trials):
+            values = pd.Series(rng.normal(100, 15, size=200))
+            table = sampling.confidence_intervals(values, confidence=0.9, resamples=200, seed=trial)
+            for i, label in enumerate(['mean', '50%']):
+                covered[i] += table.loc[label, 'ci_low'] <= 100 <= table.loc[label, 'ci_high']
+        self.assertTrue(((covered / trials > 0.82) & (covered / trials < 0.97)).all(), covered / trials)
+
+    def test_stratified_summary(self):
+        """
+        Test that a stratified sample estimates the mean rating of every row, not of every company.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            sample = sampling.sample_data(self.file_path, per_company=10, seed=2)
+            full = sampling.sample_data(self.file_path, size=1000)
+        table = sampling.summarize_sample(sample, columns=['Company Score'])
+        row = table.loc[('Company Score', 'mean')]
+        self.assertLessEqual(row['ci_low'], full['Company Score'].mean())
+        self.assertGreaterEqual(row['ci_high'], full['Company Score'].mean())
+        self.assertLess(len(sampling.unweighted_view(sample).columns), len(sample.columns))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            sampling.reservoir_sample(self.file_path, size=0)
+        with self.assertRaises(ValueError):
+            sampling.stratified_sample(self.file_path, per_stratum=5, column='Missing')
+        with self.assertRaises(ValueError):
+            sampling.confidence_intervals(pd.Series([1.0, 2.0]), confidence=1.5)
+
+if __name__ == '__main__':
+    unittest.main()
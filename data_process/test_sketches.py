@@ -0,0 +1,149 @@
+import unittest
+import json
+import numpy as np
+import pandas as pd
+from sketches import (
+    RunningMoments,
+    QuantileSketch,
+    DistinctCountSketch,
+    TopKSketch,
+    SummaryStatistics
+)
+
+class TestSketches(unittest.TestCase):
+    """
+    This class contains unit tests for the sketches module.
+    Each sketch is checked against the exact pandas result within its stated error bound,
+    and merged sketches are checked against a sketch built over all values at once.
+    """
+
+    def setUp(self):
+        """
+        Generate reproducible numeric and categorical test data.
+        """
+        rng = np.random.default_rng(7)
+        self.values = rng.lognormal(mean=11.5, sigma=0.4, size=20000)
+        self.companies = pd.Series(rng.zipf(1.6, size=20000) % 3000).map(lambda x: f'Company {x}')
+
+    def test_running_moments_merge(self):
+        """
+        Test that merged moments match moments computed over all values at once.
+        """
+        values = np.array([1.0, 4.0, 2.5, 8.0, np.nan, 3.0])
+        moments = RunningMoments()
+        moments.update(values[:2])
+        moments.update(values[2:])
+        self.assertEqual(moments.count, 5)
+        self.assertAlmostEqual(moments.mean, np.nanmean(values))
+        self.assertAlmostEqual(moments.std, pd.Series(values).std())
+        self.assertEqual((moments.min, moments.max), (1.0, 8.0))
+
+    def test_quantile_sketch_error_bound(self):
+        """
+        Test that merged quantile estimates are within the relative accuracy of the true quantiles.
+        """
+        first, second = QuantileSketch(0.01), QuantileSketch(0.01)
+        first.update(self.values[:7000])
+        second.update(self.values[7000:])
+        sketch = first.merge(second)
+        ordered = np.sort(self.values)
+        for q in (0.01, 0.25, 0.5, 0.75, 0.99):
+            rank = q * (len(ordered) - 1)
+            low, high = ordered[int(np.floor(rank))], ordered[int(np.ceil(rank))]
+            estimate = sketch.quantile(q)
+            self.assertGreaterEqual(estimate, low * 0.99)
+            self.assertLessEqual(estimate, high * 1.01)
+
+    def test_quantile_sketch_signs(self):
+        """
+        Test that negative values and zeros are placed correctly.
+        """
+        sketch = QuantileSketch(0.01)
+        sketch.update([-10.0, 0.0, 0.0, 5.0, np.nan])
+        self.assertAlmostEqual(sketch.quantile(0), -10.0, delta=0.1)
+        self.assertEqual(sketch.quantile(0.5), 0.0)
+        self.assertAlmostEqual(sketch.quantile(1), 5.0, delta=0.05)
+        self.assertTrue(np.isnan(QuantileSketch().quantile(0.5)))
+
+    def test_distinct_count_sketch(self):
+        """
+        Test that the merged distinct count is within three standard errors of the exact count.
+        """
+        first, second = DistinctCountSketch(), DistinctCountSketch()
+        first.update(self.companies[:5000])
+        second.update(self.companies[5000:])
+        sketch = first.merge(second)
+        exact = self.companies.nunique()
+        self.assertLess(abs(sketch.estimate() - exact) / exact, 3 * sketch.standard_error)
+
+        large = DistinctCountSketch()
+        large.update(np.arange(200000))
+        self.assertLess(abs(large.estimate() - 200000) / 200000, 3 * large.standard_error)
+
+    def test_top_k_sketch(self):
+        """
+        Test that the most frequent values are found and their counts are within the error bound.
+        """
+        first, second = TopKSketch(32), TopKSketch(32)
+        first.update(self.companies[:12000])
+        second.update(self.companies[12000:])
+        sketch = first.merge(second)
+        exact = self.companies.value_counts()
+        value, count = sketch.top(1)[0]
+        self.assertEqual(value, exact.index[0])
+        self.assertLessEqual(count, exact.iloc[0])
+        self.assertGreaterEqual(count, exact.iloc[0] - sketch.max_error)
+
+    def test_summary_statistics_matches_describe(self):
+        """
+        Test that merged summary statistics match describe(include='all') within the error bounds.
+        """
+        df = pd.DataFrame({
+            'Company': self.companies,
+            'Average_Salary': self.values,
+            'Company Score': np.where(np.arange(20000) % 10 == 0, np.nan, np.round(self.values % 5, 1)),
+        })
+        statistics = SummaryStatistics().update(df.iloc[:9000]).merge(SummaryStatistics().update(df.iloc[9000:]))
+        summary = statistics.describe()
+        expected = df.describe(include='all')
+
+        self.assertEqual(list(summary.columns), list(expected.columns))
+        for column in ['Average_Salary', 'Company Score']:
+            for row in ['count', 'mean', 'std', 'min', 'max']:
+                self.assertAlmostEqual(summary.loc[row, column], expected.loc[row, column], places=6)
+        self.assertEqual(summary.loc['count', 'Company'], expected.loc['count', 'Company'])
+        self.assertEqual(summary.loc['top', 'Company'], expected.loc['top', 'Company'])
+        self.assertLess(abs(summary.loc['unique', 'Company'] - expected.loc['unique', 'Company']), 3 * 0.0082 * expected.loc['unique', 'Company'])
+        self.assertAlmostEqual(summary.loc['50%', 'Average_Salary'] / expected.loc['50%', 'Average_Salary'], 1, delta=0.011)
+
+    def test_summary_statistics_type_change(self):
+        """
+        Test that a column changing between numeric and text across chunks falls back to categorical statistics.
+        """
+        first = pd.DataFrame({'Job Title': [np.nan, np.nan], 'Rating': [1.0, 2.0]})
+        second = pd.DataFrame({'Job Title': ['SE', 'SE'], 'Rating': ['n/a', 'n/a']})
+        statistics = SummaryStatistics().update(first).update(second)
+        summary = statistics.describe()
+        self.assertEqual(statistics.numeric_columns, [])
+        self.assertEqual((summary.loc['count', 'Job Title'], summary.loc['top', 'Job Title']), (2.0, 'SE'))
+        self.assertEqual(summary.loc['count', 'Rating'], 4.0)
+
+        # An all-missing text chunk first, then numbers: the column stays numeric
+        numbers = SummaryStatistics().update(pd.DataFrame({'Score': pd.Series([None, None], dtype=object)}))
+        numbers.update(pd.DataFrame({'Score': [3.0, 5.0]}))
+        self.assertEqual(numbers.describe().loc['mean', 'Score'], 4.0)
+
+        merged = SummaryStatistics().update(first).merge(SummaryStatistics().update(second))
+        self.assertEqual(merged.describe().loc['count', 'Rating'], 4.0)
+
+    def test_summary_statistics_round_trip(self):
+        """
+        Test that statistics survive a JSON round trip unchanged.
+        """
+        df = pd.DataFrame({'Company': self.companies[:100], 'Average_Salary': self.values[:100]})
+        statistics = SummaryStatistics().update(df)
+        restored = SummaryStatistics.from_dict(json.loads(json.dumps(statistics.to_dict())))
+        pd.testing.assert_frame_equal(restored.describe(), statistics.describe())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+import json
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from unittest.mock import patch
+from data_processing import clean_data
+from salary_cube import SalaryCube
+from streaming import (
+    StreamingAggregates,
+    stream_process,
+    run_streaming
+)
+
+class TestStreaming(unittest.TestCase):
+    """
+    This class contains unit tests for the streaming module.
+    It checks that chunked processing produces the same output and statistics as the in-memory workflow.
+    """
+
+    def setUp(self):
+        """
+        Write a raw salary CSV to a temporary directory.
+        """
+        self.directory = tempfile.TemporaryDirectory()
+        self.input_file = os.path.join(self.directory.name, 'salaries.csv')
+        self.output_file = os.path.join(self.directory.name, 'processed.csv')
+        self.raw = pd.DataFrame({
+            'Company': ['A', 'B', 'A', 'C', 'B', 'A', 'C'],
+            'Company Score': [4.5, 3.9, 4.5, np.nan, 3.9, 4.5, 2.8],
+            'Location': ['Remote', 'Austin, TX', 'Remote', 'Boston, MA', 'Austin, TX', 'Remote', 'Boston, MA'],
+            'Salary': ['$50K - $100K', '$60K', 'Invalid', '$70K - $120K', '$80K - $90K', None, '$65K - $75K'],
+        })
+        self.raw.to_csv(self.input_file, index=False)
+
+    def tearDown(self):
+        """
+        Remove the temporary directory.
+        """
+        self.directory.cleanup()
+
+    def _expected(self):
+        """
+        Clean the whole raw file in memory, as the non-streaming workflow does.
+        """
+        with patch('data_processing.print'):
+            return clean_data(pd.read_csv(self.input_file))
+
+    def test_stream_process_output(self):
+        """
+        Test that the streamed output file matches the in-memory cleaned data.
+        """
+        with patch('data_processing.print'), patch('streaming.print'):
+            aggregates = stream_process(self.input_file, self.output_file, chunksize=2)
+        expected = self._expected().reset_index(drop=True)
+        pd.testing.assert_frame_equal(pd.read_csv(self.output_file), expected, check_dtype=False)
+        self.assertEqual(aggregates.rows, len(expected))
+
+    def test_stream_process_cube(self):
+        """
+        Test that the cube merged chunk by chunk answers queries like the cube of the in-memory data.
+        """
+        cube_file = os.path.join(self.directory.name, 'cube.json')
+        with patch('data_processing.print'), patch('streaming.print'):
+            stream_process(self.input_file, self.output_file, chunksize=2, cube_file=cube_file)
+        streamed, expected = SalaryCube.load(cube_file), SalaryCube.build(self._expected())
+        self.assertEqual(streamed.rows, expected.rows)
+        for company in ('A', 'B', 'C'):
+            self.assertEqual(streamed.query(company=company), expected.query(company=company))
+
+    def test_store_closed_on_error(self):
+        """
+        Test that the salary store is closed when a chunk fails mid-stream.
+        """
+        calls = []
+
+        def failing_clean(chunk, engine='pandas'):
+            calls.append(len(chunk))
+            if len(calls) == 2:
+                raise RuntimeError('bad chunk')
+            return clean_data(chunk, engine=engine)
+
+        with patch('streaming.clean_data', failing_clean), patch('streaming.SalaryStore.close') as mock_close, \
+                patch('data_processing.print'), patch('streaming.print'):
+            with self.assertRaises(RuntimeError):
+                stream_process(self.input_file, self.output_file, chunksize=2,
+                               db_path=os.path.join(self.directory.name, 'salaries.db'))
+        mock_close.assert_called_once()
+
+    def test_streamed_aggregates(self):
+        """
+        Test that the running aggregates match describe, corr and groupby on the full data.
+        """
+        aggregates = StreamingAggregates()
+        with patch('data_processing.print'), patch('streaming.print'):
+            stream_process(self.input_file, self.output_file, chunksize=3, aggregates=aggregates)
+        expected = self._expected()
+        numeric = expected.select_dtypes(include=[np.number])
+
+        rows = ['count', 'mean', 'std', 'min', 'max']
+        summary = aggregates.summary().loc[rows, numeric.columns].astype(float)
+        pd.testing.assert_frame_equal(summary, numeric.describe().loc[rows])
+        pd.testing.assert_frame_equal(aggregates.correlation(), numeric.corr())
+        pd.testing.assert_series_equal(aggregates.company_means(), expected.groupby('Company')['Average_Salary'].mean().sort_values(), check_names=False)
+        self.assertEqual(aggregates.salary_histogram()[1].sum(), len(expected))
+
+    def test_aggregates_round_trip(self):
+        """
+        Test that aggregates restored from their JSON form report the same statistics and keep updating.
+        """
+        aggregates = StreamingAggregates()
+        with patch('data_processing.print'), patch('streaming.print'):
+            stream_process(self.input_file, self.output_file, chunksize=3, aggregates=aggregates)
+        restored = StreamingAggregates.from_dict(json.loads(json.dumps(aggregates.to_dict())))
+        pd.testing.assert_frame_equal(restored.summary(), aggregates.summary())
+        pd.testing.assert_frame_equal(restored.correlation(), aggregates.correlation())
+        pd.testing.assert_series_equal(restored.company_means(), aggregates.company_means())
+        np.testing.assert_array_equal(restored.salary_histogram()[1], aggregates.salary_histogram()[1])
+
+        with patch('data_processing.print'):
+            restored.update(self._expected())
+        self.assertEqual(restored.rows, 2 * aggregates.rows)
+
+    @patch('streaming.plt.show')
+    def test_run_streaming(self, mock_show):
+        """
+        Test that the streaming workflow writes the output and draws its plots.
+        """
+        with patch('data_processing.print'), patch('streaming.print'):
+            run_streaming(self.input_file, self.output_file, chunksize=2)
+        self.assertTrue(os.path.isfile(self.output_file))
+        self.assertEqual(mock_show.call_count, 4)
+
+if __name__ == '__main__':
+    unittest.main()
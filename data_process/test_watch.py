@@ -0,0 +1,151 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import pandas as pd
+from data_processing import read_data
+from generate_salaries import generate_block
+from salary_cube import SalaryCube
+from watch import SalaryWatcher
+
+class TestWatch(unittest.TestCase):
+    """
+    This class contains unit tests for the watch module.
+    It checks that incremental refreshes give the same output and aggregates as processing the whole file.
+    """
+
+    def setUp(self):
+        """
+        Split the lines of a generated raw salary CSV, to be appended to the watched input bit by bit.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.directory, 'feed.csv')
+        self.output_file = os.path.join(self.directory, 'processed.csv')
+        self.cube_file = os.path.join(self.directory, 'cube.json')
+        self.lines = generate_block(0, 600, seed=4, companies=25).to_csv(index=False).splitlines(keepends=True)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _append(self, text):
+        with open(self.input_file, 'a', encoding='utf-8') as feed:
+            feed.write(text)
+
+    def _refresh(self):
+        """
+        Refresh with a new watcher, as a new process would.
+        """
+        with contextlib.redirect_stdout(io.StringIO()):
+            watcher = SalaryWatcher(self.input_file, self.output_file, cube_file=self.cube_file, chunksize=64)
+            return watcher, watcher.refresh()
+
+    def _assert_matches_full_run(self, watcher):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = read_data(self.input_file, clean=True)
+        written = pd.read_csv(io.StringIO(expected.to_csv(index=False)))
+        pd.testing.assert_frame_equal(pd.read_csv(self.output_file), written)
+        self.assertEqual(watcher.aggregates.rows, len(expected))
+        pd.testing.assert_series_equal(watcher.aggregates.company_means(),
+                                       expected.groupby('Company')['Average_Salary'].mean().sort_values(), check_names=False)
+        cube = SalaryCube.load(self.cube_file)
+        pd.testing.assert_frame_equal(cube.query(group_by='State'), SalaryCube.build(expected).query(group_by='State'))
+
+    def test_incremental_refreshes(self):
+        """
+        Test that appended rows are processed once, and that a partially written line waits for its end.
+        """
+        self._append(''.join(self.lines[:201]) + self.lines[201][:15])
+        _, new_rows = self._refresh()
+        self.assertEqual(new_rows, 200)
+
+        self._append(self.lines[201][15:] + ''.join(self.lines[202:401]))
+        watcher, new_rows = self._refresh()
+        self.assertEqual(new_rows, 200)
+        self.assertEqual(watcher.refresh(), 0)
+
+        self._append(''.join(self.lines[401:]))
+        watcher, new_rows = self._refresh()
+        self.assertEqual(new_rows, 200)
+        self.assertEqual(watcher.offset, os.path.getsize(self.input_file))
+        self._assert_matches_full_run(watcher)
+
+    def test_truncated_input_is_reprocessed(self):
+        """
+        Test that a truncated or replaced input is processed again from the start.
+        """
+        self._append(''.join(self.lines[:401]))
+        self._refresh()
+        with open(self.input_file, 'w', encoding='utf-8') as feed:
+            feed.write(''.join(self.lines[:1] + self.lines[301:401]))
+        watcher, new_rows = self._refresh()
+        self.assertEqual(new_rows, 100)
+        self._assert_matches_full_run(watcher)
+
+        # Same size, different first rows
+        with open(self.input_file, 'w', encoding='utf-8') as feed:
+            feed.write(''.join(self.lines[:1] + self.lines[201:301]))
+        watcher, new_rows = self._refresh()
+        self.assertEqual(new_rows, 100)
+        self._assert_matches_full_run(watcher)
+
+    def test_interrupted_refresh(self):
+        """
+        Test that output rows written after the last saved state are dropped before new rows are appended.
+        """
+        self._append(''.join(self.lines[:301]))
+        self._refresh()
+        with open(self.output_file, 'a', encoding='utf-8') as output:
+            output.write('partial,row\n')
+        self._append(''.join(self.lines[301:]))
+        watcher, _ = self._refresh()
+        self._assert_matches_full_run(watcher)
+        with open(watcher.state_file, encoding='utf-8') as state_file:
+            self.assertEqual(json.load(state_file)['output_bytes'], os.path.getsize(self.output_file))
+
+    def test_missing_output_is_rebuilt(self):
+        """
+        Test that a deleted output is rebuilt from the start of the input instead of failing.
+        """
+        self._append(''.join(self.lines[:301]))
+        self._refresh()
+        os.remove(self.output_file)
+        watcher, new_rows = self._refresh()
+        self.assertEqual(new_rows, 300)
+        self._assert_matches_full_run(watcher)
+
+    def test_shorter_output_is_rebuilt(self):
+        """
+        Test that an output shorter than recorded is rebuilt rather than padded with NUL bytes.
+        """
+        self._append(''.join(self.lines[:301]))
+        self._refresh()
+        with open(self.output_file, 'r+b') as output:
+            output.truncate(os.path.getsize(self.output_file) // 2)
+        self._append(''.join(self.lines[301:]))
+        watcher, new_rows = self._refresh()
+        self.assertEqual(new_rows, 600)
+        with open(self.output_file, 'rb') as output:
+            self.assertNotIn(b'\0', output.read())
+        self._assert_matches_full_run(watcher)
+
+    def test_missing_cube_is_rebuilt(self):
+        """
+        Test that a deleted cube is rebuilt from every processed row, not only the new ones.
+        """
+        self._append(''.join(self.lines[:301]))
+        self._refresh()
+        os.remove(self.cube_file)
+        self._append(''.join(self.lines[301:]))
+        watcher, new_rows = self._refresh()
+        self.assertEqual(new_rows, 600)
+        self._assert_matches_full_run(watcher)
+
+    def test_missing_input(self):
+        with self.assertRaises(FileNotFoundError):
+            self._refresh()
+
+if __name__ == '__main__':
+    unittest.main()
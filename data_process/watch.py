@@ -0,0 +1,277 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import time
+import pandas as pd
+from data_processing import clean_data
+from salary_cube import SalaryCube
+from streaming import DEFAULT_CHUNKSIZE, StreamingAggregates, print_streamed_summary
+
+# Bytes hashed at the start of the input, and just before the processed
+# offset, to notice a file that was replaced or rewritten in place
+FINGERPRINT_BYTES = 4096
+# Version of the state file layout; other versions are ignored
+STATE_FORMAT = 1
+# Default seconds between two refreshes
+DEFAULT_INTERVAL = 5.0
+
+def default_state_file(output_file):
+    """
+    Returns the state file kept next to the processed output, e.g. 'processed.csv.watch.json'.
+    """
+    return f'{output_file}.watch.json'
+
+def _fingerprint(source, start, end):
+    source.seek(start)
+    return hashlib.blake2b(source.read(end - start), digest_size=16).hexdigest()
+
+class _Region(io.RawIOBase):
+    """
+    A read-only view of the bytes `start` to `end` of an open binary file, for `pd.read_csv`.
+    """
+
+    def __init__(self, source, start, end):
+        self.source = source
+        self.position = start
+        self.end = end
+
+    def readable(self):
+        return True
+
+    def readinto(self, buffer):
+        self.source.seek(self.position)
+        data = self.source.read(min(len(buffer), self.end - self.position))
+        buffer[:len(data)] = data
+        self.position += len(data)
+        return len(data)
+
+class SalaryWatcher:
+    """
+    Incrementally processes an append-only raw salary CSV.
+
+    Each refresh parses and cleans only the complete lines appended since the
+    previous one, appends them to the processed CSV, and merges them into the
+    streaming aggregates and the salary cube. The byte offset, the header and
+    the aggregates are kept in a JSON state file, so a refresh in a new
+    process costs as much as the new rows, not the whole file.
+
+    A file that shrank, or whose first bytes or the bytes before the offset
+    changed, was truncated or replaced, and is processed again from the start.
+    So is the input when the processed CSV was deleted or is shorter than
+    recorded in the state, or when the salary cube file is missing.
+    """
+
+    def __init__(self, input_file, output_file, state_file=None, cube_file=None, chunksize=DEFAULT_CHUNKSIZE,
+                 engine='pandas'):
+        """
+        Args:
+            input_file (str): Path to the raw CSV file that grows.
+            output_file (str): Path of the processed CSV the cleaned rows are appended to.
+            state_file (str): Path of the JSON state; defaults to `<output_file>.watch.json`.
+            cube_file (str): Optional path where the salary cube is saved after every refresh.
+            chunksize (int): Number of new rows cleaned at a time.
+            engine (str): The DataFrame engine used to clean each chunk.
+        """
+        self.input_file = input_file
+        self.output_file = output_file
+        self.state_file = state_file or default_state_file(output_file)
+        self.cube_file = cube_file
+        self.chunksize = chunksize
+        self.engine = engine
+        self.reset()
+        self._load_state()
+
+    def reset(self):
+        """
+        Forgets all processed input, so the next refresh starts from the first row.
+        """
+        self.offset = 0
+        self.header = None
+        self.output_bytes = 0
+        self.head_fingerprint = None
+        self.tail_fingerprint = None
+        self.aggregates = StreamingAggregates()
+        self.cube = None
+
+    def _load_state(self):
+        if not os.path.isfile(self.state_file):
+            return
+        with open(self.state_file, encoding='utf-8') as state_file:
+            state = json.load(state_file)
+        if state.get('format') != STATE_FORMAT or state.get('input_file') != os.path.abspath(self.input_file):
+            print(f"Ignoring the watch state {self.state_file}, which belongs to another input.")
+            return
+        self.offset = state['offset']
+        self.header = state['header']
+        self.output_bytes = state['output_bytes']
+        self.head_fingerprint = state['head_fingerprint']
+        self.tail_fingerprint = state['tail_fingerprint']
+        self.aggregates = StreamingAggregates.from_dict(state['aggregates'])
+        if self.cube_file and os.path.isfile(self.cube_file) and self.aggregates.rows:
+            self.cube = SalaryCube.load(self.cube_file)
+
+    def save_state(self):
+        """
+        Writes the state file atomically.
+        """
+        state = {
+            'format': STATE_FORMAT,
+            'input_file': os.path.abspath(self.input_file),
+            'offset': self.offset,
+            'header': self.header,
+            'output_bytes': self.output_bytes,
+            'head_fingerprint': self.head_fingerprint,
+            'tail_fingerprint': self.tail_fingerprint,
+            'aggregates': self.aggregates.to_dict(),
+        }
+        temporary_path = f'{self.state_file}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as state_file:
+            state_file.write(json.dumps(state))
+        os.replace(temporary_path, self.state_file)
+
+    def _is_unchanged(self, source, size):
+        """
+        Checks that the bytes processed so far are still at the start of the input.
+        """
+        if self.header is None:
+            return True
+        if size < self.offset:
+            return False
+        head_end = min(FINGERPRINT_BYTES, self.offset)
+        tail_start = max(self.offset - FINGERPRINT_BYTES, 0)
+        return (_fingerprint(source, 0, head_end) == self.head_fingerprint
+                and _fingerprint(source, tail_start, self.offset) == self.tail_fingerprint)
+
+    def _read_header(self, source):
+        source.seek(0)
+        line = source.readline()
+        if not line.endswith(b'\n'):
+            return False
+        self.header = next(csv.reader([line.decode('utf-8-sig')]))
+        self.offset = len(line)
+        return True
+
+    def _append(self, cleaned):
+        """
+        Appends cleaned rows to the output and the aggregates.
+        """
+        first = self.output_bytes == 0
+        cleaned.to_csv(self.output_file, mode='w' if first else 'a', header=first, index=False)
+        self.output_bytes = os.path.getsize(self.output_file)
+        self.aggregates.update(cleaned)
+        if len(cleaned):
+            chunk_cube = SalaryCube.build(cleaned)
+            self.cube = chunk_cube if self.cube is None else self.cube.merge(chunk_cube)
+
+    def refresh(self):
+        """
+        Processes the rows appended since the last refresh.
+
+        A partially written last line is left for the next refresh.
+
+        Returns:
+            int: The number of new raw rows read.
+        """
+        if not os.path.isfile(self.input_file):
+            raise FileNotFoundError(f"Error: The file '{self.input_file}' does not exist.")
+        new_rows = 0
+        output_size = os.path.getsize(self.output_file) if os.path.isfile(self.output_file) else 0
+        if output_size < self.output_bytes:
+            print(f"{self.output_file} is missing or shorter than recorded; processing {self.input_file} again from the start.")
+            self.reset()
+        elif self.cube_file and self.cube is None and self.aggregates.rows:
+            # The cube must cover the rows processed before, not only the new ones
+            print(f"{self.cube_file} is missing; processing {self.input_file} again from the start.")
+            self.reset()
+        with open(self.input_file, 'rb') as source:
+            size = os.fstat(source.fileno()).st_size
+            if not self._is_unchanged(source, size):
+                print(f"{self.input_file} was truncated or replaced; processing it again from the start.")
+                self.reset()
+            if self.header is None and not self._read_header(source):
+                return 0
+
+            # Only complete lines are read
+            end = size
+            while end > self.offset:
+                start = max(end - 65536, self.offset)
+                source.seek(start)
+                newline = source.read(end - start).rfind(b'\n')
+                if newline >= 0:
+                    end = start + newline + 1
+                    break
+                end = start
+            if end <= self.offset:
+                return 0
+
+            # Drop output rows appended after the last saved state, e.g. by an interrupted refresh
+            if self.output_bytes and os.path.getsize(self.output_file) > self.output_bytes:
+                with open(self.output_file, 'r+b') as output:
+                    output.truncate(self.output_bytes)
+
+            region = io.BufferedReader(_Region(source, self.offset, end))
+            for chunk in pd.read_csv(region, header=None, names=self.header, chunksize=self.chunksize):
+                new_rows += len(chunk)
+                self._append(clean_data(chunk, engine=self.engine))
+
+            self.head_fingerprint = _fingerprint(source, 0, min(FINGERPRINT_BYTES, end))
+            self.tail_fingerprint = _fingerprint(source, max(end - FINGERPRINT_BYTES, 0), end)
+            self.offset = end
+
+        if self.cube_file and self.cube is not None:
+            self.cube.save(self.cube_file)
+        self.save_state()
+        return new_rows
+
+    def watch(self, interval=DEFAULT_INTERVAL, iterations=None, summary=True):
+        """
+        Refreshes every `interval` seconds until interrupted.
+
+        Args:
+            interval (float): Seconds between two refreshes.
+            iterations (int): Number of refreshes before returning; None runs until Ctrl+C.
+            summary (bool): Whether to print the summary statistics after a refresh that found new rows.
+
+        Returns:
+            StreamingAggregates: The aggregates over all processed rows.
+        """
+        done = 0
+        try:
+            while iterations is None or done < iterations:
+                start = time.perf_counter()
+                new_rows = self.refresh()
+                done += 1
+                if new_rows:
+                    print(f"{new_rows} new rows processed in {time.perf_counter() - start:.2f}s "
+                          f"({self.aggregates.rows} cleaned rows in {self.output_file})")
+                    if summary:
+                        print_streamed_summary(self.aggregates)
+                if iterations is None or done < iterations:
+                    time.sleep(interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
+        return self.aggregates
+
+def run_watch(input_file, output_file, cube_file=None, chunksize=DEFAULT_CHUNKSIZE, engine='pandas',
+              interval=DEFAULT_INTERVAL, iterations=None):
+    """
+    Runs the salary workflow in watch mode: the input is processed
+    incrementally as rows are appended to it.
+
+    Args:
+        input_file (str): Path to the raw CSV file that grows.
+        output_file (str): Path of the processed CSV.
+        cube_file (str): Optional path of the salary cube kept up to date.
+        chunksize (int): Number of new rows cleaned at a time.
+        engine (str): The DataFrame engine used to clean each chunk.
+        interval (float): Seconds between two refreshes.
+        iterations (int): Number of refreshes; None runs until Ctrl+C.
+
+    Returns:
+        StreamingAggregates: The aggregates over all processed rows.
+    """
+    watcher = SalaryWatcher(input_file, output_file, cube_file=cube_file, chunksize=chunksize, engine=engine)
+    print(f"Watching {input_file} every {interval}s (state in {watcher.state_file}); press Ctrl+C to stop.")
+    return watcher.watch(interval=interval, iterations=iterations)
@@ -0,0 +1,49 @@
+import importlib.machinery
+import importlib.util
+import sys
+
+def lazy_import(name):
+    """
+    Returns a module that is only executed when one of its attributes is first used.
+
+    Plotting libraries take most of the start-up time of the workflow scripts,
+    and scraping only needs pandas to build the final DataFrame, so these are
+    imported this way and a run that never uses them never loads them.
+    Already imported modules are returned as they are.
+
+    This module is shared by the data_process and web_scraping scripts,
+    which put the repository root on sys.path to import it.
+
+    Args:
+        name (str): The module name, e.g. 'matplotlib.pyplot'.
+
+    Returns:
+        module: The (possibly not yet executed) module.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+
+    parent_name, _, child_name = name.rpartition('.')
+    if parent_name:
+        parent = lazy_import(parent_name)
+    spec = _find_spec(name)
+    if spec is None:
+        raise ImportError(f"Error: The module '{name}' is not installed.", name=name)
+
+    spec.loader = importlib.util.LazyLoader(spec.loader)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    if parent_name:
+        setattr(parent, child_name, module)
+    return module
+
+def _find_spec(name):
+    """
+    Finds the spec of a module on sys.path without executing its parent packages.
+    """
+    parent_name = name.rpartition('.')[0]
+    if not parent_name:
+        return importlib.machinery.PathFinder.find_spec(name)
+    parent_spec = _find_spec(parent_name)
+    return parent_spec and importlib.machinery.PathFinder.find_spec(name, parent_spec.submodule_search_locations)
@@ -0,0 +1,326 @@
+"""
+Background writing of the workflow outputs.
+
+`OutputWriter` hands CSV formatting, compression and disk writes to a
+background thread fed through a bounded queue, so the next chunk is cleaned
+(or the salary cube built) while the previous one is being written. When the
+disk falls behind, the queue fills up and the producer waits, so at most
+`queue_size` batches are held in memory.
+
+    with OutputWriter() as writer:
+        for chunk in chunks:
+            writer.append(clean_data(chunk), 'processed.csv.gz')
+    writer.report()
+
+Every output is written to '<path>.tmp' and renamed over the path only once
+it is complete, so readers never see a half-written file, and a failed run
+leaves the previous output in place. Paths ending in '.gz' are written
+gzip-compressed and paths ending in '.zst' zstd-compressed; zstd needs the
+optional `zstandard` package.
+
+The save functions of the workflows (`scrape_books.save_data`,
+`data_processing.save_processed_data`, `process_books.save_cleaned_data`)
+and `streaming.stream_process` take the writer as their `writer` argument.
+"""
+import gzip
+import os
+import queue
+import threading
+import time
+
+# Batches waiting to be written before `append` blocks
+DEFAULT_QUEUE_SIZE = 8
+# Retries of a rename refused with PermissionError, e.g. while the output is open in Excel on Windows
+DEFAULT_RETRIES = 3
+DEFAULT_RETRY_DELAY = 2.0
+# Compression used for an output, by file extension
+COMPRESSIONS = {'.gz': 'gzip', '.zst': 'zstd'}
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+# Put on the queue by `close` to stop the writer thread
+_STOP = object()
+
+def infer_compression(file_path):
+    """
+    Returns the compression of an output from its extension: 'gzip', 'zstd' or None.
+    """
+    return COMPRESSIONS.get(os.path.splitext(file_path)[1].lower())
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError("Error: zstd compression needs the 'zstandard' package (pip install zstandard).")
+    return zstandard
+
+def open_compressed(raw, compression):
+    """
+    Wraps a binary file in a streaming compressor.
+
+    Args:
+        raw (file): The binary file the compressed bytes are written to.
+        compression (str): 'gzip', 'zstd' or None for no compression.
+
+    Returns:
+        file: A binary file object; closing it finishes the compressed stream.
+    """
+    if compression is None:
+        return raw
+    if compression == 'gzip':
+        # A fixed mtime keeps the output identical for identical data
+        return gzip.GzipFile(fileobj=raw, mode='wb', compresslevel=GZIP_LEVEL, mtime=0)
+    if compression == 'zstd':
+        return _zstandard().ZstdCompressor(level=ZSTD_LEVEL).stream_writer(raw)
+    raise ValueError(f"Error: Unknown compression '{compression}'. Choose one of {sorted(set(COMPRESSIONS.values()))}.")
+
+class _Target:
+    """
+    An output being written: its temporary file and compressed stream.
+    """
+
+    def __init__(self, file_path, compression):
+        self.file_path = file_path
+        self.temporary_path = f'{file_path}.tmp'
+        self.raw = open(self.temporary_path, 'wb')
+        self.stream = open_compressed(self.raw, compression)
+        self.header_written = False
+
+    def close(self):
+        self.stream.close()
+        if not self.raw.closed:
+            self.raw.close()
+
+    def discard(self):
+        self.close()
+        if os.path.exists(self.temporary_path):
+            os.remove(self.temporary_path)
+
+class OutputWriter:
+    """
+    Writes DataFrames to CSV files in a background thread.
+
+    `append` queues a batch of rows for an output; the first batch writes the
+    header. `finish` (or `close`) completes the output and renames it into
+    place. The frames are formatted in the writer thread, so they must not be
+    modified after they are queued.
+
+    An error in the writer thread abandons the output it happened on and is
+    raised by the next `flush` or `close`.
+    """
+
+    def __init__(self, queue_size=DEFAULT_QUEUE_SIZE, retries=DEFAULT_RETRIES, retry_delay=DEFAULT_RETRY_DELAY):
+        """
+        Args:
+            queue_size (int): Batches waiting to be written before `append` blocks.
+            retries (int): Retries of a rename refused with PermissionError.
+            retry_delay (float): Seconds between two retries.
+        """
+        if queue_size < 1:
+            raise ValueError("Error: The queue size must be at least 1.")
+        self.queue_size = queue_size
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._queue = queue.Queue(maxsize=queue_size)
+        # Outputs with queued batches, by path, as seen from the caller
+        self._open = set()
+        # Outputs being written, by path, as seen from the writer thread
+        self._targets = {}
+        self._failed = set()
+        self._error = None
+        self._closed = False
+
+        self.files = 0
+        self.batches = 0
+        self.rows = 0
+        self.bytes_in = 0
+        self.bytes_written = 0
+        self.write_seconds = 0.0
+        self.blocked_seconds = 0.0
+        self.max_queue_depth = 0
+        self._started = time.perf_counter()
+        self._elapsed = None
+
+        self._thread = threading.Thread(target=self._run, name='output-writer', daemon=True)
+        self._thread.start()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # After an error the outputs are discarded, leaving the previous files in place
+        self.close(discard=exc_type is not None)
+        return False
+
+    def _put(self, job):
+        start = time.perf_counter()
+        self._queue.put(job)
+        self.blocked_seconds += time.perf_counter() - start
+        self.max_queue_depth = max(self.max_queue_depth, self._queue.qsize())
+
+    def append(self, df, file_path):
+        """
+        Queues rows to be appended to an output, blocking while the queue is full.
+
+        Args:
+            df (pd.DataFrame): The rows; the first batch of an output also writes its header.
+            file_path (str): The output; '.gz' and '.zst' paths are compressed.
+        """
+        if self._closed:
+            raise ValueError("Error: The output writer is closed.")
+        if file_path not in self._open:
+            if infer_compression(file_path) == 'zstd':
+                # Fails here rather than in the writer thread when zstandard is missing
+                _zstandard()
+            self._open.add(file_path)
+        self._put(('append', file_path, df))
+
+    def finish(self, file_path):
+        """
+        Queues the completion of an output: its temporary file is closed and renamed over `file_path`.
+        """
+        if file_path in self._open:
+            self._open.discard(file_path)
+            self._put(('finish', file_path, None))
+
+    def write(self, df, file_path):
+        """
+        Queues a complete output, replacing `file_path` once written.
+        """
+        self.append(df, file_path)
+        self.finish(file_path)
+
+    def flush(self):
+        """
+        Waits until every queued batch is written, then raises the first error of the writer thread.
+        """
+        self._queue.join()
+        self._raise_error()
+
+    def close(self, discard=False):
+        """
+        Finishes every output, stops the writer thread and raises its first error.
+
+        Args:
+            discard (bool): Remove the unfinished outputs instead of renaming them into place.
+        """
+        if self._closed:
+            return
+        if not discard:
+            for file_path in list(self._open):
+                self.finish(file_path)
+        self._open.clear()
+        self._closed = True
+        self._put(_STOP)
+        self._thread.join()
+        for target in self._targets.values():
+            target.discard()
+        self._targets.clear()
+        self._elapsed = time.perf_counter() - self._started
+        self._raise_error()
+
+    def _raise_error(self):
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                if job is _STOP:
+                    return
+                action, file_path, df = job
+                if file_path in self._failed:
+                    if action == 'finish':
+                        self._failed.discard(file_path)
+                    continue
+                start = time.perf_counter()
+                try:
+                    if action == 'append':
+                        self._write_batch(df, file_path)
+                    else:
+                        self._finish_target(file_path)
+                except Exception as e:
+                    if self._error is None:
+                        self._error = e
+                    target = self._targets.pop(file_path, None)
+                    if target is not None:
+                        target.discard()
+                    if action == 'append':
+                        self._failed.add(file_path)
+                self.write_seconds += time.perf_counter() - start
+            finally:
+                self._queue.task_done()
+
+    def _write_batch(self, df, file_path):
+        target = self._targets.get(file_path)
+        if target is None:
+            target = self._targets[file_path] = _Target(file_path, infer_compression(file_path))
+        data = df.to_csv(index=False, header=not target.header_written).encode('utf-8')
+        target.stream.write(data)
+        target.header_written = True
+        self.batches += 1
+        self.rows += len(df)
+        self.bytes_in += len(data)
+
+    def _finish_target(self, file_path):
+        target = self._targets[file_path]
+        target.close()
+        size = os.path.getsize(target.temporary_path)
+        for attempt in range(self.retries + 1):
+            try:
+                os.replace(target.temporary_path, file_path)
+                break
+            except PermissionError:
+                if attempt == self.retries:
+                    raise
+                print(f"PermissionError: Could not replace {file_path}. Retrying in {self.retry_delay} seconds...")
+                time.sleep(self.retry_delay)
+        del self._targets[file_path]
+        self.files += 1
+        self.bytes_written += size
+
+    @property
+    def queue_depth(self):
+        """
+        The number of jobs waiting in the queue.
+        """
+        return self._queue.qsize()
+
+    def stats(self):
+        """
+        Returns the counters of the writer.
+
+        Returns:
+            dict: Files completed, batches and rows written, CSV bytes formatted
+            ('bytes_in'), bytes on disk after compression ('bytes_written'),
+            seconds spent writing, write throughput in MB/s of CSV, seconds
+            producers waited on a full queue, and the queue depth.
+        """
+        return {
+            'files': self.files,
+            'batches': self.batches,
+            'rows': self.rows,
+            'bytes_in': self.bytes_in,
+            'bytes_written': self.bytes_written,
+            'write_seconds': round(self.write_seconds, 6),
+            'throughput_mb_s': round(self.bytes_in / 2**20 / self.write_seconds, 1) if self.write_seconds > 0 else None,
+            'blocked_seconds': round(self.blocked_seconds, 6),
+            'elapsed_seconds': round(self._elapsed if self._elapsed is not None else time.perf_counter() - self._started, 6),
+            'queue_size': self.queue_size,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+        }
+
+    def report(self):
+        """
+        Prints the throughput, bytes written and queue depth of the writer.
+        """
+        stats = self.stats()
+        throughput = f"{stats['throughput_mb_s']} MB/s" if stats['throughput_mb_s'] is not None else 'n/a'
+        print(f"\nBackground writer: {stats['rows']} rows in {stats['batches']} batches to {stats['files']} files")
+        print(f"  {stats['bytes_in'] / 2**20:.2f} MB of CSV written as {stats['bytes_written'] / 2**20:.2f} MB "
+              f"in {stats['write_seconds']:.2f}s ({throughput})")
+        print(f"  Queue depth peaked at {stats['max_queue_depth']} of {stats['queue_size']}; "
+              f"producers waited {stats['blocked_seconds']:.2f}s for the writer")
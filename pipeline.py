@@ -0,0 +1,489 @@
+"""
+A small stage runner for the salary and books workflows.
+
+Each workflow is declared as a DAG of stages that call the existing
+functions of `data_processing.py` and `process_books.py`. A stage's output
+is cached under a fingerprint of its code, parameters, input files and
+upstream fingerprints, so a re-run only executes the stages whose
+fingerprint changed. Independent stages run concurrently in a process pool.
+
+Fingerprints are computed from the source files with `ast`, without
+importing the stage modules, so a run where every stage is fresh does not
+pay for importing pandas or matplotlib.
+"""
+import argparse
+import ast
+import hashlib
+import importlib
+import importlib.util
+import json
+import os
+import pickle
+import sys
+import sysconfig
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+for _directory in ('data_process', 'web_scraping'):
+    _path = os.path.join(REPO_DIR, _directory)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+DEFAULT_CACHE_DIR = '.pipeline_cache'
+DEFAULT_PLOT_DIR = 'plots'
+
+# Installed libraries are not fingerprinted, only the project's own modules
+_LIBRARY_DIRS = tuple(os.path.abspath(sysconfig.get_paths()[key]) for key in ('stdlib', 'platstdlib', 'purelib', 'platlib'))
+
+class Stage:
+    """
+    One step of a pipeline.
+
+    Attributes:
+        name (str): Unique name of the stage.
+        func (str): The function to call, as 'module:function'.
+        inputs (list): Names of upstream stages; their outputs are passed as
+            positional arguments, in order.
+        params (dict): Keyword arguments passed to the function.
+        files (list): Input files whose size and modification time are part of the fingerprint.
+        outputs (list): Files the stage writes; the stage re-runs if any is missing.
+        figure (str): If set, every figure left open by the function is saved
+            to this path (with a numeric suffix when there are several).
+    """
+
+    def __init__(self, name, func, inputs=(), params=None, files=(), outputs=(), figure=None):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.params = dict(params or {})
+        self.files = list(files)
+        self.outputs = list(outputs)
+        self.figure = figure
+
+class _SourceIndex:
+    """
+    Hashes the source of functions and of the module-level definitions they
+    reference, following `from module import name` into other local modules.
+    A local module brought in with `import module` is hashed as a whole.
+    """
+
+    def __init__(self):
+        self._modules = {}
+        self._definitions = {}
+
+    def _module(self, module_name):
+        """
+        Parses a local module and indexes its top-level definitions and imports.
+
+        Returns:
+            dict: The definitions and imports, or None for non-local modules.
+        """
+        if module_name in self._modules:
+            return self._modules[module_name]
+        spec = importlib.util.find_spec(module_name)
+        origin = spec.origin if spec else None
+        if not origin or not origin.endswith('.py') or os.path.abspath(origin).startswith(_LIBRARY_DIRS):
+            self._modules[module_name] = None
+            return None
+
+        with open(origin, 'rb') as source_file:
+            source = source_file.read()
+        tree = ast.parse(source)
+        definitions, imports = {}, {}
+        for node in tree.body:
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+                definitions[node.name] = node
+            elif isinstance(node, (ast.Assign, ast.AnnAssign)):
+                targets = node.targets if isinstance(node, ast.Assign) else [node.target]
+                for target in targets:
+                    if isinstance(target, ast.Name):
+                        definitions[target.id] = node
+            elif isinstance(node, ast.ImportFrom) and node.module:
+                for alias in node.names:
+                    imports[alias.asname or alias.name] = (node.module, alias.name)
+            elif isinstance(node, ast.Import):
+                for alias in node.names:
+                    # A None name stands for the whole module
+                    imports[alias.asname or alias.name.partition('.')[0]] = (alias.name, None)
+        # Byte offset of every line, since the AST column offsets count UTF-8 bytes
+        line_starts = [0]
+        for line in source.splitlines(keepends=True):
+            line_starts.append(line_starts[-1] + len(line))
+        self._modules[module_name] = {'source': source, 'line_starts': line_starts, 'definitions': definitions,
+                                      'imports': imports}
+        return self._modules[module_name]
+
+    def _definition(self, module_name, name):
+        """
+        Returns the source bytes of a top-level definition and the (module, name) pairs it refers to.
+        """
+        key = (module_name, name)
+        if key not in self._definitions:
+            module = self._modules[module_name]
+            node = module['definitions'][name]
+            line_starts = module['line_starts']
+            segment = module['source'][line_starts[node.lineno - 1] + node.col_offset:
+                                       line_starts[node.end_lineno - 1] + node.end_col_offset]
+            dependencies = []
+            for child in ast.walk(node):
+                if isinstance(child, ast.Name):
+                    dependencies.append((module_name, child.id))
+                elif isinstance(child, ast.ImportFrom) and child.module:
+                    # Imports inside function bodies, e.g. optional modes
+                    dependencies.extend((child.module, alias.name) for alias in child.names)
+                elif isinstance(child, ast.Import):
+                    # e.g. `import polars_engine` in data_processing.load_engine
+                    dependencies.extend((alias.name, None) for alias in child.names)
+            self._definitions[key] = (segment, dependencies)
+        return self._definitions[key]
+
+    def fingerprint(self, module_name, name):
+        """
+        Returns a hash of a definition and everything local it depends on.
+
+        Args:
+            module_name (str): The module defining the name.
+            name (str): The function, class or constant.
+
+        Returns:
+            str: A hex digest.
+        """
+        digest = hashlib.sha256()
+        seen = set()
+        pending = [(module_name, name)]
+        while pending:
+            key = pending.pop()
+            if key in seen:
+                continue
+            seen.add(key)
+            module = self._module(key[0])
+            if module is None:
+                continue
+            if key[1] is None:
+                digest.update(f'{key[0]}\n'.encode())
+                digest.update(module['source'])
+                pending.extend((key[0], name) for name in module['definitions'])
+                continue
+            if key[1] in module['imports']:
+                pending.append(module['imports'][key[1]])
+                continue
+            if key[1] not in module['definitions']:
+                continue
+            segment, dependencies = self._definition(*key)
+            digest.update(f'{key[0]}:{key[1]}\n'.encode())
+            digest.update(segment)
+            pending.extend(dependencies)
+        return digest.hexdigest()
+
+def _file_signature(path):
+    """
+    Returns the identity of an input file used in fingerprints.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return [os.path.abspath(path), None, None]
+    return [os.path.abspath(path), stat.st_size, stat.st_mtime_ns]
+
+def _execute_stage(func, params, input_paths, output_path, figure):
+    """
+    Runs one stage. Executes in a worker process, loading its inputs from and
+    writing its output to the cache, so no DataFrames pass through the parent.
+
+    Returns:
+        list: The figure files written by the stage.
+    """
+    os.environ.setdefault('MPLBACKEND', 'Agg')
+    module_name, function_name = func.split(':')
+    function = getattr(importlib.import_module(module_name), function_name)
+
+    args = []
+    for path in input_paths:
+        with open(path, 'rb') as input_file:
+            args.append(pickle.load(input_file))
+
+    if figure:
+        import matplotlib.pyplot as plt
+        existing = set(plt.get_fignums())
+    result = function(*args, **params)
+
+    figures = []
+    if figure:
+        # Save only the figures opened by this stage
+        numbers = [number for number in plt.get_fignums() if number not in existing]
+        stem, extension = os.path.splitext(figure)
+        for position, number in enumerate(numbers, start=1):
+            path = figure if len(numbers) == 1 else f'{stem}_{position}{extension}'
+            os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+            plt.figure(number).savefig(path)
+            plt.close(number)
+            figures.append(path)
+
+    temporary_path = f'{output_path}.tmp{os.getpid()}'
+    with open(temporary_path, 'wb') as output_file:
+        pickle.dump(result, output_file, protocol=pickle.HIGHEST_PROTOCOL)
+    os.replace(temporary_path, output_path)
+    return figures
+
+class Pipeline:
+    """
+    A DAG of stages with fingerprint-based caching of their outputs.
+    """
+
+    def __init__(self, name, stages, cache_dir=DEFAULT_CACHE_DIR):
+        """
+        Args:
+            name (str): Name of the pipeline, used to namespace its cache entries.
+            stages (list): The stages, in any order.
+            cache_dir (str): Directory holding cached outputs and the manifest.
+        """
+        self.name = name
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_dir = cache_dir
+        for stage in stages:
+            missing = [upstream for upstream in stage.inputs if upstream not in self.stages]
+            if missing:
+                raise ValueError(f"Error: Stage '{stage.name}' depends on unknown stages {missing}.")
+        self.order = self._topological_order()
+
+    def _topological_order(self):
+        """
+        Returns the stage names ordered so that every stage follows its inputs.
+        """
+        order, state = [], {}
+
+        def visit(name):
+            if state.get(name) == 'done':
+                return
+            if state.get(name) == 'visiting':
+                raise ValueError(f"Error: The pipeline has a cycle through stage '{name}'.")
+            state[name] = 'visiting'
+            for upstream in self.stages[name].inputs:
+                visit(upstream)
+            state[name] = 'done'
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.cache_dir, f'{self.name}.json')
+
+    def _load_manifest(self):
+        try:
+            with open(self._manifest_path, encoding='utf-8') as manifest_file:
+                return json.load(manifest_file)
+        except (FileNotFoundError, ValueError):
+            return {}
+
+    def _save_manifest(self, manifest):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temporary_path = f'{self._manifest_path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as manifest_file:
+            json.dump(manifest, manifest_file, indent=2)
+        os.replace(temporary_path, self._manifest_path)
+
+    def _output_path(self, name, fingerprint):
+        return os.path.join(self.cache_dir, f'{self.name}.{name}.{fingerprint[:16]}.pkl')
+
+    def fingerprints(self):
+        """
+        Computes the fingerprint of every stage.
+
+        Returns:
+            dict: Stage name to hex digest.
+        """
+        sources = _SourceIndex()
+        fingerprints = {}
+        for name in self.order:
+            stage = self.stages[name]
+            payload = {
+                'func': stage.func,
+                'code': sources.fingerprint(*stage.func.split(':')),
+                'params': json.dumps(stage.params, sort_keys=True, default=repr),
+                'files': [_file_signature(path) for path in stage.files],
+                'outputs': stage.outputs,
+                'figure': stage.figure,
+                'inputs': [fingerprints[upstream] for upstream in stage.inputs],
+            }
+            fingerprints[name] = hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+        return fingerprints
+
+    def _is_fresh(self, name, fingerprint, manifest):
+        entry = manifest.get(name)
+        if not entry or entry['fingerprint'] != fingerprint:
+            return False
+        files = [entry['output']] + entry.get('figures', []) + self.stages[name].outputs
+        return all(os.path.exists(path) for path in files)
+
+    def load_output(self, name):
+        """
+        Loads the cached output of a stage from its latest run.
+
+        Args:
+            name (str): The stage name.
+
+        Returns:
+            object: The value returned by the stage function.
+        """
+        entry = self._load_manifest().get(name)
+        if entry is None:
+            raise KeyError(f"Error: Stage '{name}' has not run yet.")
+        with open(entry['output'], 'rb') as output_file:
+            return pickle.load(output_file)
+
+    def stale_stages(self):
+        """
+        Returns:
+            list: Names of the stages that would execute on the next run.
+        """
+        fingerprints, manifest = self.fingerprints(), self._load_manifest()
+        return [name for name in self.order if not self._is_fresh(name, fingerprints[name], manifest)]
+
+    def run(self, max_workers=None, force=False):
+        """
+        Executes the stale stages, concurrently where the DAG allows.
+
+        Args:
+            max_workers (int): Number of worker processes. 1 runs every stage in
+                this process, which is convenient for debugging.
+            force (bool): Whether to re-run every stage regardless of the cache.
+
+        Returns:
+            dict: Stage name to 'cached' or to the stage's run time in seconds.
+        """
+        fingerprints = self.fingerprints()
+        manifest = self._load_manifest()
+        status = {}
+        pending = []
+        for name in self.order:
+            if not force and self._is_fresh(name, fingerprints[name], manifest):
+                status[name] = 'cached'
+            else:
+                pending.append(name)
+        if not pending:
+            print(f"Pipeline '{self.name}': all {len(self.order)} stages are up to date.")
+            return status
+
+        # A stage re-runs when any upstream stage does, since its fingerprint includes theirs
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        def arguments(name):
+            stage = self.stages[name]
+            input_paths = [self._output_path(upstream, fingerprints[upstream]) for upstream in stage.inputs]
+            return (stage.func, stage.params, input_paths, self._output_path(name, fingerprints[name]), stage.figure)
+
+        def finish(name, figures, seconds):
+            previous = manifest.get(name)
+            output_path = self._output_path(name, fingerprints[name])
+            if previous and previous['output'] != output_path and os.path.exists(previous['output']):
+                os.remove(previous['output'])
+            manifest[name] = {'fingerprint': fingerprints[name], 'output': output_path, 'figures': figures}
+            self._save_manifest(manifest)
+            status[name] = seconds
+            print(f"Pipeline '{self.name}': stage '{name}' ran in {seconds:.2f}s")
+
+        remaining = set(pending)
+        if max_workers == 1:
+            for name in pending:
+                start = time.perf_counter()
+                figures = _execute_stage(*arguments(name))
+                finish(name, figures, time.perf_counter() - start)
+            return status
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            running, started = {}, {}
+            while remaining or running:
+                for name in [n for n in pending if n in remaining]:
+                    if all(upstream not in remaining and upstream not in running.values() for upstream in self.stages[name].inputs):
+                        remaining.discard(name)
+                        running[executor.submit(_execute_stage, *arguments(name))] = name
+                        started[name] = time.perf_counter()
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    finish(name, future.result(), time.perf_counter() - started[name])
+        return status
+
+def salary_pipeline(input_file='software_engineer_salaries.csv', output_file='processed_software_engineer_salaries.csv',
+                    plot_dir=DEFAULT_PLOT_DIR, top_n=30, cache_dir=DEFAULT_CACHE_DIR, cube_file='salary_cube.json'):
+    """
+    Declares the stages of `data_processing.main` as a pipeline.
+
+    Args:
+        input_file (str): Path to the raw salary CSV file.
+        output_file (str): Path where the processed CSV file will be saved.
+        cube_file (str): Path where the aggregate cube will be saved.
+        plot_dir (str): Directory where the plots are saved.
+        top_n (int): Number of companies drawn individually in the company plots.
+        cache_dir (str): Directory holding the stage cache.
+
+    Returns:
+        Pipeline: The salary pipeline.
+    """
+    def plot(name, top_n_param=False):
+        params = {'top_n': top_n} if top_n_param else {}
+        return Stage(name, f'data_processing:{name}', inputs=['clean'], params=params,
+                     figure=os.path.join(plot_dir, f'{name}.png'))
+
+    return Pipeline('salaries', [
+        Stage('read', 'data_processing:read_data', params={'file_path': input_file}, files=[input_file]),
+        Stage('clean', 'data_processing:clean_data', inputs=['read']),
+        Stage('stats', 'data_processing:calculate_summary_statistics', inputs=['clean']),
+        Stage('remote', 'data_processing:filter_data_by_location', inputs=['clean'], params={'location': 'Remote'}),
+        plot('plot_salary_distribution'),
+        plot('plot_salary_by_company', top_n_param=True),
+        plot('plot_salary_boxplot', top_n_param=True),
+        plot('plot_rating_distribution'),
+        plot('plot_salary_vs_rating', top_n_param=True),
+        plot('plot_heatmap_correlation'),
+        Stage('save', 'data_processing:save_processed_data', inputs=['clean'], params={'file_path': output_file}, outputs=[output_file]),
+        Stage('cube', 'salary_cube:build_salary_cube', inputs=['clean'], params={'file_path': cube_file}, outputs=[cube_file]),
+    ], cache_dir=cache_dir)
+
+def books_pipeline(input_file='books_with_scraped_info.csv', output_file='cleaned_books_data.csv',
+                   plot_dir=DEFAULT_PLOT_DIR, cache_dir=DEFAULT_CACHE_DIR):
+    """
+    Declares the stages of `process_books.main` as a pipeline.
+
+    Args:
+        input_file (str): Path to the scraped books CSV file.
+        output_file (str): Path where the cleaned CSV file will be saved.
+        plot_dir (str): Directory where the plots are saved.
+        cache_dir (str): Directory holding the stage cache.
+
+    Returns:
+        Pipeline: The books pipeline.
+    """
+    return Pipeline('books', [
+        Stage('load', 'process_books:load_data', params={'file_path': input_file}, files=[input_file]),
+        Stage('clean', 'process_books:clean_data', inputs=['load']),
+        Stage('analyze', 'process_books:analyze_data', inputs=['clean'], figure=os.path.join(plot_dir, 'books.png')),
+        # process_books.main saves the numeric ratings produced during the analysis
+        Stage('ratings', 'process_books:map_ratings', inputs=['clean']),
+        Stage('save', 'process_books:save_cleaned_data', inputs=['ratings'], params={'output_file_path': output_file}, outputs=[output_file]),
+    ], cache_dir=cache_dir)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run the salary and books workflows, re-executing only stale stages.')
+    # Checked after parsing: argparse rejects an empty list against `choices`
+    parser.add_argument('pipelines', nargs='*', metavar='{salaries,books}', help='pipelines to run (default: both)')
+    parser.add_argument('--workers', type=int, default=None, help='number of worker processes (1 runs in-process)')
+    parser.add_argument('--force', action='store_true', help='re-run every stage')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR)
+    parser.add_argument('--plot-dir', default=DEFAULT_PLOT_DIR)
+    args = parser.parse_args(argv)
+
+    builders = {'salaries': salary_pipeline, 'books': books_pipeline}
+    for name in args.pipelines:
+        if name not in builders:
+            parser.error(f"argument pipelines: invalid choice: '{name}' (choose from 'salaries', 'books')")
+    for name in args.pipelines or list(builders):
+        pipeline = builders[name](plot_dir=args.plot_dir, cache_dir=args.cache_dir)
+        pipeline.run(max_workers=args.workers, force=args.force)
+
+if __name__ == '__main__':
+    main()
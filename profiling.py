@@ -0,0 +1,350 @@
+"""
+Opt-in profiling of the workflow functions.
+
+`StageProfiler.instrument` replaces the public functions of the workflow
+modules (`read_data`, `clean_data`, `extract_salary`, `plot_*`, `save_*`,
+`load_data`, `scrape_books`, ...) with wrappers that record, per function,
+the number of calls, wall and CPU time, rows in and out, rows per second and
+peak allocated memory. `restore` puts the original functions back, so
+nothing is measured unless profiling was asked for.
+
+    with StageProfiler(sample_stage='clean_data') as profiler:
+        profiler.instrument(data_processing)
+        data_processing.main(plots=False)
+    profiler.write_report('run_report.json')
+    profiler.write_flamegraph('clean_data.folded')
+
+The flamegraph is written in the folded-stack format read by flamegraph.pl
+and speedscope, from a stdlib sampling profiler that runs only while the
+chosen stage is executing.
+
+Nested calls are tracked per thread, so stages run in a worker thread (e.g.
+the crawl of `books_pipeline`) are not counted as children of the stages of
+the main thread. tracemalloc has a single process-wide peak, so peak memory
+is only recorded for stages of the main thread, and includes what other
+threads allocated meanwhile. A generator function is timed while its
+iteration runs, not when the generator is created.
+"""
+import functools
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+# Functions called once per row; every call counts as one row in and out
+ROW_FUNCTIONS = {'extract_salary'}
+
+# Default interval between two stack samples, in seconds
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+# Returned by `next` once a profiled generator is exhausted
+_EXHAUSTED = object()
+
+def count_rows(value):
+    """
+    Returns the number of rows of a DataFrame, Series or array, or None for other values.
+
+    Args:
+        value: A function argument or result.
+
+    Returns:
+        int: The number of rows, or None.
+    """
+    if hasattr(value, 'shape') and getattr(value, 'ndim', 0) >= 1:
+        return len(value)
+    return None
+
+class StageStatistics:
+    """
+    Totals of every call to one profiled function.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.calls = 0
+        self.wall_seconds = 0.0
+        self.self_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rows_in = None
+        self.rows_out = None
+        self.peak_memory_bytes = None
+
+    def add_rows(self, rows_in, rows_out):
+        if rows_in is not None:
+            self.rows_in = (self.rows_in or 0) + rows_in
+        if rows_out is not None:
+            self.rows_out = (self.rows_out or 0) + rows_out
+
+    def to_dict(self):
+        rows = max(self.rows_in or 0, self.rows_out or 0)
+        return {
+            'name': self.name,
+            'calls': self.calls,
+            'wall_seconds': round(self.wall_seconds, 6),
+            'self_seconds': round(self.self_seconds, 6),
+            'cpu_seconds': round(self.cpu_seconds, 6),
+            'rows_in': self.rows_in,
+            'rows_out': self.rows_out,
+            'rows_per_second': round(rows / self.wall_seconds, 1) if rows and self.wall_seconds > 0 else None,
+            'peak_memory_mb': None if self.peak_memory_bytes is None else round(self.peak_memory_bytes / 2**20, 3),
+        }
+
+class StackSampler:
+    """
+    A sampling profiler built on `sys._current_frames`: a background thread
+    records the call stack of one thread at a fixed interval.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = {}
+        self._thread = None
+        self._stop = threading.Event()
+
+    def start(self, thread_id, root_code):
+        """
+        Starts sampling a thread.
+
+        Args:
+            thread_id (int): The thread to sample.
+            root_code (code): Code object of the sampled stage; frames above it are dropped.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(thread_id, root_code), daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self, thread_id, root_code):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f'{os.path.basename(code.co_filename)}:{code.co_name}')
+                if code is root_code:
+                    break
+                frame = frame.f_back
+            # Samples taken just before the stage is entered or after it returned are dropped
+            if frame is not None:
+                key = ';'.join(reversed(stack))
+                self.stacks[key] = self.stacks.get(key, 0) + 1
+
+    def folded(self):
+        """
+        Returns the samples as folded stacks: one 'outer;...;inner count' line per stack.
+        """
+        return [f'{stack} {count}' for stack, count in sorted(self.stacks.items())]
+
+class StageProfiler:
+    """
+    Records per-function statistics of the workflow modules.
+    """
+
+    def __init__(self, memory=True, sample_stage=None, sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        """
+        Args:
+            memory (bool): Whether to trace allocations with tracemalloc for the
+                peak memory of each function. Tracing slows the run down.
+            sample_stage (str): Function to sample for a flamegraph, e.g.
+                'clean_data' or 'data_processing.clean_data'.
+            sample_interval (float): Seconds between two stack samples.
+        """
+        self.memory = memory
+        self.sample_stage = sample_stage
+        self.sampler = StackSampler(sample_interval) if sample_stage else None
+        self.stages = {}
+        self._patched = []
+        # Each thread keeps its own stack of running stages
+        self._local = threading.local()
+        self._started_tracing = False
+        self.started = None
+        self.start_time = None
+        self.total_seconds = None
+
+    def __enter__(self):
+        self.started = datetime.now(timezone.utc).isoformat(timespec='seconds')
+        self.start_time = time.perf_counter()
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        return self
+
+    def __exit__(self, *exc_info):
+        self.restore()
+        self.total_seconds = time.perf_counter() - self.start_time
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+
+    def instrument(self, *modules):
+        """
+        Wraps the public functions defined in the given modules.
+
+        Functions one module imports from another instrumented module are
+        wrapped under their own name too, e.g. `streaming.clean_data`.
+        `main` is left alone, since it is what runs the stages.
+
+        Args:
+            *modules (module): The workflow modules.
+        """
+        names = {module.__name__ for module in modules}
+        for module in modules:
+            for attribute, function in list(vars(module).items()):
+                if (inspect.isfunction(function) and function.__module__ in names
+                        and not attribute.startswith('_') and attribute != 'main'):
+                    setattr(module, attribute, self._wrap(function))
+                    self._patched.append((module, attribute, function))
+
+    def restore(self):
+        """
+        Puts the original functions back.
+        """
+        for module, attribute, function in reversed(self._patched):
+            setattr(module, attribute, function)
+        self._patched = []
+
+    def _matches_sample_stage(self, function):
+        return self.sample_stage in (function.__name__, f'{function.__module__}.{function.__name__}')
+
+    @property
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def _run_stage(self, stage, sampled, code, call):
+        """
+        Runs `call()` as a step of a stage and adds its time and memory to the stage.
+
+        Args:
+            stage (StageStatistics): The stage the step belongs to.
+            sampled (bool): Whether the stage is the one sampled for the flamegraph.
+            code (code): Code object of the stage's function, the root of its samples.
+            call (callable): Runs the step.
+
+        Returns:
+            The result of `call`.
+        """
+        stack = self._stack
+        # A sampled stage that calls itself is sampled from the outermost call
+        sampling = sampled and not any(frame['sampled'] for frame in stack)
+        # The peak is process-wide, so it is only attributed along the main thread
+        memory = tracemalloc.is_tracing() and threading.current_thread() is threading.main_thread()
+        frame = {'children': 0.0, 'sampled': sampling, 'peak': 0, 'base': 0}
+        if memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                stack[-1]['peak'] = max(stack[-1]['peak'], peak)
+            tracemalloc.reset_peak()
+            frame['base'] = frame['peak'] = current
+        stack.append(frame)
+        if sampling:
+            self.sampler.start(threading.get_ident(), code)
+        wall, cpu = time.perf_counter(), time.process_time()
+        try:
+            return call()
+        finally:
+            wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+            if sampling:
+                self.sampler.stop()
+            stack.pop()
+            stage.wall_seconds += wall
+            stage.self_seconds += wall - frame['children']
+            stage.cpu_seconds += cpu
+            if stack:
+                stack[-1]['children'] += wall
+            if memory and tracemalloc.is_tracing():
+                frame['peak'] = max(frame['peak'], tracemalloc.get_traced_memory()[1])
+                stage.peak_memory_bytes = max(stage.peak_memory_bytes or 0, frame['peak'] - frame['base'])
+                if stack:
+                    stack[-1]['peak'] = max(stack[-1]['peak'], frame['peak'])
+
+    def _wrap(self, function):
+        name = f'{function.__module__}.{function.__name__}'
+        stage = self.stages.setdefault(name, StageStatistics(name))
+        per_row = function.__name__ in ROW_FUNCTIONS
+        sampled = self.sampler is not None and self._matches_sample_stage(function)
+        code = function.__code__
+
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator_wrapper(*args, **kwargs):
+                # Each step of the iteration is timed; the time the caller spends between steps is not
+                stage.calls += 1
+                first = args[0] if args else next(iter(kwargs.values()), None)
+                stage.add_rows(count_rows(first), None)
+                iterator = self._run_stage(stage, sampled, code, lambda: function(*args, **kwargs))
+                while True:
+                    item = self._run_stage(stage, sampled, code, lambda: next(iterator, _EXHAUSTED))
+                    if item is _EXHAUSTED:
+                        return
+                    stage.add_rows(None, count_rows(item))
+                    yield item
+
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            try:
+                result = self._run_stage(stage, sampled, code, lambda: function(*args, **kwargs))
+            finally:
+                stage.calls += 1
+            if per_row:
+                stage.add_rows(1, 1)
+            else:
+                first = args[0] if args else next(iter(kwargs.values()), None)
+                stage.add_rows(count_rows(first), count_rows(result))
+            return result
+
+        return wrapper
+
+    def report(self):
+        """
+        Returns the run report.
+
+        Returns:
+            dict: Run metadata and one entry per function that was called, in
+                order of total wall time. Times include nested profiled calls;
+                'self_seconds' excludes them.
+        """
+        stages = [stage.to_dict() for stage in self.stages.values() if stage.calls]
+        total_seconds = self.total_seconds if self.total_seconds is not None else time.perf_counter() - self.start_time
+        return {
+            'started': self.started,
+            'command': sys.argv,
+            'total_seconds': round(total_seconds, 6),
+            'memory_traced': self.memory,
+            'sample_stage': self.sample_stage,
+            'stages': sorted(stages, key=lambda stage: stage['wall_seconds'], reverse=True),
+        }
+
+    def write_report(self, file_path):
+        """
+        Writes the run report as JSON.
+
+        Args:
+            file_path (str): Path of the report file.
+        """
+        with open(file_path, 'w', encoding='utf-8') as report_file:
+            json.dump(self.report(), report_file, indent=2)
+        print(f"Profile report saved to {file_path}", file=sys.stderr)
+
+    def write_flamegraph(self, file_path):
+        """
+        Writes the samples of the sampled stage as folded stacks.
+
+        Args:
+            file_path (str): Path of the folded-stack file.
+        """
+        if self.sampler is None:
+            raise ValueError("Error: No stage was sampled. Pass sample_stage to StageProfiler.")
+        with open(file_path, 'w', encoding='utf-8') as folded_file:
+            folded_file.write('\n'.join(self.sampler.folded()) + '\n')
+        print(f"Flamegraph samples of {self.sample_stage} saved to {file_path}", file=sys.stderr)
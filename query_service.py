@@ -0,0 +1,299 @@
+"""
+A long-running local HTTP service over the cleaned salary and books data.
+
+    python query_service.py --port 8000
+    curl 'http://127.0.0.1:8000/salaries/filter?location=Remote&limit=5'
+
+The datasets are loaded and cleaned once at start-up and kept in memory,
+together with a location index and the salary cube, so a request costs a
+lookup or a small pandas operation instead of a process start and a CSV
+parse. Encoded responses are kept in an LRU cache keyed by endpoint and
+parameters, and requests are served concurrently, one thread each.
+
+Endpoints (all GET, all returning JSON):
+
+    /health
+    /salaries/summary                      describe(include='all') of the salaries
+    /salaries/filter?location=&limit=      rows whose Location matches, like filter_data_by_location
+    /salaries/companies?top_n=&box_stats=  per-company averages (aggregate_salary_by_company)
+    /salaries/cube?company=&state=&title=&title_contains=&group_by=
+                                           slices and roll-ups of the salary cube
+    /books/summary                         describe(include='all') of the books
+    /books/ratings                         count and price statistics per rating
+    /books/prices?bins=                    count and average rating per price range
+    /cache                                 LRU cache statistics
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+REPO_DIR = os.path.dirname(os.path.abspath(__file__))
+for _directory in ('data_process', 'web_scraping'):
+    _path = os.path.join(REPO_DIR, _directory)
+    if _path not in sys.path:
+        sys.path.insert(0, _path)
+
+# The workflow modules are found through the paths added above
+import pandas as pd
+import data_processing
+import process_books
+from location_index import build_location_index
+from salary_cube import SalaryCube
+
+DEFAULT_SALARIES = os.path.join(REPO_DIR, 'software_engineer_salaries.csv')
+DEFAULT_BOOKS = os.path.join(REPO_DIR, 'web_scraping', 'cleaned_books_data.csv')
+DEFAULT_CACHE_SIZE = 256
+# Rows returned by /salaries/filter unless a limit is given
+DEFAULT_LIMIT = 100
+
+class LRUCache:
+    """
+    A thread-safe least-recently-used cache with hit and miss counters.
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """
+        Returns the cached value of a key, or None.
+        """
+        with self._lock:
+            if key not in self._entries:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._entries), 'maxsize': self.maxsize, 'hits': self.hits, 'misses': self.misses}
+
+def frame_to_json(frame, orient='records'):
+    """
+    Converts a DataFrame or Series to JSON-compatible Python objects; NaN becomes null.
+    """
+    return json.loads(frame.to_json(orient=orient))
+
+def _int_param(params, name, default):
+    value = params.get(name, default)
+    try:
+        return None if value is None else int(value)
+    except ValueError:
+        raise ValueError(f"Error: '{name}' must be an integer, not '{value}'.")
+
+class DatasetService:
+    """
+    The in-memory datasets and the operations served over them.
+    """
+
+    def __init__(self, salaries_path=DEFAULT_SALARIES, books_path=DEFAULT_BOOKS, data_cache=False):
+        """
+        Loads and prepares the datasets. A dataset whose file is missing is
+        skipped, and its endpoints answer with an error.
+
+        Args:
+            salaries_path (str): Raw salary CSV; it is cleaned on load.
+            books_path (str): Cleaned books CSV (see `process_books.py`).
+            data_cache (bool): Whether to load the salaries through the columnar cache.
+        """
+        self.salaries = None
+        self.books = None
+        if salaries_path and os.path.isfile(salaries_path):
+            start = time.perf_counter()
+            # clean_data logs every salary it parses
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.salaries = data_processing.read_data(salaries_path, clean=True, cache=data_cache)
+            self.location_index = build_location_index(self.salaries)
+            self.cube = SalaryCube.build(self.salaries)
+            print(f"Loaded {len(self.salaries)} salary rows from {salaries_path} in {time.perf_counter() - start:.2f}s")
+        else:
+            print(f"Salary data not found at {salaries_path}; the /salaries endpoints are disabled.")
+        if books_path and os.path.isfile(books_path):
+            books = process_books.load_data(books_path)
+            if books['Rating'].dtype == object or pd.api.types.is_string_dtype(books['Rating']):
+                books = process_books.map_ratings(books)
+            self.books = books
+            print(f"Loaded {len(self.books)} books from {books_path}")
+        else:
+            print(f"Books data not found at {books_path}; the /books endpoints are disabled.")
+
+    def _require(self, name):
+        dataset = getattr(self, name)
+        if dataset is None:
+            raise LookupError(f"Error: The {name} dataset is not loaded.")
+        return dataset
+
+    def salary_summary(self, params):
+        summary = self._require('salaries').describe(include='all')
+        return frame_to_json(summary, orient='index')
+
+    def salary_filter(self, params):
+        df = self._require('salaries')
+        location = params.get('location')
+        if not location:
+            raise ValueError("Error: The 'location' parameter is required.")
+        limit = _int_param(params, 'limit', DEFAULT_LIMIT)
+        rows = data_processing.filter_data_by_location(df, location, index=self.location_index)
+        return {'count': len(rows), 'rows': frame_to_json(rows.head(limit))}
+
+    def salary_companies(self, params):
+        df = self._require('salaries')
+        top_n = _int_param(params, 'top_n', None)
+        box_stats = params.get('box_stats', 'false').lower() in ('1', 'true', 'yes')
+        aggregates = data_processing.aggregate_salary_by_company(df, top_n=top_n, box_stats=box_stats)
+        return frame_to_json(aggregates.reset_index())
+
+    def salary_cube(self, params):
+        self._require('salaries')
+        filters = {name: params[name] for name in ('company', 'state', 'title', 'title_contains') if name in params}
+        group_by = params['group_by'].split(',') if params.get('group_by') else None
+        result = self.cube.query(group_by=group_by, **filters)
+        if isinstance(result, pd.DataFrame):
+            return frame_to_json(result.reset_index())
+        return frame_to_json(pd.Series(result, dtype=float), orient='index')
+
+    def book_summary(self, params):
+        return frame_to_json(self._require('books').describe(include='all'), orient='index')
+
+    def book_ratings(self, params):
+        books = self._require('books')
+        breakdown = books.groupby('Rating')['Price'].agg(['count', 'mean', 'min', 'max'])
+        return frame_to_json(breakdown.reset_index())
+
+    def book_prices(self, params):
+        books = self._require('books')
+        bins = _int_param(params, 'bins', 5)
+        if bins < 1:
+            raise ValueError("Error: 'bins' must be at least 1.")
+        ranges = pd.cut(books['Price'], bins=bins)
+        breakdown = books.groupby(ranges, observed=False)['Rating'].agg(['count', 'mean'])
+        breakdown.index = [f'{interval.left:.2f}-{interval.right:.2f}' for interval in breakdown.index]
+        return frame_to_json(breakdown.rename_axis('Price').reset_index())
+
+# URL path -> DatasetService method
+ROUTES = {
+    '/salaries/summary': 'salary_summary',
+    '/salaries/filter': 'salary_filter',
+    '/salaries/companies': 'salary_companies',
+    '/salaries/cube': 'salary_cube',
+    '/books/summary': 'book_summary',
+    '/books/ratings': 'book_ratings',
+    '/books/prices': 'book_prices',
+}
+
+class QueryHandler(BaseHTTPRequestHandler):
+    """
+    Serves the JSON endpoints; the server sets `service`, `cache` and `quiet`.
+    """
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        if url.path == '/health':
+            return self._send(200, json.dumps({'status': 'ok'}).encode())
+        if url.path == '/cache':
+            return self._send(200, json.dumps(self.server.cache.stats()).encode())
+        if url.path not in ROUTES:
+            return self._send(404, self._error(f"Error: Unknown endpoint '{url.path}'."))
+
+        # Repeated parameters keep their last value; the key ignores their order
+        params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+        key = (url.path, tuple(sorted(params.items())))
+        body = self.server.cache.get(key)
+        if body is None:
+            try:
+                result = getattr(self.server.service, ROUTES[url.path])(params)
+            except LookupError as e:
+                return self._send(404, self._error(str(e)))
+            except (ValueError, TypeError) as e:
+                return self._send(400, self._error(str(e)))
+            except re.error as e:
+                return self._send(400, self._error(f"Error: Invalid regular expression: {e}."))
+            except Exception as e:
+                # Any other failure still gets a response instead of a dropped connection
+                self.log_error('%s failed: %r', url.path, e)
+                return self._send(500, self._error(f"Error: {type(e).__name__}: {e}"))
+            body = json.dumps(result).encode()
+            self.server.cache.put(key, body)
+        self._send(200, body)
+
+    @staticmethod
+    def _error(message):
+        return json.dumps({'error': message}).encode()
+
+    def _send(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        if not self.server.quiet:
+            super().log_message(format, *args)
+
+def create_server(service, host='127.0.0.1', port=8000, cache_size=DEFAULT_CACHE_SIZE, quiet=False):
+    """
+    Creates the threaded HTTP server; call `serve_forever` on it to start serving.
+
+    Args:
+        service (DatasetService): The loaded datasets.
+        host (str): Address to bind.
+        port (int): Port to bind; 0 picks a free port.
+        cache_size (int): Number of responses kept in the LRU cache.
+        quiet (bool): Whether to skip the per-request log lines.
+
+    Returns:
+        ThreadingHTTPServer: The server.
+    """
+    server = ThreadingHTTPServer((host, port), QueryHandler)
+    server.daemon_threads = True
+    server.service = service
+    server.cache = LRUCache(cache_size)
+    server.quiet = quiet
+    return server
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve the cleaned salary and books data over HTTP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--salaries', default=DEFAULT_SALARIES, help='raw salary CSV, cleaned on load')
+    parser.add_argument('--books', default=DEFAULT_BOOKS, help='cleaned books CSV')
+    parser.add_argument('--cache-size', type=int, default=DEFAULT_CACHE_SIZE, help='responses kept in the LRU cache')
+    parser.add_argument('--data-cache', action='store_true', help='load the salaries through the memory-mapped columnar cache')
+    parser.add_argument('--quiet', action='store_true', help='do not log every request')
+    args = parser.parse_args(argv)
+
+    service = DatasetService(args.salaries, args.books, data_cache=args.data_cache)
+    server = create_server(service, args.host, args.port, cache_size=args.cache_size, quiet=args.quiet)
+    print(f"Serving on http://{server.server_address[0]}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
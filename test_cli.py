@@ -0,0 +1,144 @@
+import unittest
+import importlib.util
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import pandas as pd
+from unittest.mock import patch
+from cli import build_parser, main, REPO_DIR
+from salary_cube import SalaryCube
+
+class TestCli(unittest.TestCase):
+    """
+    Unit tests for the command-line entry point in cli.py.
+    Start-up is checked in fresh interpreters, since the test process itself
+    has already imported every library.
+    """
+
+    def setUp(self):
+        """
+        Create a small raw salary file in a temporary directory.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.input_file = os.path.join(self.directory, 'salaries.csv')
+        pd.DataFrame({
+            'Company': ['A', 'B', 'A'], 'Company Score': [4.5, 3.9, 4.2], 'Job Title': ['SE', 'SE', 'Dev'],
+            'Location': ['Remote', 'Austin, TX', 'Remote'], 'Date': ['1d', '2d', '3d'],
+            'Salary': ['$50K - $100K', '$60K', '$70K - $80K'],
+        }).to_csv(self.input_file, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _run_cli(self, *args):
+        """
+        Run cli.py in a new interpreter and return the completed process.
+        """
+        return subprocess.run([sys.executable, os.path.join(REPO_DIR, 'cli.py'), '--import-times', *args],
+                              cwd=self.directory, capture_output=True, text=True, check=True)
+
+    def test_workflow_modules_defer_plotting_imports(self):
+        """
+        Test that importing the workflow modules does not load the plotting or scraping libraries.
+        """
+        code = ('import sys, data_processing, streaming, process_books, scrape_books; '
+                'print(sorted(m for m in ("matplotlib.figure", "seaborn.axisgrid", "pandas.core.frame") if m in sys.modules))')
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(os.path.join(REPO_DIR, d) for d in ('data_process', 'web_scraping')))
+        result = subprocess.run([sys.executable, '-c', code], env=env, capture_output=True, text=True, check=True)
+        # process_books and data_processing need pandas itself, but nothing plots on import
+        self.assertEqual(result.stdout.strip(), "['pandas.core.frame']")
+
+    def test_process_salaries_without_plots(self):
+        """
+        Test that process-salaries --no-plots writes its outputs without loading matplotlib.
+        """
+        result = self._run_cli('process-salaries', 'salaries.csv', '--output', 'processed.csv', '--cube-file', 'cube.json', '--no-plots')
+        self.assertEqual(pd.read_csv(os.path.join(self.directory, 'processed.csv'))['Average_Salary'].tolist(), [75000.0, 60000.0, 75000.0])
+        self.assertEqual(SalaryCube.load(os.path.join(self.directory, 'cube.json')).query(company='A')['count'], 2)
+        self.assertIn('Import times:', result.stderr)
+        self.assertIn('Never loaded: matplotlib, matplotlib.pyplot, seaborn, requests, bs4', result.stderr)
+
+    def test_stats(self):
+        """
+        Test that stats prints the summary statistics of the cleaned data.
+        """
+        result = self._run_cli('stats', 'salaries.csv', '--sketches')
+        self.assertIn('Summary Statistics', result.stdout)
+        self.assertIn('Average_Salary', result.stdout)
+        self.assertIn('Loaded while running: none', result.stderr)
+
+    def test_stats_sample(self):
+        """
+        Test that stats --sample prints the statistics of a sample with confidence intervals.
+        """
+        result = self._run_cli('stats', 'salaries.csv', '--sample', '2', '--seed', '1')
+        self.assertIn('sample of 2 of 3 rows', result.stdout)
+        self.assertIn('95% Confidence Intervals', result.stdout)
+
+    def test_sample_size_must_be_positive(self):
+        """
+        Test that --sample and --per-company below 1 are rejected instead of reading the whole input.
+        """
+        for option in ('--sample', '--per-company'):
+            for value in ('0', '-5'):
+                with self.assertRaises(SystemExit), patch('sys.stderr'):
+                    build_parser().parse_args(['stats', 'salaries.csv', option, value])
+        self.assertEqual(build_parser().parse_args(['plot', '--sample', '1']).sample, 1)
+
+    @unittest.skipUnless(importlib.util.find_spec('polars'), 'polars is not installed')
+    def test_stats_polars_engine(self):
+        """
+        Test that stats prints the same statistics with the polars engine.
+        """
+        expected = self._run_cli('stats', 'salaries.csv')
+        result = self._run_cli('stats', 'salaries.csv', '--engine', 'polars')
+        # The pandas engine also logs every parsed salary
+        summary = expected.stdout[expected.stdout.index('Summary Statistics'):]
+        self.assertEqual(result.stdout[result.stdout.index('Summary Statistics'):], summary)
+
+    def test_plot_to_directory(self):
+        """
+        Test that plot --output-dir saves one PNG file per requested plot.
+        """
+        plot_dir = os.path.join(self.directory, 'plots')
+        with patch('data_processing.print'), patch('builtins.print'):
+            main(['plot', self.input_file, '--output-dir', plot_dir, '--plots', 'salary_distribution', 'rating_distribution'])
+        self.assertEqual(sorted(os.listdir(plot_dir)), ['rating_distribution.png', 'salary_distribution.png'])
+
+    def test_process_salaries_background_write(self):
+        """
+        Test that --background-write streams a compressed output equal to the foreground one and reports the writer.
+        """
+        output_file = os.path.join(self.directory, 'processed.csv.gz')
+        with patch('data_processing.print'), patch('streaming.print'), patch('builtins.print') as mock_print:
+            main(['process-salaries', self.input_file, '--stream', '--chunksize', '2', '--no-plots',
+                  '--output', output_file, '--background-write'])
+        self.assertEqual(pd.read_csv(output_file)['Average_Salary'].tolist(), [75000.0, 60000.0, 75000.0])
+        self.assertFalse(os.path.exists(f'{output_file}.tmp'))
+        printed = ' '.join(str(call.args[0]) for call in mock_print.call_args_list if call.args)
+        self.assertIn('3 rows in 2 batches to 1 files', printed)
+
+    @patch('scrape_books.save_data')
+    @patch('scrape_books.scrape_books')
+    def test_scrape(self, mock_scrape, mock_save):
+        """
+        Test that scrape passes the URL, page count and output path to the scraper.
+        """
+        with patch('builtins.print'):
+            main(['scrape', '--pages', '2', '--output', 'books.csv'])
+        mock_scrape.assert_called_once_with('http://books.toscrape.com/catalogue/page-{}.html', 2)
+        mock_save.assert_called_once_with(mock_scrape.return_value, 'books.csv', writer=None)
+
+    @patch('books_pipeline.scrape_and_clean')
+    def test_scrape_process(self, mock_scrape_and_clean):
+        """
+        Test that scrape-process runs the combined pipeline with the given options.
+        """
+        main(['scrape-process', '--pages', '3', '--output', 'clean.csv', '--no-plots'])
+        mock_scrape_and_clean.assert_called_once_with('http://books.toscrape.com/catalogue/page-{}.html', 3,
+                                                      'clean.csv', plots=False, writer=None)
+
+if __name__ == '__main__':
+    unittest.main()
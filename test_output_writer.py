@@ -0,0 +1,144 @@
+import unittest
+import contextlib
+import gzip
+import io
+import os
+import shutil
+import tempfile
+import threading
+import pandas as pd
+from unittest.mock import patch
+from output_writer import OutputWriter, infer_compression
+# Importing cli puts data_process and web_scraping on the import path
+import cli
+import data_processing
+import process_books
+
+class TestOutputWriter(unittest.TestCase):
+    """
+    Unit tests for the background CSV writer in output_writer.py.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.df = pd.DataFrame({'Company': ['A', 'B, Inc.', 'C'], 'Salary': [1.5, None, 3.0]})
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_batched_appends(self):
+        """
+        Test that appended batches give the same file as one to_csv, with a single header and no temporary file left.
+        """
+        output_file = os.path.join(self.directory, 'out.csv')
+        expected_file = os.path.join(self.directory, 'expected.csv')
+        with OutputWriter(queue_size=1) as writer:
+            for start in range(3):
+                writer.append(self.df.iloc[start:start + 1], output_file)
+        self.df.to_csv(expected_file, index=False)
+        with open(output_file, 'rb') as output, open(expected_file, 'rb') as expected:
+            self.assertEqual(output.read(), expected.read())
+        self.assertEqual(sorted(os.listdir(self.directory)), ['expected.csv', 'out.csv'])
+
+        stats = writer.stats()
+        self.assertEqual((stats['files'], stats['batches'], stats['rows']), (1, 3, 3))
+        self.assertEqual(stats['bytes_written'], os.path.getsize(output_file))
+        self.assertEqual(stats['bytes_in'], stats['bytes_written'])
+        self.assertLessEqual(stats['max_queue_depth'], 1)
+
+    def test_gzip(self):
+        """
+        Test that a '.gz' output is streamed through gzip and reads back as the same data.
+        """
+        output_file = os.path.join(self.directory, 'out.csv.gz')
+        df = pd.concat([self.df] * 100, ignore_index=True)
+        with OutputWriter() as writer:
+            writer.append(df, output_file)
+            writer.append(df, output_file)
+        with gzip.open(output_file, 'rt', encoding='utf-8') as output:
+            self.assertEqual(output.read().count('Company'), 1)
+        pd.testing.assert_frame_equal(pd.read_csv(output_file), pd.concat([df, df], ignore_index=True))
+        self.assertLess(writer.stats()['bytes_written'], writer.stats()['bytes_in'])
+
+    def test_zstd_needs_zstandard(self):
+        """
+        Test that a '.zst' output is refused up front when the zstandard package is missing.
+        """
+        self.assertEqual(infer_compression('out.csv.zst'), 'zstd')
+        with patch.dict('sys.modules', {'zstandard': None}), OutputWriter() as writer:
+            with self.assertRaises(ValueError):
+                writer.write(self.df, os.path.join(self.directory, 'out.csv.zst'))
+
+    def test_output_replaced_only_when_complete(self):
+        """
+        Test that the previous output stays in place until the new one is finished, and after a failed run.
+        """
+        output_file = os.path.join(self.directory, 'out.csv')
+        self.df.to_csv(output_file, index=False)
+        with OutputWriter() as writer:
+            writer.append(self.df.head(1), output_file)
+            writer.flush()
+            self.assertEqual(len(pd.read_csv(output_file)), 3)
+            self.assertTrue(os.path.exists(f'{output_file}.tmp'))
+        self.assertEqual(len(pd.read_csv(output_file)), 1)
+
+        with self.assertRaises(RuntimeError):
+            with OutputWriter() as writer:
+                writer.append(self.df, output_file)
+                raise RuntimeError('interrupted')
+        self.assertEqual(len(pd.read_csv(output_file)), 1)
+        self.assertFalse(os.path.exists(f'{output_file}.tmp'))
+
+    def test_errors_are_raised_on_close(self):
+        """
+        Test that a failed write is raised by close, and the other outputs are still written.
+        """
+        missing_file = os.path.join(self.directory, 'missing', 'out.csv')
+        output_file = os.path.join(self.directory, 'out.csv')
+        writer = OutputWriter()
+        writer.write(self.df, missing_file)
+        writer.write(self.df, output_file)
+        with self.assertRaises(FileNotFoundError):
+            writer.close()
+        self.assertTrue(os.path.isfile(output_file))
+        with self.assertRaises(ValueError):
+            writer.append(self.df, output_file)
+
+    @patch('output_writer.time.sleep')
+    @patch('output_writer.os.replace', side_effect=PermissionError)
+    def test_locked_output_retries_are_bounded(self, mock_replace, mock_sleep):
+        """
+        Test that a rename refused with PermissionError is retried a bounded number of times.
+        """
+        output_file = os.path.join(self.directory, 'out.csv')
+        writer = OutputWriter(retries=2, retry_delay=0)
+        with contextlib.redirect_stdout(io.StringIO()):
+            writer.write(self.df, output_file)
+            with self.assertRaises(PermissionError):
+                writer.close()
+        self.assertEqual(mock_replace.call_count, 3)
+        self.assertFalse(os.path.exists(f'{output_file}.tmp'))
+
+    def test_save_functions_use_the_writer(self):
+        """
+        Test that the save functions write through the writer thread and give the same files as without it.
+        """
+        salary_file = os.path.join(self.directory, 'processed.csv')
+        books_file = os.path.join(self.directory, 'books.csv')
+        threads = []
+        original = OutputWriter._write_batch
+
+        def record_thread(writer, df, file_path):
+            threads.append(threading.current_thread().name)
+            return original(writer, df, file_path)
+
+        with patch.object(OutputWriter, '_write_batch', record_thread), contextlib.redirect_stdout(io.StringIO()):
+            with OutputWriter() as writer:
+                data_processing.save_processed_data(self.df, salary_file, writer=writer)
+                process_books.save_cleaned_data(self.df, books_file, writer=writer)
+        self.assertEqual(threads, ['output-writer', 'output-writer'])
+        for file_path in (salary_file, books_file):
+            pd.testing.assert_frame_equal(pd.read_csv(file_path), self.df)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,189 @@
+import unittest
+import os
+import sys
+import shutil
+import tempfile
+import time
+import pandas as pd
+from unittest.mock import patch
+from pipeline import Pipeline, Stage, main, salary_pipeline
+from salary_cube import SalaryCube
+
+TOY_STAGES = '''
+def load(path):
+    with open(path) as input_file:
+        return input_file.read()
+
+def shout(text, suffix=''):
+    return text.upper() + suffix
+
+def length(text):
+    return len(text)
+
+def combine(first, second):
+    return f'{first}:{second}'
+'''
+
+class TestPipeline(unittest.TestCase):
+    """
+    Unit tests for the stage runner in pipeline.py.
+    A toy module of stage functions is written to a temporary directory so that
+    code, parameter and input changes can be simulated.
+    """
+
+    def setUp(self):
+        """
+        Create the toy stage module, an input file and a cache directory.
+        """
+        self.directory = tempfile.mkdtemp()
+        self.module_path = os.path.join(self.directory, 'toy_pipeline_stages.py')
+        with open(self.module_path, 'w') as module_file:
+            module_file.write(TOY_STAGES)
+        sys.path.insert(0, self.directory)
+        self.input_file = os.path.join(self.directory, 'input.txt')
+        with open(self.input_file, 'w') as input_file:
+            input_file.write('hello')
+        self.cache_dir = os.path.join(self.directory, 'cache')
+
+    def tearDown(self):
+        """
+        Remove the temporary directory and the toy module.
+        """
+        sys.path.remove(self.directory)
+        sys.modules.pop('toy_pipeline_stages', None)
+        shutil.rmtree(self.directory)
+
+    def _pipeline(self, suffix='!'):
+        """
+        Build the toy pipeline: load -> (shout, length) -> combine.
+        """
+        return Pipeline('toy', [
+            Stage('load', 'toy_pipeline_stages:load', params={'path': self.input_file}, files=[self.input_file]),
+            Stage('shout', 'toy_pipeline_stages:shout', inputs=['load'], params={'suffix': suffix}),
+            Stage('length', 'toy_pipeline_stages:length', inputs=['load']),
+            Stage('combine', 'toy_pipeline_stages:combine', inputs=['shout', 'length']),
+        ], cache_dir=self.cache_dir)
+
+    def _run(self, pipeline, **kwargs):
+        """
+        Run a pipeline quietly and return the names of the stages that executed.
+        """
+        with patch('pipeline.print'):
+            status = pipeline.run(**kwargs)
+        return sorted(name for name, value in status.items() if value != 'cached')
+
+    def test_run_and_cache(self):
+        """
+        Test that a second run re-uses every cached output.
+        """
+        pipeline = self._pipeline()
+        self.assertEqual(self._run(pipeline, max_workers=1), ['combine', 'length', 'load', 'shout'])
+        self.assertEqual(pipeline.load_output('combine'), 'HELLO!:5')
+        self.assertEqual(self._run(self._pipeline(), max_workers=1), [])
+        self.assertEqual(self._pipeline().stale_stages(), [])
+
+    def test_parameter_change(self):
+        """
+        Test that changing a parameter re-runs only that stage and its dependents.
+        """
+        self._run(self._pipeline(), max_workers=1)
+        pipeline = self._pipeline(suffix='?')
+        self.assertEqual(self._run(pipeline, max_workers=1), ['combine', 'shout'])
+        self.assertEqual(pipeline.load_output('combine'), 'HELLO?:5')
+
+    def test_code_change(self):
+        """
+        Test that editing a stage function re-runs only that stage and its dependents.
+        """
+        self._run(self._pipeline(), max_workers=1)
+        with open(self.module_path, 'w') as module_file:
+            module_file.write(TOY_STAGES.replace('return len(text)', 'return len(text) * 2'))
+        self.assertEqual(self._pipeline().stale_stages(), ['length', 'combine'])
+
+    def test_imported_module_change(self):
+        """
+        Test that editing a local module brought in with `import module` invalidates the stages using it.
+        """
+        helper_path = os.path.join(self.directory, 'toy_pipeline_helper.py')
+        with open(helper_path, 'w') as helper_file:
+            helper_file.write('def double(value):\n    return value * 2\n')
+        with open(self.module_path, 'w') as module_file:
+            module_file.write('import toy_pipeline_helper\n' + TOY_STAGES.replace('return len(text)', 'return toy_pipeline_helper.double(len(text))'))
+        try:
+            self._run(self._pipeline(), max_workers=1)
+            with open(helper_path, 'w') as helper_file:
+                helper_file.write('def double(value):\n    return value + value\n')
+            self.assertEqual(self._pipeline().stale_stages(), ['length', 'combine'])
+        finally:
+            sys.modules.pop('toy_pipeline_helper', None)
+
+    def test_main_runs_both_pipelines_by_default(self):
+        """
+        Test that running pipeline.py without arguments runs the salary and books pipelines.
+        """
+        with patch('pipeline.salary_pipeline') as mock_salaries, patch('pipeline.books_pipeline') as mock_books:
+            main([])
+            main(['books'])
+        self.assertEqual(mock_salaries.return_value.run.call_count, 1)
+        self.assertEqual(mock_books.return_value.run.call_count, 2)
+
+    def test_input_change(self):
+        """
+        Test that modifying the input file re-runs every stage.
+        """
+        self._run(self._pipeline(), max_workers=1)
+        with open(self.input_file, 'w') as input_file:
+            input_file.write('changed input')
+        pipeline = self._pipeline()
+        self.assertEqual(self._run(pipeline, max_workers=1), ['combine', 'length', 'load', 'shout'])
+        self.assertEqual(pipeline.load_output('combine'), 'CHANGED INPUT!:13')
+
+    def test_parallel_run(self):
+        """
+        Test that running the stages in a process pool gives the same outputs.
+        """
+        pipeline = self._pipeline()
+        self.assertEqual(len(self._run(pipeline, max_workers=2)), 4)
+        self.assertEqual(pipeline.load_output('combine'), 'HELLO!:5')
+
+    def test_cycle_detection(self):
+        """
+        Test that a cyclic pipeline is rejected.
+        """
+        with self.assertRaises(ValueError):
+            Pipeline('cycle', [Stage('a', 'toy_pipeline_stages:length', inputs=['b']),
+                               Stage('b', 'toy_pipeline_stages:length', inputs=['a'])], cache_dir=self.cache_dir)
+
+    def test_salary_pipeline(self):
+        """
+        Test the salary pipeline end to end and check that a no-op re-run is fast.
+        """
+        input_file = os.path.join(self.directory, 'salaries.csv')
+        output_file = os.path.join(self.directory, 'processed.csv')
+        cube_file = os.path.join(self.directory, 'cube.json')
+        plot_dir = os.path.join(self.directory, 'plots')
+        pd.DataFrame({
+            'Company': ['A', 'B', 'A'], 'Company Score': [4.5, 3.9, 4.5], 'Job Title': ['SE', 'SE', 'Dev'],
+            'Location': ['Remote', 'Austin, TX', 'Remote'], 'Date': ['1d', '2d', '3d'],
+            'Salary': ['$50K - $100K', '$60K', '$70K - $80K'],
+        }).to_csv(input_file, index=False)
+
+        def build():
+            return salary_pipeline(input_file, output_file, plot_dir=plot_dir, cache_dir=self.cache_dir, cube_file=cube_file)
+
+        with patch('data_processing.print'):
+            self.assertEqual(len(self._run(build(), max_workers=1)), 12)
+        self.assertEqual(pd.read_csv(output_file)['Average_Salary'].tolist(), [75000.0, 60000.0, 75000.0])
+        self.assertEqual(len(os.listdir(plot_dir)), 6)
+        self.assertEqual(SalaryCube.load(cube_file).query(state='Remote')['count'], 2)
+
+        start = time.perf_counter()
+        self.assertEqual(self._run(build()), [])
+        self.assertLess(time.perf_counter() - start, 1.0)
+
+        os.remove(output_file)
+        with patch('data_processing.print'):
+            self.assertEqual(self._run(build(), max_workers=1), ['save'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import types
+import pandas as pd
+from cli import main
+from profiling import StageProfiler, count_rows
+import data_processing
+
+TOY_STAGES = '''
+import time
+
+def load(rows):
+    return list(range(rows))
+
+def busy(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+    return seconds
+
+def outer(values):
+    busy(0.01)
+    return [value for value in values if value % 2]
+
+def pages(count):
+    for page in range(count):
+        busy(0.01)
+        yield [page]
+
+def wait_for(thread):
+    thread.start()
+    thread.join()
+
+def main():
+    return outer(load(10))
+'''
+
+class TestProfiling(unittest.TestCase):
+    """
+    Unit tests for the stage profiler in profiling.py.
+    """
+
+    def setUp(self):
+        """
+        Create a toy module of stage functions and a temporary directory.
+        """
+        self.toy = types.ModuleType('toy_profiled_stages')
+        exec(TOY_STAGES, self.toy.__dict__)
+        sys.modules[self.toy.__name__] = self.toy
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        sys.modules.pop(self.toy.__name__, None)
+        shutil.rmtree(self.directory)
+
+    def _stages(self, profiler):
+        return {stage['name'].split('.')[-1]: stage for stage in profiler.report()['stages']}
+
+    def test_instrument_and_restore(self):
+        """
+        Test that public functions except main are wrapped, and put back afterwards.
+        """
+        original = self.toy.outer
+        with StageProfiler(memory=False) as profiler:
+            profiler.instrument(self.toy)
+            self.assertIsNot(self.toy.outer, original)
+            self.assertEqual(self.toy.main(), [1, 3, 5, 7, 9])
+        self.assertIs(self.toy.outer, original)
+        stages = self._stages(profiler)
+        self.assertEqual(sorted(stages), ['busy', 'load', 'outer'])
+        # outer's self time excludes the nested call to busy
+        self.assertGreaterEqual(stages['outer']['wall_seconds'], 0.01)
+        self.assertLess(stages['outer']['self_seconds'], stages['outer']['wall_seconds'])
+
+    def test_generator_iteration_is_timed(self):
+        """
+        Test that a generator function is timed while it is iterated, not only when it is created.
+        """
+        with StageProfiler(memory=False) as profiler:
+            profiler.instrument(self.toy)
+            self.assertEqual(list(self.toy.pages(3)), [[0], [1], [2]])
+        stages = self._stages(profiler)
+        self.assertEqual((stages['pages']['calls'], stages['busy']['calls']), (1, 3))
+        self.assertGreaterEqual(stages['pages']['wall_seconds'], 0.03)
+        self.assertLess(stages['pages']['self_seconds'], 0.01)
+
+    def test_worker_thread_stages(self):
+        """
+        Test that a stage run in another thread is not counted as a child of a main-thread stage, nor given a peak.
+        """
+        with StageProfiler() as profiler:
+            profiler.instrument(self.toy)
+            self.toy.wait_for(threading.Thread(target=self.toy.busy, args=(0.2,)))
+        stages = self._stages(profiler)
+        self.assertGreaterEqual(stages['wait_for']['self_seconds'], 0.2)
+        self.assertGreaterEqual(stages['busy']['self_seconds'], 0.2)
+        self.assertIsNone(stages['busy']['peak_memory_mb'])
+        self.assertIsNotNone(stages['wait_for']['peak_memory_mb'])
+
+    def test_workflow_rows_and_memory(self):
+        """
+        Test rows in and out, per-row calls and peak memory for the salary functions.
+        """
+        df = pd.DataFrame({
+            'Company': ['A', 'B', 'C'], 'Company Score': [4.5, 3.9, 4.2], 'Job Title': ['SE', 'SE', 'Dev'],
+            'Location': ['Remote', 'Austin, TX', 'Remote'], 'Date': ['1d', '2d', '3d'],
+            'Salary': ['$50K - $100K', 'n/a', '$70K - $80K'],
+        })
+        with StageProfiler() as profiler, contextlib.redirect_stdout(io.StringIO()):
+            profiler.instrument(data_processing)
+            data_processing.filter_data_by_location(data_processing.clean_data(df), 'Remote')
+        stages = self._stages(profiler)
+        self.assertEqual((stages['clean_data']['rows_in'], stages['clean_data']['rows_out']), (3, 2))
+        self.assertEqual(stages['extract_salary']['calls'], 3)
+        self.assertEqual(stages['extract_salary']['rows_in'], 3)
+        self.assertEqual(stages['filter_data_by_location']['rows_out'], 2)
+        self.assertGreater(stages['clean_data']['peak_memory_mb'], 0)
+        self.assertGreater(stages['clean_data']['rows_per_second'], 0)
+        self.assertFalse(hasattr(data_processing.clean_data, '__wrapped__'))
+
+    def test_report_and_flamegraph(self):
+        """
+        Test that the JSON report and the folded stacks of the sampled stage are written.
+        """
+        report_path = os.path.join(self.directory, 'report.json')
+        folded_path = os.path.join(self.directory, 'busy.folded')
+        with StageProfiler(sample_stage='busy', sample_interval=0.001) as profiler:
+            profiler.instrument(self.toy)
+            self.toy.busy(0.1)
+        with contextlib.redirect_stderr(io.StringIO()):
+            profiler.write_report(report_path)
+            profiler.write_flamegraph(folded_path)
+        with open(report_path) as report_file:
+            report = json.load(report_file)
+        self.assertEqual(report['stages'][0]['name'], 'toy_profiled_stages.busy')
+        with open(folded_path) as folded_file:
+            lines = folded_file.read().splitlines()
+        self.assertTrue(lines)
+        for line in lines:
+            stack, count = line.rsplit(' ', 1)
+            self.assertTrue(stack.startswith('<string>:busy'))
+            self.assertGreater(int(count), 0)
+
+    def test_cli_profile(self):
+        """
+        Test that cli.py --profile writes a report covering the salary functions.
+        """
+        input_file = os.path.join(self.directory, 'salaries.csv')
+        report_path = os.path.join(self.directory, 'report.json')
+        pd.DataFrame({'Company': ['A'], 'Location': ['Remote'], 'Salary': ['$50K']}).to_csv(input_file, index=False)
+        with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+            main(['--profile', report_path, '--flamegraph', 'clean_data', 'stats', input_file])
+        with open(report_path) as report_file:
+            names = {stage['name'] for stage in json.load(report_file)['stages']}
+        self.assertTrue({'data_processing.read_data', 'data_processing.clean_data',
+                         'data_processing.calculate_summary_statistics'} <= names)
+        self.assertTrue(os.path.isfile(os.path.join(self.directory, 'report.clean_data.folded')))
+
+    def test_count_rows(self):
+        """
+        Test row counting of frames, series and non-tabular values.
+        """
+        self.assertEqual(count_rows(pd.DataFrame({'a': [1, 2]})), 2)
+        self.assertEqual(count_rows(pd.Series([1, 2, 3])), 3)
+        self.assertIsNone(count_rows('file.csv'))
+        self.assertIsNone(count_rows(None))
+
+if __name__ == '__main__':
+    unittest.main()
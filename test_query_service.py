@@ -0,0 +1,142 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import threading
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from unittest.mock import patch
+from query_service import DatasetService, LRUCache, create_server
+import data_processing
+
+class TestQueryService(unittest.TestCase):
+    """
+    Unit tests for the HTTP query service in query_service.py.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """
+        Start a server on a free port over small salary and books files.
+        """
+        cls.directory = tempfile.mkdtemp()
+        salaries_file = os.path.join(cls.directory, 'salaries.csv')
+        books_file = os.path.join(cls.directory, 'books.csv')
+        pd.DataFrame({
+            'Company': ['A', 'B', 'A', 'C', 'B'],
+            'Company Score': [4.5, 3.9, 4.5, 4.2, 3.9],
+            'Job Title': ['Senior Engineer', 'Engineer', 'Engineer', 'Sr. Engineer', 'Developer'],
+            'Location': ['Remote', 'Austin, TX', 'San Jose, CA', 'Remote', 'Seattle, WA'],
+            'Date': ['1d', '2d', '3d', '4d', '5d'],
+            'Salary': ['$100K - $140K', '$90K', 'n/a', '$150K - $170K', '$80K - $100K'],
+        }).to_csv(salaries_file, index=False)
+        pd.DataFrame({
+            'Book Title': ['a', 'b', 'c', 'd'],
+            'Price': [10.0, 20.0, 30.0, 40.0],
+            'Rating': ['One', 'Three', 'Three', 'Five'],
+        }).to_csv(books_file, index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            cls.service = DatasetService(salaries_file, books_file)
+        cls.server = create_server(cls.service, port=0, cache_size=4, quiet=True)
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base_url = f'http://127.0.0.1:{cls.server.server_address[1]}'
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        shutil.rmtree(cls.directory)
+
+    def _get(self, path):
+        with urllib.request.urlopen(self.base_url + path) as response:
+            return json.loads(response.read())
+
+    def _error(self, path):
+        with self.assertRaises(urllib.error.HTTPError) as raised:
+            urllib.request.urlopen(self.base_url + path)
+        return raised.exception.code
+
+    def test_salary_endpoints(self):
+        """
+        Test that the salary endpoints return what the data_processing functions return.
+        """
+        self.assertEqual(self._get('/health'), {'status': 'ok'})
+        remote = self._get('/salaries/filter?location=Remote&limit=1')
+        self.assertEqual(remote['count'], 2)
+        self.assertEqual([row['Company'] for row in remote['rows']], ['A'])
+
+        companies = self._get('/salaries/companies?box_stats=true')
+        expected = data_processing.aggregate_salary_by_company(self.service.salaries, box_stats=True)
+        self.assertEqual([row['Company'] for row in companies], list(expected.index))
+        self.assertEqual([row['mean'] for row in companies], expected['mean'].tolist())
+
+        summary = self._get('/salaries/summary')
+        self.assertEqual(summary['count']['Average_Salary'], 4)
+        cube = self._get('/salaries/cube?group_by=State&title_contains=senior')
+        self.assertEqual({row['State']: row['count'] for row in cube}, {'Remote': 2})
+        self.assertEqual(self._get('/salaries/cube?state=TX')['count'], 1)
+
+    def test_books_endpoints(self):
+        """
+        Test the rating and price breakdowns of the books.
+        """
+        ratings = self._get('/books/ratings')
+        self.assertEqual([(row['Rating'], row['count'], row['mean']) for row in ratings], [(1, 1, 10.0), (3, 2, 25.0), (5, 1, 40.0)])
+        prices = self._get('/books/prices?bins=2')
+        self.assertEqual([row['count'] for row in prices], [2, 2])
+        self.assertEqual(self._get('/books/summary')['count']['Price'], 4)
+
+    def test_errors(self):
+        """
+        Test the responses to unknown endpoints and invalid parameters.
+        """
+        self.assertEqual(self._error('/nope'), 404)
+        self.assertEqual(self._error('/salaries/filter'), 400)
+        self.assertEqual(self._error('/books/prices?bins=zero'), 400)
+        self.assertEqual(self._error('/salaries/cube?group_by=City'), 400)
+        self.assertEqual(self._error('/salaries/filter?location=('), 400)
+
+    def test_unexpected_error(self):
+        """
+        Test that an unexpected exception in an endpoint is answered with a 500 JSON error.
+        """
+        with patch.object(DatasetService, 'book_summary', side_effect=RuntimeError('boom')):
+            with self.assertRaises(urllib.error.HTTPError) as raised:
+                urllib.request.urlopen(self.base_url + '/books/summary')
+        self.assertEqual(raised.exception.code, 500)
+        self.assertEqual(json.loads(raised.exception.read()), {'error': 'Error: RuntimeError: boom'})
+        self.assertEqual(self._get('/health'), {'status': 'ok'})
+
+    def test_cache_and_concurrency(self):
+        """
+        Test that repeated queries are served from the cache, also under concurrent requests.
+        """
+        before = self._get('/cache')
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(self._get, ['/salaries/filter?limit=5&location=CA'] * 16))
+        self.assertTrue(all(result == results[0] for result in results))
+        after = self._get('/cache')
+        self.assertGreaterEqual(after['hits'] - before['hits'], 1)
+        self.assertLessEqual(after['size'], 4)
+
+    def test_lru_eviction(self):
+        """
+        Test that the least recently used entry is evicted first.
+        """
+        cache = LRUCache(maxsize=2)
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual((cache.get('a'), cache.get('c')), (1, 3))
+        self.assertEqual(cache.stats(), {'size': 2, 'maxsize': 2, 'hits': 3, 'misses': 1})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,226 @@
+import csv
+import hashlib
+import io
+import json
+import os
+import pandas as pd
+
+# Column identifying a book across scrapes
+KEY_COLUMN = 'UPC'
+# Used as the key of books whose product page gave no UPC
+FALLBACK_KEY_COLUMN = 'Book URL'
+# Column of the changeset telling what happened to each row
+CHANGE_COLUMN = 'Change'
+INSERTED, UPDATED, DELETED = 'inserted', 'updated', 'deleted'
+
+def hashes_file(output_file_path):
+    """
+    Returns the sidecar file holding the key and content hash of every row of a cleaned CSV.
+    """
+    return f'{output_file_path}.hashes.json'
+
+def split_records(text):
+    """
+    Split CSV text into its records, keeping quoted line breaks inside their record.
+
+    Parameters:
+    text (str): CSV text ending with a line break.
+
+    Returns:
+    list of str: The text of every record, each with its line break.
+    """
+    lines = text.splitlines(keepends=True)
+    reader = csv.reader(lines)
+    records = []
+    start = 0
+    for _ in reader:
+        records.append(''.join(lines[start:reader.line_num]))
+        start = reader.line_num
+    return records
+
+def row_hash(record):
+    """
+    Return the content hash of a CSV record, compared across runs to find updated rows.
+
+    Parameters:
+    record (str): The text of one record, with its line break.
+
+    Returns:
+    str: A 16-character hexadecimal BLAKE2b digest.
+    """
+    return hashlib.blake2b(record.encode('utf-8'), digest_size=8).hexdigest()
+
+def row_keys(df):
+    """
+    Return the key of every row: its UPC, or 'url:' and its Book URL when the UPC is missing.
+
+    Parameters:
+    df (pd.DataFrame): Book rows.
+
+    Returns:
+    pd.Series: The keys, as strings.
+    """
+    if KEY_COLUMN not in df:
+        raise ValueError(f"Error: The books have no '{KEY_COLUMN}' column to key the changes on.")
+    keys = df[KEY_COLUMN].astype(str).where(df[KEY_COLUMN].notna())
+    if FALLBACK_KEY_COLUMN in df:
+        keys = keys.fillna('url:' + df[FALLBACK_KEY_COLUMN].astype(str))
+    if keys.isna().any():
+        raise ValueError(f"Error: {keys.isna().sum()} books have neither a UPC nor a URL.")
+    return keys
+
+def _load_previous(output_file_path):
+    """
+    Read the header, records, keys and hashes of the previous cleaned output.
+
+    The keys and hashes come from the sidecar file while it matches the
+    output's size and modification time; otherwise they are rebuilt from the output.
+    """
+    if not os.path.isfile(output_file_path):
+        return None, [], [], []
+    with open(output_file_path, encoding='utf-8', newline='') as output:
+        records = split_records(output.read())
+    if not records:
+        return None, [], [], []
+    header, records = records[0], records[1:]
+
+    status = os.stat(output_file_path)
+    sidecar = hashes_file(output_file_path)
+    if os.path.isfile(sidecar):
+        with open(sidecar, encoding='utf-8') as sidecar_file:
+            state = json.load(sidecar_file)
+        if state['size'] == status.st_size and state['mtime_ns'] == status.st_mtime_ns and len(state['keys']) == len(records):
+            return header, records, state['keys'], state['hashes']
+
+    previous = pd.read_csv(io.StringIO(header + ''.join(records)), dtype=str, keep_default_na=False, na_values=[''])
+    return header, records, row_keys(previous).tolist(), [row_hash(record) for record in records]
+
+def compute_changeset(df, output_file_path):
+    """
+    Compare freshly cleaned books with the previous cleaned output, row by row on their UPC.
+
+    Rows are compared by a hash of their CSV text, so a row counts as
+    updated when any of its written values changed. Every row of the new
+    scrape is serialized and hashed, and the previous output is read, so
+    the cost grows with the number of books, not only with the changes.
+
+    Parameters:
+    df (pd.DataFrame): The cleaned books of the new scrape.
+    output_file_path (str): The previous cleaned CSV; a missing file makes every row inserted.
+
+    Returns:
+    tuple: The changeset (pd.DataFrame with a 'Change' column: the new rows
+    for inserted and updated books, only the key for deleted ones), and the
+    state needed by `apply_changeset`.
+    """
+    keys = row_keys(df)
+    duplicated = keys.duplicated()
+    if duplicated.any():
+        print(f"Keeping the first of {duplicated.sum()} rows with a repeated {KEY_COLUMN}.")
+        df, keys = df[~duplicated], keys[~duplicated]
+
+    text = df.to_csv(index=False)
+    new_records = split_records(text)
+    new_header, new_records = new_records[0], new_records[1:]
+    new_hashes = [row_hash(record) for record in new_records]
+
+    header, records, old_keys, old_hashes = _load_previous(output_file_path)
+    old = dict(zip(old_keys, old_hashes))
+    new = dict(zip(keys, new_hashes))
+    if header is not None and header != new_header:
+        # Every row is written differently under another header
+        old = {key: None for key in old}
+
+    changes = pd.Series([INSERTED if key not in old else UPDATED if old[key] != new[key] else None for key in keys],
+                        index=df.index, dtype=object)
+    changed = df[changes.notna()].copy()
+    changed.insert(0, CHANGE_COLUMN, changes[changes.notna()])
+    deleted_keys = [key for key in old_keys if key not in new]
+    deleted = pd.DataFrame({CHANGE_COLUMN: DELETED, KEY_COLUMN: deleted_keys})
+    changeset = pd.concat([changed, deleted], ignore_index=True) if deleted_keys else changed.reset_index(drop=True)
+
+    state = {
+        'previous_header': header,
+        'header': new_header,
+        'records': records,
+        'keys': old_keys,
+        'new_records': dict(zip(keys, new_records)),
+        'new_hashes': new,
+        'order': list(keys),
+    }
+    return changeset, state
+
+def apply_changeset(changeset, state, output_file_path):
+    """
+    Apply a changeset to the cleaned CSV: updated rows are replaced, deleted
+    rows removed and inserted rows appended. When books were only inserted,
+    their rows are appended to the file as it is. Updates and deletions
+    rewrite the whole file through a temporary file that replaces it
+    atomically; the unchanged rows are copied as their previous text rather
+    than serialized again. The file is not touched when nothing changed.
+
+    Parameters:
+    changeset (pd.DataFrame): The changes returned by `compute_changeset`.
+    state (dict): The state returned with them.
+    output_file_path (str): The cleaned CSV to update.
+
+    Returns:
+    int: The number of rows in the updated output.
+    """
+    new_records = state['new_records']
+    if changeset.empty and os.path.isfile(output_file_path):
+        return len(state['keys'])
+
+    # Deleted rows hold their key in the UPC column
+    changes = dict(zip(row_keys(changeset), changeset[CHANGE_COLUMN])) if not changeset.empty else {}
+    inserted = [key for key in state['order'] if changes.get(key) == INSERTED]
+    if len(inserted) == len(changes) and state['previous_header'] == state['header']:
+        # Only new books: the rows already in the file stay as they are
+        with open(output_file_path, 'a', encoding='utf-8', newline='') as output:
+            output.write(''.join(new_records[key] for key in inserted))
+        keys = state['keys'] + inserted
+    else:
+        records, keys = [], []
+        for key, record in zip(state['keys'], state['records']):
+            change = changes.get(key)
+            if change == DELETED:
+                continue
+            records.append(new_records[key] if change == UPDATED else record)
+            keys.append(key)
+        records.extend(new_records[key] for key in inserted)
+        keys.extend(inserted)
+
+        temporary_path = f'{output_file_path}.tmp'
+        with open(temporary_path, 'w', encoding='utf-8', newline='') as output:
+            output.write(state['header'] + ''.join(records))
+        os.replace(temporary_path, output_file_path)
+
+    status = os.stat(output_file_path)
+    hashes = state['new_hashes']
+    with open(hashes_file(output_file_path), 'w', encoding='utf-8') as sidecar_file:
+        json.dump({'size': status.st_size, 'mtime_ns': status.st_mtime_ns, 'keys': keys,
+                   'hashes': [hashes[key] for key in keys]}, sidecar_file)
+    return len(keys)
+
+def save_changes(df, output_file_path, changes_file_path=None):
+    """
+    Update the cleaned CSV with only the rows that changed since the previous run.
+
+    Parameters:
+    df (pd.DataFrame): The cleaned books of the new scrape.
+    output_file_path (str): The cleaned CSV to update (created if missing).
+    changes_file_path (str): Optional path where the changeset is written as CSV.
+
+    Returns:
+    pd.DataFrame: The changeset.
+    """
+    changeset, state = compute_changeset(df, output_file_path)
+    rows = apply_changeset(changeset, state, output_file_path)
+    counts = changeset[CHANGE_COLUMN].value_counts()
+    unchanged = rows - counts.get(INSERTED, 0) - counts.get(UPDATED, 0)
+    print(f"\n{counts.get(INSERTED, 0)} inserted, {counts.get(UPDATED, 0)} updated, {counts.get(DELETED, 0)} deleted "
+          f"and {unchanged} unchanged books in {output_file_path}")
+    if changes_file_path:
+        changeset.to_csv(changes_file_path, index=False)
+        print(f"Changeset saved to {changes_file_path}")
+    return changeset
@@ -0,0 +1,105 @@
+import queue
+import threading
+import pandas as pd
+import scrape_books
+import process_books
+
+# Pages of records buffered between the crawl and the cleaning
+QUEUE_PAGES = 4
+
+# Scraped text columns that read_csv would have parsed as numbers
+NUMERIC_COLUMNS = ['Number of reviews']
+
+# Put on the queue by the crawler once every page has been scraped
+_DONE = object()
+
+def clean_batch(records):
+    """
+    Turn one page of scraped records into a typed, cleaned DataFrame.
+
+    Applies the normalization of `process_books.clean_data` directly to the
+    scraped values, so no CSV has to be written and parsed in between.
+
+    Parameters:
+    records (list of dicts): The books of one page, as yielded by `scrape_books.iter_book_pages`.
+
+    Returns:
+    pd.DataFrame: The page's books with numeric prices and review counts.
+    """
+    df = pd.DataFrame.from_records(records)
+    if 'Price' not in df:
+        return df
+    df = process_books.normalize_prices(df)
+    for column in NUMERIC_COLUMNS:
+        if column in df:
+            df[column] = pd.to_numeric(df[column], errors='coerce')
+    return df
+
+def _crawl(base_url, num_pages, batches):
+    """
+    Put every scraped page on the queue, then the end marker. Runs in the crawler thread.
+
+    Parameters:
+    base_url (str): The base URL of the website with a placeholder for page numbers.
+    num_pages (int): The number of pages to scrape.
+    batches (queue.Queue): The queue the pages are put on; an error is put instead of the end marker.
+    """
+    try:
+        for page_books in scrape_books.iter_book_pages(base_url, num_pages):
+            batches.put(page_books)
+        batches.put(_DONE)
+    except Exception as e:
+        batches.put(e)
+
+def scrape_and_clean(base_url="http://books.toscrape.com/catalogue/page-{}.html", num_pages=5,
+                     output_file_path='cleaned_books_data.csv', plots=False, writer=None):
+    """
+    Scrape the books and clean them in one process, writing only the cleaned CSV.
+
+    The crawl runs in a background thread and hands over each page through a
+    bounded queue, so every page is cleaned while the next one is fetched.
+    The result matches running `scrape_books.main` and then `process_books.main`.
+
+    Parameters:
+    base_url (str): The base URL of the website with a placeholder for page numbers.
+    num_pages (int): The number of pages to scrape.
+    output_file_path (str): The path where the cleaned CSV file will be saved.
+    plots (bool): Whether to analyze and plot the data, like `process_books.main`.
+    writer (output_writer.OutputWriter): Optional background writer the cleaned CSV is queued on.
+
+    Returns:
+    pd.DataFrame: The cleaned data.
+    """
+    batches = queue.Queue(maxsize=QUEUE_PAGES)
+    crawler = threading.Thread(target=_crawl, args=(base_url, num_pages, batches), daemon=True)
+    crawler.start()
+
+    frames = []
+    while True:
+        batch = batches.get()
+        if batch is _DONE:
+            break
+        if isinstance(batch, Exception):
+            raise batch
+        frames.append(clean_batch(batch))
+    crawler.join()
+
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        print("No books were scraped; nothing was saved.")
+        return pd.DataFrame()
+    df = pd.concat(frames, ignore_index=True)
+    process_books.display_basic_info(df)
+
+    # Analyze the data (without plots only the ratings are converted)
+    if plots:
+        process_books.analyze_data(df)
+    else:
+        process_books.map_ratings(df)
+
+    process_books.save_cleaned_data(df, output_file_path, writer=writer)
+    return df
+
+# Run the combined workflow
+if __name__ == "__main__":
+    scrape_and_clean()
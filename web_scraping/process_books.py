@@ -1,7 +1,15 @@
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+import sys
+# lazy_imports.py is shared with the data_process scripts and lives at the repository root
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.append(REPO_DIR)
+from lazy_imports import lazy_import
+
+# Plotting libraries are loaded on first use, so cleaning without analysis starts fast
+plt = lazy_import('matplotlib.pyplot')
+sns = lazy_import('seaborn')
 
 def load_data(file_path):
     """
@@ -58,6 +66,18 @@ def clean_data(df):
     # Example: Drop rows with any missing values
     # df.dropna(inplace=True)
     
+    return normalize_prices(df)
+
+def normalize_prices(df):
+    """
+    Drop the rows without a price and convert the 'Price' column ('£51.77') to numbers in place.
+    
+    Parameters:
+    df (pd.DataFrame): The DataFrame whose prices are converted.
+    
+    Returns:
+    pd.DataFrame: The same DataFrame with numeric prices.
+    """
     # Drop rows with missing values in 'Price'
     df.dropna(subset=['Price'], inplace=True)
     
@@ -67,6 +87,20 @@ def clean_data(df):
     
     return df
 
+def map_ratings(df):
+    """
+    Convert the textual 'Rating' column ('One' to 'Five') to numbers in place.
+    
+    Parameters:
+    df (pd.DataFrame): The DataFrame whose ratings are converted.
+    
+    Returns:
+    pd.DataFrame: The same DataFrame with numeric ratings.
+    """
+    rating_mapping = {'One': 1, 'Two': 2, 'Three': 3, 'Four': 4, 'Five': 5}
+    df['Rating'] = df['Rating'].map(rating_mapping)
+    return df
+
 def analyze_data(df):
     """
     Perform data analysis and generate visualizations.
@@ -87,8 +121,7 @@ def analyze_data(df):
     plt.show()
     
     # Analyze ratings distribution
-    rating_mapping = {'One': 1, 'Two': 2, 'Three': 3, 'Four': 4, 'Five': 5}
-    df['Rating'] = df['Rating'].map(rating_mapping)
+    map_ratings(df)
     plt.figure(figsize=(10, 6))
     sns.countplot(data=df, x='Rating', order=[1, 2, 3, 4, 5])
     plt.title('Distribution of Book Ratings')
@@ -96,15 +129,21 @@ def analyze_data(df):
     plt.ylabel('Count')
     plt.show()
 
-def save_cleaned_data(df, output_file_path):
+def save_cleaned_data(df, output_file_path, writer=None):
     """
     Save the cleaned DataFrame to a new CSV file.
     
     Parameters:
     df (pd.DataFrame): The cleaned DataFrame.
     output_file_path (str): The path where the cleaned CSV file will be saved.
+    writer (output_writer.OutputWriter): Optional background writer the file is queued on instead of written here.
+    Its write errors are raised by the writer's `flush` or `close`, not reported here.
     """
     try:
+        if writer is not None:
+            writer.write(df, output_file_path)
+            print(f"\nCleaned data queued for {output_file_path}")
+            return
         df.to_csv(output_file_path, index=False)
         print(f"\nCleaned data successfully saved to {output_file_path}")
     except PermissionError:
@@ -115,12 +154,17 @@ def save_cleaned_data(df, output_file_path):
         print(f"An unexpected error occurred: {e}")
 
 # Main workflow
-def main():
-    # File paths
-    input_file_path = 'books_with_scraped_info.csv'
-    output_file_path = 'cleaned_books_data.csv'
-    
+def main(input_file_path='books_with_scraped_info.csv', output_file_path='cleaned_books_data.csv', plots=True,
+         incremental=False, changes_file_path=None, writer=None):
     try:
+        # The changeset is applied to the plain CSV text of the previous output
+        if incremental:
+            from output_writer import infer_compression
+            if writer is not None:
+                raise ValueError("Error: Incremental updates rewrite the output themselves and cannot use the background writer.")
+            if infer_compression(output_file_path) is not None:
+                raise ValueError(f"Error: Incremental updates need an uncompressed CSV output, not '{output_file_path}'.")
+        
         # Load the data
         df = load_data(input_file_path)
         
@@ -130,11 +174,18 @@ def main():
         # Clean the data
         df = clean_data(df)
         
-        # Analyze the data
-        analyze_data(df)
+        # Analyze the data (without plots only the ratings are converted)
+        if plots:
+            analyze_data(df)
+        else:
+            map_ratings(df)
         
-        # Save the cleaned data
-        save_cleaned_data(df, output_file_path)
+        # Save the cleaned data, or only the rows that changed since the last run
+        if incremental:
+            from books_changeset import save_changes
+            save_changes(df, output_file_path, changes_file_path)
+        else:
+            save_cleaned_data(df, output_file_path, writer=writer)
     
     except FileNotFoundError as e:
         print(e)
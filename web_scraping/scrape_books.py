@@ -1,7 +1,20 @@
 import requests
 from bs4 import BeautifulSoup
-import pandas as pd
 import time
+import os
+import sys
+# lazy_imports.py is shared with the data_process scripts and lives at the repository root
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if REPO_DIR not in sys.path:
+    sys.path.append(REPO_DIR)
+from lazy_imports import lazy_import
+
+# pandas is only needed to build the final DataFrame, so it is loaded on first use
+pd = lazy_import('pandas')
+
+# Retries of a save refused with PermissionError, and the seconds between two of them
+SAVE_RETRIES = 3
+RETRY_DELAY = 2
 
 def fetch_page(url):
     """
@@ -84,19 +97,17 @@ def extract_product_info(book_url):
     
     return product_info
 
-def scrape_books(base_url, pages):
+def iter_book_pages(base_url, pages):
     """
-    Scrape books from multiple pages and return the collected data.
+    Scrape books page by page, yielding each page's records as soon as it is scraped.
     
     Parameters:
     base_url (str): The base URL of the website with a placeholder for page numbers.
     pages (int): The number of pages to scrape.
     
-    Returns:
-    pd.DataFrame: A DataFrame containing all the scraped book data.
+    Yields:
+    list of dicts: The books of one page, each with its detailed product information.
     """
-    all_books = []
-    
     for page in range(1, pages + 1):
         url = base_url.format(page)
         response = fetch_page(url)
@@ -106,6 +117,7 @@ def scrape_books(base_url, pages):
             soup = parse_page(response)
             books = extract_books(soup)
             
+            page_books = []
             for book in books:
                 title, price, availability, rating, book_url = book
                 product_info = extract_product_info(book_url)
@@ -119,30 +131,54 @@ def scrape_books(base_url, pages):
                 }
                 # Add detailed info to the book data
                 book_data.update(product_info)  
-                all_books.append(book_data)
+                page_books.append(book_data)
+            yield page_books
         else:
             print(f"Failed to retrieve page {page}. Status code: {response.status_code}")
             break
+
+def scrape_books(base_url, pages):
+    """
+    Scrape books from multiple pages and return the collected data.
+    
+    Parameters:
+    base_url (str): The base URL of the website with a placeholder for page numbers.
+    pages (int): The number of pages to scrape.
+    
+    Returns:
+    pd.DataFrame: A DataFrame containing all the scraped book data.
+    """
+    all_books = [book for page_books in iter_book_pages(base_url, pages) for book in page_books]
     
     # Create a DataFrame to store the data
     df = pd.DataFrame(all_books)
     return df
 
-def save_data(df, file_path):
+def save_data(df, file_path, writer=None, retries=SAVE_RETRIES):
     """
     Save the DataFrame to a CSV file.
     
     Parameters:
     df (pd.DataFrame): The DataFrame to save.
     file_path (str): The path to save the CSV file.
+    writer (output_writer.OutputWriter): Optional background writer the file is queued on instead of written here.
+    retries (int): How many times a write refused with PermissionError (e.g. the file is open in Excel) is retried.
     """
-    try:
-        df.to_csv(file_path, index=False)
-        print(f"Data saved to {file_path}")
-    except PermissionError:
-        print(f"PermissionError: Could not write to {file_path}. Retrying in 2 seconds...")
-        time.sleep(2)  # This will pause the script for 2 seconds
-        save_data(df, file_path)  # Retry saving the file
+    if writer is not None:
+        writer.write(df, file_path)
+        print(f"Data queued for {file_path}")
+        return
+    for attempt in range(retries + 1):
+        try:
+            df.to_csv(file_path, index=False)
+            print(f"Data saved to {file_path}")
+            return
+        except PermissionError:
+            if attempt == retries:
+                break
+            print(f"PermissionError: Could not write to {file_path}. Retrying in {RETRY_DELAY} seconds...")
+            time.sleep(RETRY_DELAY)  # This will pause the script before the next attempt
+    print(f"Error: Could not write to {file_path} after {retries + 1} attempts. Please close the file and try again.")
 # def save_data(df, file_path):
 #     """
 #     Save the DataFrame to a CSV file.
@@ -155,12 +191,8 @@ def save_data(df, file_path):
 #     print(f"Data saved to {file_path}")
 
 # Main workflow
-def main():
-    # Define the base URL and number of pages to scrape
-    base_url = "http://books.toscrape.com/catalogue/page-{}.html"
-    num_pages = 5
-    output_file_path = 'books_with_scraped_info.csv'
-    
+def main(base_url="http://books.toscrape.com/catalogue/page-{}.html", num_pages=5,
+         output_file_path='books_with_scraped_info.csv', writer=None):
     # Scrape the books and get the DataFrame
     df = scrape_books(base_url, num_pages)
     
@@ -168,7 +200,7 @@ def main():
     print(df)
     
     # Save the data to a CSV file
-    save_data(df, output_file_path)
+    save_data(df, output_file_path, writer=writer)
 
 # Run the main workflow
 if __name__ == "__main__":
@@ -0,0 +1,148 @@
+import unittest
+import contextlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import pandas as pd
+from unittest.mock import patch
+import process_books
+from books_changeset import CHANGE_COLUMN, compute_changeset, hashes_file, save_changes
+
+def scraped_books(rows):
+    """
+    Build raw scraped books from (UPC, title, price, rating) tuples.
+    """
+    return pd.DataFrame({
+        'Book Title': [title for _, title, _, _ in rows],
+        'Price': [f'£{price:.2f}' for _, _, price, _ in rows],
+        'Rating': [rating for _, _, _, rating in rows],
+        'Book URL': [f'http://books.example/{title}.html' for _, title, _, _ in rows],
+        'UPC': [upc for upc, _, _, _ in rows],
+        'Number of reviews': 0,
+    })
+
+class TestBooksChangeset(unittest.TestCase):
+    """
+    Unit tests for the UPC-keyed change detection in books_changeset.py.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.raw_file = os.path.join(self.directory, 'books.csv')
+        self.output_file = os.path.join(self.directory, 'cleaned.csv')
+        self.changes_file = os.path.join(self.directory, 'changes.csv')
+        self.books = [('u1', 'Alpha', 10.0, 'One'), ('u2', 'Beta, the sequel', 20.0, 'Two'),
+                      ('u3', 'Gamma', 30.0, 'Three'), ('u4', 'Delta', 40.0, 'Four')]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def _process(self, rows, incremental=True):
+        scraped_books(rows).to_csv(self.raw_file, index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_books.main(self.raw_file, self.output_file, plots=False, incremental=incremental,
+                               changes_file_path=self.changes_file)
+
+    def _full_rewrite(self, rows):
+        """
+        Return the cleaned rows a full rewrite would produce.
+        """
+        full_file = os.path.join(self.directory, 'full.csv')
+        scraped_books(rows).to_csv(self.raw_file, index=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            process_books.main(self.raw_file, full_file, plots=False)
+        return pd.read_csv(full_file)
+
+    def test_first_run_matches_full_rewrite(self):
+        """
+        Test that without a previous output every book is inserted and the file equals a full rewrite.
+        """
+        self._process(self.books)
+        with open(self.output_file, encoding='utf-8') as output:
+            written = output.read()
+        self._full_rewrite(self.books)
+        with open(os.path.join(self.directory, 'full.csv'), encoding='utf-8') as full:
+            self.assertEqual(written, full.read())
+        self.assertEqual(pd.read_csv(self.changes_file)[CHANGE_COLUMN].tolist(), ['inserted'] * 4)
+
+    def test_changes_are_applied(self):
+        """
+        Test that inserted, updated and deleted books are detected and applied, leaving the other rows in place.
+        """
+        self._process(self.books)
+        new_books = [self.books[0], ('u2', 'Beta, the sequel', 22.5, 'Two'), self.books[3], ('u5', 'Epsilon', 50.0, 'Five')]
+        self._process(new_books)
+
+        changes = pd.read_csv(self.changes_file)
+        self.assertEqual(dict(zip(changes['UPC'], changes[CHANGE_COLUMN])), {'u2': 'updated', 'u5': 'inserted', 'u3': 'deleted'})
+        self.assertEqual(changes.loc[changes['UPC'] == 'u2', 'Price'].item(), 22.5)
+
+        output = pd.read_csv(self.output_file)
+        self.assertEqual(output['UPC'].tolist(), ['u1', 'u2', 'u4', 'u5'])
+        pd.testing.assert_frame_equal(output, self._full_rewrite(new_books))
+
+    def test_inserts_are_appended(self):
+        """
+        Test that a scrape that only adds books appends them instead of rewriting the file.
+        """
+        self._process(self.books[:2])
+        with patch('books_changeset.os.replace') as mock_replace:
+            self._process(self.books)
+        mock_replace.assert_not_called()
+        self.assertEqual(pd.read_csv(self.changes_file)[CHANGE_COLUMN].tolist(), ['inserted'] * 2)
+        pd.testing.assert_frame_equal(pd.read_csv(self.output_file), self._full_rewrite(self.books))
+        # The sidecar still matches the appended file
+        df = process_books.map_ratings(process_books.normalize_prices(scraped_books(self.books)))
+        changeset, state = compute_changeset(df, self.output_file)
+        self.assertTrue(changeset.empty)
+        self.assertEqual(len(state['keys']), 4)
+
+    def test_unchanged_scrape_does_not_write(self):
+        """
+        Test that a scrape without changes leaves the output untouched.
+        """
+        self._process(self.books)
+        modified = os.stat(self.output_file).st_mtime_ns
+        self._process(self.books)
+        self.assertEqual(os.stat(self.output_file).st_mtime_ns, modified)
+        self.assertTrue(pd.read_csv(self.changes_file).empty)
+
+    def test_stale_sidecar_is_rebuilt(self):
+        """
+        Test that the hashes are rebuilt from the output when the sidecar no longer matches it.
+        """
+        self._process(self.books)
+        with open(hashes_file(self.output_file), 'w', encoding='utf-8') as sidecar:
+            json.dump({'size': 0, 'mtime_ns': 0, 'keys': [], 'hashes': []}, sidecar)
+        df = process_books.map_ratings(process_books.normalize_prices(scraped_books(self.books)))
+        changeset, _ = compute_changeset(df, self.output_file)
+        self.assertTrue(changeset.empty)
+
+    def test_rejects_background_writer_and_compression(self):
+        """
+        Test that incremental updates refuse the background writer and compressed outputs instead of ignoring them.
+        """
+        scraped_books(self.books).to_csv(self.raw_file, index=False)
+        compressed_file = os.path.join(self.directory, 'cleaned.csv.gz')
+        for output_file, writer in ((self.output_file, object()), (compressed_file, None)):
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                process_books.main(self.raw_file, output_file, plots=False, incremental=True, writer=writer)
+            self.assertIn('Error: Incremental updates', output.getvalue())
+            self.assertFalse(os.path.exists(output_file))
+
+    def test_missing_upc(self):
+        """
+        Test that books without a UPC are keyed on their URL, and that a table without UPCs is rejected.
+        """
+        books = self.books[:2] + [(None, 'Zeta', 5.0, 'One')]
+        self._process(books)
+        self._process(books)
+        self.assertTrue(pd.read_csv(self.changes_file).empty)
+        with self.assertRaises(ValueError):
+            compute_changeset(pd.DataFrame({'Price': [1.0]}), self.output_file)
+
+if __name__ == '__main__':
+    unittest.main()
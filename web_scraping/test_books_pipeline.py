@@ -0,0 +1,96 @@
+import unittest
+import contextlib
+import io
+import os
+import shutil
+import tempfile
+from unittest.mock import patch, Mock
+import pandas as pd
+import process_books
+import scrape_books
+from books_pipeline import clean_batch, scrape_and_clean
+
+LISTING = '''
+<html><body>
+    <article class="product_pod">
+        <h3><a title="Book {page}a" href="book{page}a.html">Book {page}a</a></h3>
+        <p class="price_color">£1{page}.50</p>
+        <p class="instock availability">In stock</p>
+        <p class="star-rating Three"></p>
+    </article>
+    <article class="product_pod">
+        <h3><a title="Book {page}b" href="book{page}b.html">Book {page}b</a></h3>
+        <p class="price_color">£2{page}.00</p>
+        <p class="instock availability">In stock</p>
+        <p class="star-rating Five"></p>
+    </article>
+</body></html>
+'''
+
+def fake_page(url):
+    """
+    Return a listing page whose books depend on the page number in the URL.
+    """
+    response = Mock()
+    response.status_code = 200 if '-3.html' not in url else 404
+    response.content = LISTING.format(page=url.rsplit('-', 1)[1].split('.')[0])
+    return response
+
+def fake_product_info(book_url):
+    return {'UPC': f'a8{len(book_url)}f', 'Product Type': 'Books', 'Number of reviews': '0'}
+
+class TestBooksPipeline(unittest.TestCase):
+    """
+    Unit tests for the in-process scrape-to-clean pipeline in books_pipeline.py.
+    """
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    @patch('scrape_books.extract_product_info', side_effect=fake_product_info)
+    @patch('scrape_books.fetch_page', side_effect=fake_page)
+    def test_matches_two_step_workflow(self, mock_fetch_page, mock_extract_product_info):
+        """
+        Test that the combined pipeline writes the same cleaned CSV as scraping to a CSV and processing it.
+        """
+        raw_file = os.path.join(self.directory, 'raw.csv')
+        two_step_file = os.path.join(self.directory, 'two_step.csv')
+        combined_file = os.path.join(self.directory, 'combined.csv')
+        url = 'http://books.example/page-{}.html'
+        with contextlib.redirect_stdout(io.StringIO()):
+            scrape_books.main(url, 5, raw_file)
+            process_books.main(raw_file, two_step_file, plots=False)
+            df = scrape_and_clean(url, 5, combined_file)
+
+        # Page 3 fails, so both workflows stop after two pages
+        self.assertEqual(len(df), 4)
+        self.assertEqual(df['Price'].tolist(), [11.5, 21.0, 12.5, 22.0])
+        self.assertEqual(df['Rating'].tolist(), [3, 5, 3, 5])
+        pd.testing.assert_frame_equal(pd.read_csv(combined_file), pd.read_csv(two_step_file))
+        self.assertFalse(os.path.exists(os.path.join(self.directory, 'books_with_scraped_info.csv')))
+
+    @patch('scrape_books.fetch_page', side_effect=ConnectionError('offline'))
+    def test_crawl_error_is_raised(self, mock_fetch_page):
+        """
+        Test that an error in the crawler thread is raised in the caller.
+        """
+        with contextlib.redirect_stdout(io.StringIO()), self.assertRaises(ConnectionError):
+            scrape_and_clean('http://books.example/page-{}.html', 2, os.path.join(self.directory, 'out.csv'))
+
+    def test_clean_batch(self):
+        """
+        Test the typing of one page of records, including a book without a price.
+        """
+        df = clean_batch([
+            {'Book Title': 'A', 'Price': '£10.99', 'Rating': 'Four', 'Number of reviews': '2'},
+            {'Book Title': 'B', 'Price': None, 'Rating': 'One', 'Number of reviews': '0'},
+        ])
+        self.assertEqual(df['Price'].tolist(), [10.99])
+        self.assertEqual(df['Number of reviews'].tolist(), [2])
+        self.assertTrue(pd.api.types.is_integer_dtype(df['Number of reviews']))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -210,5 +210,28 @@ class TestScrapeBooks(unittest.TestCase):
         # Check if `to_csv` was called with the correct path        
         mock_to_csv.assert_called_once_with(file_path, index=False)  
 
+    @patch('scrape_books.time.sleep')
+    @patch('scrape_books.pd.DataFrame.to_csv', side_effect=PermissionError)
+    def test_save_data_retries_are_bounded(self, mock_to_csv, mock_sleep):
+        """
+        Test that save_data gives up after its retries when the file stays locked, instead of retrying forever.
+        """
+        df = pd.DataFrame({'Book Title': ['Book Title 1'], 'Price': ['£10.00']})
+        with patch('builtins.print') as mock_print:
+            save_data(df, 'locked.csv', retries=2)
+        self.assertEqual(mock_to_csv.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        self.assertIn('after 3 attempts', mock_print.call_args.args[0])
+
+    def test_save_data_with_writer(self):
+        """
+        Test that save_data hands the DataFrame to a background writer instead of writing it.
+        """
+        df = pd.DataFrame({'Book Title': ['Book Title 1'], 'Price': ['£10.00']})
+        writer = Mock()
+        with patch('builtins.print'):
+            save_data(df, 'books.csv', writer=writer)
+        writer.write.assert_called_once_with(df, 'books.csv')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file